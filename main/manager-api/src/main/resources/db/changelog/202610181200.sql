@@ -0,0 +1,11 @@
+-- 添加SileroVAD(ONNX)语音活动检测配置
+delete from `ai_model_provider` where id = 'SYSTEM_VAD_SileroVADOnnx';
+INSERT INTO `ai_model_provider` (`id`, `model_type`, `provider_code`, `name`, `fields`, `sort`, `creator`, `create_date`, `updater`, `update_date`) VALUES
+('SYSTEM_VAD_SileroVADOnnx', 'VAD', 'silero_onnx', 'SileroVAD(ONNX)语音活动检测', '[{"key":"threshold","label":"检测阈值","type":"number"},{"key":"threshold_low","label":"低阈值","type":"number"},{"key":"model_dir","label":"模型目录","type":"string"},{"key":"min_silence_duration_ms","label":"最小静音时长","type":"number"},{"key":"intra_op_num_threads","label":"推理线程数","type":"number"}]', 2, 1, NOW(), 1, NOW());
+
+delete from `ai_model_config` where id = 'VAD_SileroVADOnnx';
+INSERT INTO `ai_model_config` VALUES ('VAD_SileroVADOnnx', 'VAD', 'SileroVADOnnx', 'SileroVAD(ONNX)', 0, 1, '{"type": "silero_onnx", "model_dir": "models/snakers4_silero-vad", "threshold": 0.5, "threshold_low": 0.3, "min_silence_duration_ms": 700, "intra_op_num_threads": 1}', 'https://github.com/snakers4/silero-vad', 'SileroVAD(ONNX)配置说明：
+1. 与SileroVAD使用同一模型，通过onnxruntime推理，无需加载torch
+2. 启动更快、内存占用更小，单次推理开销更低
+3. 模型文件使用models/snakers4_silero-vad目录下自带的silero_vad.onnx
+4. intra_op_num_threads建议保持为1', 2, NULL, NULL, NULL, NULL);
@@ -10,6 +10,19 @@ from core.http_server import SimpleHttpServer
 from core.websocket_server import WebSocketServer
 from core.utils.util import check_ffmpeg_installed
 from core.utils.gc_manager import get_gc_manager
+from core.utils.loop_monitor import get_loop_monitor
+from core.utils.worker_pool import get_worker_scheduler
+from core.utils.tts_cache import get_tts_cache
+from core.utils.voiceprint_provider import get_voiceprint_client
+from core.utils.audio_assets import preload_audio_assets
+from core.utils.asr_service import run_asr_service, should_use_service
+from core.supervisor import (
+    WorkerChannel,
+    WorkerSupervisor,
+    dispatch_to_loop,
+    reuse_port_supported,
+    set_worker_channel,
+)
 
 TAG = __name__
 logger = setup_logging()
@@ -43,8 +56,7 @@ async def monitor_stdin():
         await ainput()  # Asynchronously wait for input, consume Enter key
 
 
-async def main():
-    check_ffmpeg_installed()
+def prepare_config() -> dict:
     config = load_config()
 
     # auth_key priority: config file server.auth_key > manager-api.secret > auto-generated
@@ -60,21 +72,64 @@ async def main():
             auth_key = str(uuid.uuid4().hex)
     
     config["server"]["auth_key"] = auth_key
+    return config
+
+
+async def main(config: dict, worker_id=None, channel_conn=None):
+    """Run the servers in this process; worker_id is set when started by the supervisor"""
+    channel = None
+    if channel_conn is not None:
+        channel = WorkerChannel(worker_id, channel_conn)
+        set_worker_channel(channel)
 
-    # Add stdin monitoring task
-    stdin_task = asyncio.create_task(monitor_stdin())
+    # Add stdin monitoring task, only the single-process server owns the terminal
+    stdin_task = None
+    if channel is None:
+        stdin_task = asyncio.create_task(monitor_stdin())
 
     # Start global GC manager (cleanup every 5 minutes)
     gc_manager = get_gc_manager(interval_seconds=300)
     await gc_manager.start()
 
+    # Sample event-loop lag; optionally report callbacks that block the loop
+    loop_monitor = get_loop_monitor(config.get("loop_monitor"))
+    await loop_monitor.start()
+
+    # Create the process-wide worker pools shared by all connections
+    worker_scheduler = get_worker_scheduler(config.get("worker_pools"))
+
+    # Create the TTS sentence cache, loading the disk tier index if enabled
+    get_tts_cache(config.get("tts_cache"))
+
+    # Pre-encode prompt audio under config/assets in the background, later plays skip ffmpeg
+    asyncio.get_running_loop().run_in_executor(None, preload_audio_assets)
+
     # Start WebSocket server
     ws_server = WebSocketServer(config)
     ws_task = asyncio.create_task(ws_server.start())
     # Start Simple HTTP server
-    ota_server = SimpleHttpServer(config)
+    ota_server = SimpleHttpServer(config, ws_server)
     ota_task = asyncio.create_task(ota_server.start())
 
+    if channel is not None:
+        # Apply configuration refreshes received by other workers
+        channel.on(
+            "update_config",
+            dispatch_to_loop(
+                asyncio.get_running_loop(), lambda message: ws_server.update_config()
+            ),
+        )
+        channel.start()
+        if worker_id != 0:
+            # Addresses are the same for every worker, only the first one logs them
+            try:
+                await wait_for_exit()
+            finally:
+                await shutdown(
+                    gc_manager, loop_monitor, worker_scheduler, [ws_task, ota_task]
+                )
+            return
+
     read_config_from_api = config.get("read_config_from_api", False)
     port = int(config["server"].get("http_port", 8003))
     if not read_config_from_api:
@@ -127,26 +182,61 @@ async def main():
     except asyncio.CancelledError:
         print("Task cancelled, cleaning up resources...")
     finally:
-        # Stop global GC manager
-        await gc_manager.stop()
-
-        # Cancel all tasks (critical fix point)
-        stdin_task.cancel()
-        ws_task.cancel()
-        if ota_task:
-            ota_task.cancel()
-
-        # Wait for tasks to terminate (must add timeout)
-        await asyncio.wait(
-            [stdin_task, ws_task, ota_task] if ota_task else [stdin_task, ws_task],
-            timeout=3.0,
-            return_when=asyncio.ALL_COMPLETED,
-        )
+        tasks = [task for task in (stdin_task, ws_task, ota_task) if task]
+        await shutdown(gc_manager, loop_monitor, worker_scheduler, tasks)
         print("Server closed, program exiting.")
 
 
-if __name__ == "__main__":
+async def shutdown(gc_manager, loop_monitor, worker_scheduler, tasks):
+    # Stop global GC manager
+    await gc_manager.stop()
+    await loop_monitor.stop()
+    # Stop accepting new work in the shared worker pools
+    worker_scheduler.shutdown(wait=False)
+    # Close pooled connections to the voiceprint server
+    await get_voiceprint_client().close()
+
+    # Cancel all tasks (critical fix point)
+    for task in tasks:
+        task.cancel()
+
+    # Wait for tasks to terminate (must add timeout)
+    await asyncio.wait(tasks, timeout=3.0, return_when=asyncio.ALL_COMPLETED)
+
+
+def run_worker(config: dict, worker_id: int, channel_conn):
+    """Entry point of a worker process started by the supervisor"""
     try:
-        asyncio.run(main())
+        asyncio.run(main(config, worker_id, channel_conn))
     except KeyboardInterrupt:
-        print("Manual interrupt, program terminated.")
+        pass
+
+
+if __name__ == "__main__":
+    check_ffmpeg_installed()
+    config = prepare_config()
+    # Number of server processes sharing the ports, 1 keeps the single-process server
+    workers = int(config["server"].get("workers", 1) or 1)
+    if workers > 1 and not reuse_port_supported():
+        logger.bind(tag=TAG).warning(
+            "SO_REUSEPORT is not available on this platform, running a single process"
+        )
+        workers = 1
+    # Host the local ASR model in a separate process shared by all workers
+    asr_service = should_use_service(config)
+    if asr_service and not reuse_port_supported():
+        logger.bind(tag=TAG).warning(
+            "The local ASR service needs Unix sockets, loading the model in-process"
+        )
+        config["asr_service"]["enabled"] = False
+        asr_service = False
+    if workers > 1 or asr_service:
+        supervisor = WorkerSupervisor(workers, run_worker, (config,))
+        if asr_service:
+            supervisor.add_service("asr", run_asr_service, (config,))
+        supervisor.run()
+    else:
+        try:
+            asyncio.run(main(config))
+        except KeyboardInterrupt:
+            print("Manual interrupt, program terminated.")
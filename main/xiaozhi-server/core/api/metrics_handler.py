@@ -0,0 +1,68 @@
+import hmac
+import json
+from aiohttp import web
+from core.api.base_handler import BaseHandler
+from core.utils.metrics import render_prometheus
+from core.utils.server_stats import collect_server_stats, render_server_metrics
+
+TAG = __name__
+
+
+class MetricsHandler(BaseHandler):
+    def __init__(self, config: dict, ws_server=None):
+        super().__init__(config)
+        self.ws_server = ws_server
+        self.auth_key = str(config["server"].get("auth_key", ""))
+
+    def _is_authorized(self, request) -> bool:
+        """校验 Authorization: Bearer <server.auth_key>"""
+        auth_header = request.headers.get("Authorization", "")
+        if not self.auth_key or not auth_header.startswith("Bearer "):
+            return False
+        return hmac.compare_digest(
+            auth_header[7:].encode("utf-8"), self.auth_key.encode("utf-8")
+        )
+
+    def _unauthorized_response(self):
+        return web.Response(
+            text=json.dumps({"success": False, "message": "无效的认证token"}),
+            content_type="application/json",
+            status=401,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    async def handle_get(self, request):
+        """以Prometheus文本格式导出进程内指标"""
+        if not self._is_authorized(request):
+            return self._unauthorized_response()
+        try:
+            stats = await collect_server_stats(self.ws_server)
+            response = web.Response(
+                text=render_server_metrics(stats) + render_prometheus(),
+                content_type="text/plain",
+                charset="utf-8",
+                headers={"X-Content-Type-Options": "nosniff"},
+            )
+        except Exception as e:
+            self.logger.bind(tag=TAG).error(f"导出指标异常: {e}")
+            response = web.Response(text="", status=500)
+        return response
+
+    async def handle_debug_stats(self, request):
+        """以JSON格式返回服务状态快照，包含各连接的队列积压"""
+        if not self._is_authorized(request):
+            return self._unauthorized_response()
+        try:
+            stats = await collect_server_stats(self.ws_server)
+            response = web.Response(
+                text=json.dumps(stats, ensure_ascii=False, default=str),
+                content_type="application/json",
+            )
+        except Exception as e:
+            self.logger.bind(tag=TAG).error(f"获取服务状态异常: {e}")
+            response = web.Response(
+                text=json.dumps({"success": False, "message": str(e)}),
+                content_type="application/json",
+                status=500,
+            )
+        return response
@@ -1,12 +1,10 @@
 import json
-import copy
+import asyncio
 from aiohttp import web
 from config.logger import setup_logging
 from core.utils.util import get_vision_url, is_valid_image_file
-from core.utils.vllm import create_instance
-from config.config_loader import get_private_config_from_api
+from core.utils.vision_service import get_vision_service
 from core.utils.auth import AuthToken
-import base64
 from typing import Tuple, Optional
 from plugins_func.register import Action
 
@@ -14,6 +12,10 @@ TAG = __name__
 
 # 设置最大文件大小为5MB
 MAX_FILE_SIZE = 5 * 1024 * 1024
+# 分块读取上传图片的块大小
+READ_CHUNK_SIZE = 64 * 1024
+# 问题字段等表单开销的余量
+FORM_OVERHEAD = 64 * 1024
 
 
 class VisionHandler:
@@ -22,6 +24,7 @@ class VisionHandler:
         self.logger = setup_logging()
         # 初始化认证工具
         self.auth = AuthToken(config["server"]["auth_key"])
+        self.vision_service = get_vision_service(config)
 
     def _create_error_response(self, message: str) -> dict:
         """创建统一的错误响应格式"""
@@ -36,6 +39,20 @@ class VisionHandler:
         token = auth_header[7:]  # 移除"Bearer "前缀
         return self.auth.verify_token(token)
 
+    async def _read_image(self, field) -> bytes:
+        """分块读取图片，超过大小限制立即停止，不缓存超限的上传内容"""
+        data = bytearray()
+        while True:
+            chunk = await field.read_chunk(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            if len(data) + len(chunk) > MAX_FILE_SIZE:
+                raise ValueError(
+                    f"图片大小超过限制，最大允许{MAX_FILE_SIZE/1024/1024}MB"
+                )
+            data.extend(chunk)
+        return bytes(data)
+
     async def handle_post(self, request):
         """处理 MCP Vision POST 请求"""
         response = None  # 初始化response变量
@@ -57,6 +74,14 @@ class VisionHandler:
             client_id = request.headers.get("Client-Id", "")
             if device_id != token_device_id:
                 raise ValueError("设备ID与token不匹配")
+            # 请求体明显超限时不再读取
+            if (
+                request.content_length
+                and request.content_length > MAX_FILE_SIZE + FORM_OVERHEAD
+            ):
+                raise ValueError(
+                    f"图片大小超过限制，最大允许{MAX_FILE_SIZE/1024/1024}MB"
+                )
             # 解析multipart/form-data请求
             reader = await request.multipart()
 
@@ -72,61 +97,35 @@ class VisionHandler:
             if image_field is None:
                 raise ValueError("缺少图片文件")
 
-            # 读取图片数据
-            image_data = await image_field.read()
+            # 读取图片数据，同时检查文件大小
+            image_data = await self._read_image(image_field)
             if not image_data:
                 raise ValueError("图片数据为空")
 
-            # 检查文件大小
-            if len(image_data) > MAX_FILE_SIZE:
-                raise ValueError(
-                    f"图片大小超过限制，最大允许{MAX_FILE_SIZE/1024/1024}MB"
-                )
-
             # 检查文件格式
             if not is_valid_image_file(image_data):
                 raise ValueError(
                     "不支持的文件格式，请上传有效的图片文件（支持JPEG、PNG、GIF、BMP、TIFF、WEBP格式）"
                 )
 
-            # 将图片转换为base64编码
-            image_base64 = base64.b64encode(image_data).decode("utf-8")
-
-            # 如果开启了智控台，则从智控台获取模型配置
-            current_config = copy.deepcopy(self.config)
-            read_config_from_api = current_config.get("read_config_from_api", False)
-            if read_config_from_api:
-                current_config = await get_private_config_from_api(
-                    current_config,
-                    device_id,
-                    client_id,
-                )
-
-            select_vllm_module = current_config["selected_module"].get("VLLM")
-            if not select_vllm_module:
-                raise ValueError("您还未设置默认的视觉分析模块")
-
-            vllm_type = (
-                select_vllm_module
-                if "type" not in current_config["VLLM"][select_vllm_module]
-                else current_config["VLLM"][select_vllm_module]["type"]
-            )
-
-            if not vllm_type:
-                raise ValueError(f"无法找到VLLM模块对应的供应器{vllm_type}")
-
-            vllm = create_instance(
-                vllm_type, current_config["VLLM"][select_vllm_module]
+            # 图片预处理、模型配置解析、客户端复用与线程池调度由视觉分析服务完成
+            result = await self.vision_service.analyze(
+                self.config, device_id, client_id, question, image_data
             )
 
-            result = vllm.response(question, image_base64)
-
             return_json = {
                 "success": True,
                 "action": Action.RESPONSE.name,
                 "response": result,
             }
 
+            response = web.Response(
+                text=json.dumps(return_json, separators=(",", ":")),
+                content_type="application/json",
+            )
+        except asyncio.TimeoutError:
+            self.logger.bind(tag=TAG).error("MCP Vision POST请求异常: 视觉模型响应超时")
+            return_json = self._create_error_response("视觉分析超时，请稍后再试")
             response = web.Response(
                 text=json.dumps(return_json, separators=(",", ":")),
                 content_type="application/json",
@@ -18,7 +18,6 @@ from core.utils.util import (
     filter_sensitive_info,
 )
 from typing import Dict, Any
-from collections import deque
 from core.utils.modules_initialize import (
     initialize_modules,
     initialize_tts,
@@ -26,7 +25,6 @@ from core.utils.modules_initialize import (
 )
 from core.handle.reportHandle import report
 from core.providers.tts.default import DefaultTTS
-from concurrent.futures import ThreadPoolExecutor
 from core.utils.dialogue import Message, Dialogue
 from core.providers.asr.dto.dto import InterfaceType
 from core.handle.textHandle import handleTextMessage
@@ -39,7 +37,15 @@ from core.providers.tts.dto.dto import ContentType, TTSMessageDTO, SentenceType
 from config.logger import setup_logging, build_module_string, create_connection_logger
 from config.manage_api_client import DeviceNotFoundException, DeviceBindException
 from core.utils.prompt_manager import PromptManager
-from core.utils.voiceprint_provider import VoiceprintProvider
+from core.utils.voiceprint_provider import create_voiceprint_provider
+from core.utils.async_queue import AwaitableQueue
+from core.utils.worker_pool import get_worker_scheduler
+from core.supervisor import get_worker_channel
+from core.utils.turn_trace import (
+    STAGE_LLM_FIRST_TOKEN,
+    STAGE_MEMORY_QUERY,
+    get_turn_tracer,
+)
 from core.utils import textUtils
 
 TAG = __name__
@@ -93,11 +99,12 @@ class ConnectionHandler:
         # Thread task related
         self.loop = None  # Get running event loop in handle_connection
         self.stop_event = threading.Event()
-        self.executor = ThreadPoolExecutor(max_workers=5)
+        # Shared process-wide LLM pool, chat and tool follow-ups run here
+        self.executor = get_worker_scheduler().get_pool("llm")
 
-        # Add reporting thread pool
-        self.report_queue = queue.Queue()
-        self.report_thread = None
+        # Reporting queue, consumed by an asyncio task, uploads run in the shared report pool
+        self.report_queue = AwaitableQueue()
+        self.report_task = None
         # In the future, can adjust ASR and TTS reporting by modifying here, currently both enabled by default
         self.report_asr_enable = self.read_config_from_api
         self.report_tts_enable = self.read_config_from_api
@@ -116,19 +123,20 @@ class ConnectionHandler:
         self.voiceprint_provider = None
 
         # VAD related variables
-        self.client_audio_buffer = bytearray()
+        # Decoder, model state and audio buffer of this connection, created by vad.create_session
+        self.vad_session = None
         self.client_have_voice = False
-        self.client_voice_window = deque(maxlen=5)
         self.first_activity_time = 0.0  # Record first activity time (milliseconds)
         self.last_activity_time = 0.0  # Unified activity timestamp (milliseconds)
         self.client_voice_stop = False
-        self.last_is_voice = False
 
         # ASR related variables
         # Because in actual deployment, shared local ASR may be used, variables cannot be exposed to shared ASR
         # So ASR-related variables need to be defined here, as private variables of connection
         self.asr_audio = []
-        self.asr_audio_queue = queue.Queue()
+        # Audio frames stamped with their arrival time, produced and consumed on the event loop
+        self.asr_audio_queue = asyncio.Queue()
+        self.asr_priority_task = None
 
         # LLM related variables
         self.llm_finish_task = True
@@ -297,7 +305,7 @@ class ConnectionHandler:
                     return
 
             # When header processing is not needed or no header, directly process raw message
-            self.asr_audio_queue.put(message)
+            self._enqueue_asr_audio(message)
 
     async def _process_mqtt_audio_message(self, message):
         """
@@ -324,7 +332,7 @@ class ConnectionHandler:
             elif len(message) > 16:
                 # No specified length or invalid length, remove header and process remaining data
                 audio_data = message[16:]
-                self.asr_audio_queue.put(audio_data)
+                self._enqueue_asr_audio(audio_data)
                 return True
         except Exception as e:
             self.logger.bind(tag=TAG).error(f"Failed to parse WebSocket audio packet: {e}")
@@ -332,6 +340,10 @@ class ConnectionHandler:
         # Processing failed, return False to indicate need to continue processing
         return False
 
+    def _enqueue_asr_audio(self, audio_data):
+        """Hand an audio frame to the ASR ingest task, stamped for frame latency metrics"""
+        self.asr_audio_queue.put_nowait((time.perf_counter(), audio_data))
+
     def _process_websocket_audio(self, audio_data, timestamp):
         """Process WebSocket format audio packets"""
         # Initialize timestamp sequence management
@@ -342,7 +354,7 @@ class ConnectionHandler:
 
         # If timestamp is increasing, process directly
         if timestamp >= self.last_processed_timestamp:
-            self.asr_audio_queue.put(audio_data)
+            self._enqueue_asr_audio(audio_data)
             self.last_processed_timestamp = timestamp
 
             # Process subsequent packets in buffer
@@ -352,7 +364,7 @@ class ConnectionHandler:
                 for ts in sorted(self.audio_timestamp_buffer.keys()):
                     if ts > self.last_processed_timestamp:
                         buffered_audio = self.audio_timestamp_buffer.pop(ts)
-                        self.asr_audio_queue.put(buffered_audio)
+                        self._enqueue_asr_audio(buffered_audio)
                         self.last_processed_timestamp = ts
                         processed_any = True
                         break
@@ -361,7 +373,7 @@ class ConnectionHandler:
             if len(self.audio_timestamp_buffer) < self.max_timestamp_buffer_size:
                 self.audio_timestamp_buffer[timestamp] = audio_data
             else:
-                self.asr_audio_queue.put(audio_data)
+                self._enqueue_asr_audio(audio_data)
 
     async def handle_restart(self, message):
         """Handle server restart request"""
@@ -381,6 +393,12 @@ class ConnectionHandler:
                 )
             )
 
+            # In multi-process mode the supervisor restarts every worker
+            channel = get_worker_channel()
+            if channel is not None:
+                channel.request_restart()
+                return
+
             # Asynchronously execute restart operation
             def restart_server():
                 """Method to actually execute restart"""
@@ -431,6 +449,7 @@ class ConnectionHandler:
             """Initialize local components"""
             if self.vad is None:
                 self.vad = self._vad
+            self.vad_session = self.vad.create_session(self)
             if self.asr is None:
                 self.asr = self._initialize_asr()
 
@@ -452,8 +471,8 @@ class ConnectionHandler:
             self._initialize_memory()
             """Load intent recognition"""
             self._initialize_intent()
-            """Initialize reporting thread"""
-            self._init_report_threads()
+            """Initialize reporting task"""
+            self._init_report_task()
             """Update system prompt"""
             self._init_prompt_enhancement()
 
@@ -470,18 +489,18 @@ class ConnectionHandler:
             self.change_system_prompt(enhanced_prompt)
             self.logger.bind(tag=TAG).debug("System prompt has been enhanced and updated")
 
-    def _init_report_threads(self):
-        """Initialize ASR and TTS reporting threads"""
+    def _init_report_task(self):
+        """Initialize ASR and TTS reporting task"""
         if not self.read_config_from_api or self.need_bind:
             return
         if self.chat_history_conf == 0:
             return
-        if self.report_thread is None or not self.report_thread.is_alive():
-            self.report_thread = threading.Thread(
-                target=self._report_worker, daemon=True
+        if self.report_task is None or self.report_task.done():
+            # Called from a worker thread, schedule the task onto the connection's loop
+            self.report_task = asyncio.run_coroutine_threadsafe(
+                self._report_worker(), self.loop
             )
-            self.report_thread.start()
-            self.logger.bind(tag=TAG).info("TTS reporting thread started")
+            self.logger.bind(tag=TAG).info("TTS reporting task started")
 
     def _initialize_tts(self):
         """Initialize TTS"""
@@ -512,9 +531,13 @@ class ConnectionHandler:
         try:
             voiceprint_config = self.config.get("voiceprint", {})
             if voiceprint_config:
-                voiceprint_provider = VoiceprintProvider(voiceprint_config)
+                voiceprint_provider = create_voiceprint_provider(voiceprint_config)
                 if voiceprint_provider is not None and voiceprint_provider.enabled:
                     self.voiceprint_provider = voiceprint_provider
+                    # Probe server health and warm the shared connection before the first utterance
+                    asyncio.run_coroutine_threadsafe(
+                        voiceprint_provider.check_health(), self.loop
+                    )
                     self.logger.bind(tag=TAG).info("Voiceprint recognition feature dynamically enabled on connection")
                 else:
                     self.logger.bind(tag=TAG).warning("Voiceprint recognition feature enabled but configuration incomplete")
@@ -529,7 +552,7 @@ class ConnectionHandler:
             # Asynchronously get differentiated configuration
             await self._initialize_private_config_async()
             # Initialize components in thread pool
-            self.executor.submit(self._initialize_components)
+            self.loop.run_in_executor(None, self._initialize_components)
         except Exception as e:
             self.logger.bind(tag=TAG).error(f"Background initialization failed: {e}")
 
@@ -767,6 +790,7 @@ class ConnectionHandler:
         if depth == 0:
             self.llm_finish_task = False
             self.sentence_id = str(uuid.uuid4().hex)
+            get_turn_tracer().bind_sentence(self.session_id, self.sentence_id)
             self.dialogue.put(Message(role="user", content=query))
             self.tts.tts_text_queue.put(
                 TTSMessageDTO(
@@ -808,10 +832,19 @@ class ConnectionHandler:
             # Use dialogue with memory
             memory_str = None
             if self.memory is not None:
+                memory_start_time = time.monotonic()
                 future = asyncio.run_coroutine_threadsafe(
                     self.memory.query_memory(query), self.loop
                 )
                 memory_str = future.result()
+                get_turn_tracer().record(
+                    self.session_id,
+                    STAGE_MEMORY_QUERY,
+                    time.monotonic() - memory_start_time,
+                    self.memory,
+                )
+
+            llm_start_time = time.monotonic()
 
             if self.intent_type == "function_call" and functions is not None:
                 # Use streaming interface that supports functions
@@ -840,9 +873,19 @@ class ConnectionHandler:
         content_arguments = ""
         self.client_abort = False
         emotion_flag = True
+        first_token_flag = True
         for response in llm_responses:
             if self.client_abort:
                 break
+            if first_token_flag:
+                first_token_flag = False
+                get_turn_tracer().record(
+                    self.session_id,
+                    STAGE_LLM_FIRST_TOKEN,
+                    time.monotonic() - llm_start_time,
+                    self.llm,
+                    self.sentence_id,
+                )
             if self.intent_type == "function_call" and functions is not None:
                 content, tools_call = response
                 if "content" in response:
@@ -1024,28 +1067,22 @@ class ConnectionHandler:
 
             self.chat(None, depth=depth + 1)
 
-    def _report_worker(self):
-        """Chat history reporting worker thread"""
-        while not self.stop_event.is_set():
-            try:
-                # Get data from queue, set timeout to periodically check stop event
-                item = self.report_queue.get(timeout=1)
+    async def _report_worker(self):
+        """Chat history reporting task"""
+        report_pool = get_worker_scheduler().get_pool("report")
+        try:
+            while not self.stop_event.is_set():
+                # Suspend until an item arrives, no polling thread needed
+                item = await self.report_queue.get_async()
                 if item is None:  # Detect poison pill object
                     break
                 try:
-                    # Check thread pool status
-                    if self.executor is None:
-                        continue
-                    # Submit task to thread pool
-                    self.executor.submit(self._process_report, *item)
+                    # Submit task to the shared report pool
+                    report_pool.submit(self._process_report, *item)
                 except Exception as e:
-                    self.logger.bind(tag=TAG).error(f"Chat history reporting thread exception: {e}")
-            except queue.Empty:
-                continue
-            except Exception as e:
-                self.logger.bind(tag=TAG).error(f"Chat history reporting worker thread exception: {e}")
-
-        self.logger.bind(tag=TAG).info("Chat history reporting thread exited")
+                    self.logger.bind(tag=TAG).error(f"Chat history reporting task exception: {e}")
+        finally:
+            self.logger.bind(tag=TAG).info("Chat history reporting task exited")
 
     def _process_report(self, type, text, audio_data, report_time):
         """Process reporting task"""
@@ -1093,6 +1130,7 @@ class ConnectionHandler:
 
             # Clear task queues
             self.clear_queues()
+            get_turn_tracer().discard(self.session_id)
 
             # Close WebSocket connection
             try:
@@ -1132,16 +1170,9 @@ class ConnectionHandler:
 
             if self.tts:
                 await self.tts.close()
-
-            # Finally close thread pool (avoid blocking)
-            if self.executor:
-                try:
-                    self.executor.shutdown(wait=False)
-                except Exception as executor_error:
-                    self.logger.bind(tag=TAG).error(
-                        f"Error when closing thread pool: {executor_error}"
-                    )
-                self.executor = None
+            # Per-connection streaming ASR holds upstream sessions, release them with the connection
+            if self.asr is not None and self.asr is not self._asr and hasattr(self.asr, "close"):
+                await self.asr.close()
             self.logger.bind(tag=TAG).info("Connection resources released")
         except Exception as e:
             self.logger.bind(tag=TAG).error(f"Error when closing connection: {e}")
@@ -1149,6 +1180,17 @@ class ConnectionHandler:
             # Ensure stop event is set
             if self.stop_event:
                 self.stop_event.set()
+            # Cancel per-connection tasks last, close() itself may run inside one of them
+            self._cancel_channel_tasks()
+
+    def _cancel_channel_tasks(self):
+        """Cancel the ASR, TTS and reporting tasks of this connection"""
+        if self.asr_priority_task is not None and not self.asr_priority_task.done():
+            self.asr_priority_task.cancel()
+        if self.report_task is not None and not self.report_task.done():
+            self.report_task.cancel()
+        if self.tts:
+            self.tts.close_audio_channels()
 
     def clear_queues(self):
         """Clear all task queues"""
@@ -1171,12 +1213,16 @@ class ConnectionHandler:
                     except queue.Empty:
                         break
 
+            # Drop sentences synthesized ahead but not yet queued for playback
+            self.tts.clear_pending_audio()
+
             self.logger.bind(tag=TAG).debug(
                 f"Cleanup complete: TTS queue size={self.tts.tts_text_queue.qsize()}, audio queue size={self.tts.tts_audio_queue.qsize()}"
             )
 
     def reset_vad_states(self):
-        self.client_audio_buffer = bytearray()
+        if self.vad_session is not None:
+            self.vad_session.clear_audio()
         self.client_have_voice = False
         self.client_voice_stop = False
         self.logger.bind(tag=TAG).debug("VAD states reset.")
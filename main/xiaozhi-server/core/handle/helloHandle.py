@@ -3,7 +3,7 @@ import json
 import random
 import asyncio
 from core.utils.dialogue import Message
-from core.utils.util import audio_to_data
+from core.utils.audio_assets import load_audio_asset
 from core.providers.tts.dto.dto import SentenceType
 from core.utils.wakeup_word import WakeupWordsConfig
 from core.handle.sendAudioHandle import sendAudioMessage, send_tts_message
@@ -101,7 +101,7 @@ async def checkWakeupWords(conn, text):
         }
 
     # Get audio data
-    opus_packets = audio_to_data(response.get("file_path"))
+    opus_packets = await load_audio_asset(response.get("file_path"))
     # Play wakeup word reply
     conn.client_abort = False
 
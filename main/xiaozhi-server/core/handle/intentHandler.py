@@ -1,4 +1,5 @@
 import json
+import time
 import uuid
 import asyncio
 from core.utils.dialogue import Message
@@ -7,6 +8,7 @@ from core.handle.helloHandle import checkWakeupWords
 from plugins_func.register import Action, ActionResponse
 from core.handle.sendAudioHandle import send_stt_message
 from core.utils.util import remove_punctuation_and_length
+from core.utils.turn_trace import STAGE_INTENT, get_turn_tracer
 from core.providers.tts.dto.dto import TTSMessageDTO, SentenceType
 
 TAG = __name__
@@ -41,6 +43,7 @@ async def handle_user_intent(conn, text):
         return False
     # Generate sentence_id when session starts
     conn.sentence_id = str(uuid.uuid4().hex)
+    get_turn_tracer().bind_sentence(conn.session_id, conn.sentence_id)
     # Process various intents
     return await process_intent_result(conn, intent_result, text)
 
@@ -67,7 +70,11 @@ async def analyze_intent_with_llm(conn, text):
     # Dialogue history
     dialogue = conn.dialogue
     try:
+        start_time = time.monotonic()
         intent_result = await conn.intent.detect_intent(conn, dialogue.dialogue, text)
+        get_turn_tracer().record(
+            conn.session_id, STAGE_INTENT, time.monotonic() - start_time, conn.intent
+        )
         return intent_result
     except Exception as e:
         conn.logger.bind(tag=TAG).error(f"Intent recognition failed: {str(e)}")
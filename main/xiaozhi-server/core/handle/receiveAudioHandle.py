@@ -1,7 +1,7 @@
 import time
 import json
 import asyncio
-from core.utils.util import audio_to_data
+from core.utils.audio_assets import load_audio_asset
 from core.handle.abortHandle import handleAbortMessage
 from core.handle.intentHandler import handle_user_intent
 from core.utils.output_counter import check_device_output_limit
@@ -12,7 +12,7 @@ TAG = __name__
 
 async def handleAudioMessage(conn, audio):
     # Whether someone is speaking in current segment
-    have_voice = conn.vad.is_vad(conn, audio)
+    have_voice = await conn.vad.is_vad_async(conn, audio)
     # If device was just awakened, briefly ignore VAD detection
     if hasattr(conn, "just_woken_up") and conn.just_woken_up:
         have_voice = False
@@ -123,7 +123,7 @@ async def max_out_size(conn):
     text = "Sorry, I'm a bit busy right now. Let's chat again at this time tomorrow, agreed? See you tomorrow, bye!"
     await send_stt_message(conn, text)
     file_path = "config/assets/max_output_size.wav"
-    opus_packets = audio_to_data(file_path)
+    opus_packets = await load_audio_asset(file_path)
     conn.tts.tts_audio_queue.put((SentenceType.LAST, opus_packets, text))
     conn.close_after_chat = True
 
@@ -142,7 +142,7 @@ async def check_bind_device(conn):
 
         # Play notification sound
         music_path = "config/assets/bind_code.wav"
-        opus_packets = audio_to_data(music_path)
+        opus_packets = await load_audio_asset(music_path)
         conn.tts.tts_audio_queue.put((SentenceType.FIRST, opus_packets, text))
 
         # Play digits one by one
@@ -150,7 +150,7 @@ async def check_bind_device(conn):
             try:
                 digit = conn.bind_code[i]
                 num_path = f"config/assets/bind_code/{digit}.wav"
-                num_packets = audio_to_data(num_path)
+                num_packets = await load_audio_asset(num_path)
                 conn.tts.tts_audio_queue.put((SentenceType.MIDDLE, num_packets, None))
             except Exception as e:
                 conn.logger.bind(tag=TAG).error(f"Failed to play digit audio: {e}")
@@ -162,5 +162,5 @@ async def check_bind_device(conn):
         text = f"Version information for this device was not found. Please correctly configure the OTA address and recompile the firmware."
         await send_stt_message(conn, text)
         music_path = "config/assets/bind_not_found.wav"
-        opus_packets = audio_to_data(music_path)
+        opus_packets = await load_audio_asset(music_path)
         conn.tts.tts_audio_queue.put((SentenceType.LAST, opus_packets, text))
@@ -2,9 +2,10 @@ import json
 import time
 import asyncio
 from core.utils import textUtils
-from core.utils.util import audio_to_data
+from core.utils.audio_assets import load_audio_asset
 from core.providers.tts.dto.dto import SentenceType
 from core.utils.audioRateController import AudioRateController
+from core.utils.turn_trace import STAGE_FIRST_PACKET, get_turn_tracer
 
 TAG = __name__
 
@@ -18,6 +19,15 @@ async def sendAudioMessage(conn, sentenceType, audios, text):
     if sentenceType == SentenceType.FIRST:
         await send_tts_message(conn, "sentence_start", text)
 
+    if audios:
+        tracer = get_turn_tracer()
+        if not tracer.has_stage(conn.session_id, STAGE_FIRST_PACKET):
+            tracer.record(
+                conn.session_id,
+                STAGE_FIRST_PACKET,
+                provider=conn.tts,
+                sentence_id=conn.sentence_id,
+            )
     await sendAudio(conn, audios)
     # Send sentence start message
     if sentenceType is not SentenceType.MIDDLE:
@@ -25,6 +35,7 @@ async def sendAudioMessage(conn, sentenceType, audios, text):
 
     # Send end message (if it's the last text)
     if sentenceType == SentenceType.LAST:
+        get_turn_tracer().finish_turn(conn.session_id, conn.sentence_id, conn.tts)
         await send_tts_message(conn, "stop", None)
         conn.client_is_speaking = False
         if conn.close_after_chat:
@@ -222,7 +233,7 @@ async def send_tts_message(conn, state, text=None):
             stop_tts_notify_voice = conn.config.get(
                 "stop_tts_notify_voice", "config/assets/tts_notify.mp3"
             )
-            audios = audio_to_data(stop_tts_notify_voice, is_opus=True)
+            audios = await load_audio_asset(stop_tts_notify_voice, is_opus=True)
             await sendAudio(conn, audios)
         # Clear server speaking status
         conn.clearSpeakStatus()
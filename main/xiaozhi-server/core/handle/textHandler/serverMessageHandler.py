@@ -5,6 +5,7 @@ from typing import Dict, Any
 from core.handle.textMessageHandler import TextMessageHandler
 from core.handle.textMessageType import TextMessageType
 from core.providers.tools.device_mcp import handle_mcp_message
+from core.supervisor import get_worker_channel
 
 TAG = __name__
 
@@ -64,6 +65,11 @@ class ServerTextMessageHandler(TextMessageHandler):
                     )
                     return
 
+                # Other worker processes refresh their configuration as well
+                channel = get_worker_channel()
+                if channel is not None:
+                    channel.broadcast("update_config")
+
                 # Send success response
                 await conn.websocket.send(
                     json.dumps(
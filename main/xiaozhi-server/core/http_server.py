@@ -3,16 +3,19 @@ from aiohttp import web
 from config.logger import setup_logging
 from core.api.ota_handler import OTAHandler
 from core.api.vision_handler import VisionHandler
+from core.api.metrics_handler import MetricsHandler
+from core.supervisor import get_worker_channel
 
 TAG = __name__
 
 
 class SimpleHttpServer:
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, ws_server=None):
         self.config = config
         self.logger = setup_logging()
         self.ota_handler = OTAHandler(config)
         self.vision_handler = VisionHandler(config)
+        self.metrics_handler = MetricsHandler(config, ws_server)
 
     def _get_websocket_url(self, local_ip: str, port: int) -> str:
         """获取websocket地址
@@ -58,11 +61,24 @@ class SimpleHttpServer:
                     web.options("/mcp/vision/explain", self.vision_handler.handle_post),
                 ]
             )
+            if server_config.get("enable_metrics", True):
+                # Prometheus 指标及JSON格式的服务状态
+                app.add_routes(
+                    [
+                        web.get("/metrics", self.metrics_handler.handle_get),
+                        web.get(
+                            "/debug/stats", self.metrics_handler.handle_debug_stats
+                        ),
+                    ]
+                )
 
             # 运行服务
             runner = web.AppRunner(app)
             await runner.setup()
-            site = web.TCPSite(runner, host, port)
+            # 多进程模式下各工作进程共享端口
+            site = web.TCPSite(
+                runner, host, port, reuse_port=get_worker_channel() is not None
+            )
             await site.start()
 
             # 保持服务运行
@@ -16,6 +16,7 @@ from datetime import datetime
 from config.logger import setup_logging
 from core.providers.asr.base import ASRProviderBase
 from core.providers.asr.dto.dto import InterfaceType
+from core.utils.asr_ws_pool import get_session_pool
 
 TAG = __name__
 logger = setup_logging()
@@ -98,6 +99,15 @@ class ASRProvider(ASRProviderBase):
         self.expire_time = None
 
         self.task_id = uuid.uuid4().hex
+        # Audio received before the server is ready, sent in order once TranscriptionStarted arrives
+        self.pending_audio = []
+
+        # Upstream connections kept warm for first voice, 0 connects when voice is detected
+        self.prewarm_sessions = int(config.get("prewarm_sessions", 0))
+        self.prewarm_max_idle = float(config.get("prewarm_max_idle", 8))
+        # Frames buffered before voice was detected that are replayed to the new session
+        self.preroll_frames = int(config.get("preroll_frames", 5))
+        self.session_pool = None
 
         # Token management
         if self.access_key_id and self.access_key_secret:
@@ -127,6 +137,34 @@ class ASRProvider(ASRProviderBase):
 
     async def open_audio_channels(self, conn):
         await super().open_audio_channels(conn)
+        if self.prewarm_sessions > 0:
+            self.session_pool = get_session_pool(
+                "aliyun_stream",
+                {
+                    "host": self.host,
+                    "appkey": self.appkey,
+                    "access_key_id": self.access_key_id,
+                    "token": None if self.access_key_id else self.token,
+                },
+                self.prewarm_sessions,
+                self.prewarm_max_idle,
+            )
+            self.session_pool.add_user(self, self._open_session)
+
+    async def _open_session(self):
+        """Establish an authenticated connection, transcription starts when voice is detected"""
+        if self._is_token_expired():
+            self._refresh_token()
+
+        headers = {"X-NLS-Token": self.token}
+        return await websockets.connect(
+            self.ws_url,
+            additional_headers=headers,
+            max_size=1000000000,
+            ping_interval=None,
+            ping_timeout=None,
+            close_timeout=5,
+        )
 
     async def receive_audio(self, conn, audio, audio_have_voice):
         # Initialize audio cache
@@ -149,7 +187,10 @@ class ASRProvider(ASRProviderBase):
                 await self._cleanup(conn)
                 return
 
-        if self.asr_ws and self.is_processing and self.server_ready:
+        if self.asr_ws and self.is_processing and not self.server_ready:
+            # Keep the audio until the server is ready instead of dropping it
+            self.pending_audio.append(audio)
+        elif self.asr_ws and self.is_processing and self.server_ready:
             try:
                 pcm_frame = self.decoder.decode(audio, 960)
                 await self.asr_ws.send(pcm_frame)
@@ -159,19 +200,11 @@ class ASRProvider(ASRProviderBase):
 
     async def _start_recognition(self, conn):
         """Start recognition session"""
-        if self._is_token_expired():
-            self._refresh_token()
-        
-        # Establish connection
-        headers = {"X-NLS-Token": self.token}
-        self.asr_ws = await websockets.connect(
-            self.ws_url,
-            additional_headers=headers,
-            max_size=1000000000,
-            ping_interval=None,
-            ping_timeout=None,
-            close_timeout=5,
-        )
+        # Take a pre-warmed connection, or establish a new one
+        if self.session_pool is not None:
+            self.asr_ws = await self.session_pool.acquire()
+        if self.asr_ws is None:
+            self.asr_ws = await self._open_session()
 
         self.task_id = uuid.uuid4().hex
 
@@ -179,6 +212,8 @@ class ASRProvider(ASRProviderBase):
 
         self.is_processing = True
         self.server_ready = False  # Reset server ready status
+        # Replayed once the server is ready, the current frame is queued by receive_audio
+        self.pending_audio = self.get_preroll_frames(conn, self.preroll_frames)
         self.forward_task = asyncio.create_task(self._forward_results(conn))
 
         # Send start request
@@ -231,18 +266,19 @@ class ASRProvider(ASRProviderBase):
                     
                     # Receiving TranscriptionStarted means server is ready to receive audio data
                     if message_name == "TranscriptionStarted":
-                        self.server_ready = True
                         logger.bind(tag=TAG).debug("Server is ready, starting to send cached audio...")
                         
-                        # Send cached audio
-                        if conn.asr_audio:
-                            for cached_audio in conn.asr_audio[-10:]:
-                                try:
-                                    pcm_frame = self.decoder.decode(cached_audio, 960)
-                                    await self.asr_ws.send(pcm_frame)
-                                except Exception as e:
-                                    logger.bind(tag=TAG).warning(f"Failed to send cached audio: {e}")
-                                    break
+                        # Send cached audio, frames arriving meanwhile are appended and sent in order
+                        while self.pending_audio:
+                            cached_audio = self.pending_audio.pop(0)
+                            try:
+                                pcm_frame = self.decoder.decode(cached_audio, 960)
+                                await self.asr_ws.send(pcm_frame)
+                            except Exception as e:
+                                logger.bind(tag=TAG).warning(f"Failed to send cached audio: {e}")
+                                self.pending_audio = []
+                                break
+                        self.server_ready = True
                         continue
                     
                     if message_name == "TranscriptionResultChanged":
@@ -315,6 +351,7 @@ class ASRProvider(ASRProviderBase):
         # Reset status (after termination request is sent)
         self.is_processing = False
         self.server_ready = False
+        self.pending_audio = []
         logger.bind(tag=TAG).debug("ASR status reset")
 
         # Clean up task
@@ -348,6 +385,9 @@ class ASRProvider(ASRProviderBase):
 
     async def close(self):
         """Close resources"""
+        if self.session_pool is not None:
+            self.session_pool.remove_user(self)
+            self.session_pool = None
         await self._cleanup(None)
         if hasattr(self, 'decoder') and self.decoder is not None:
             try:
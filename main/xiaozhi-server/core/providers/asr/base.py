@@ -4,12 +4,10 @@ import wave
 import uuid
 import json
 import time
-import queue
 import asyncio
-import traceback
 import threading
+import traceback
 import opuslib_next
-import concurrent.futures
 import gc
 from abc import ABC, abstractmethod
 from config.logger import setup_logging
@@ -18,39 +16,97 @@ from core.handle.receiveAudioHandle import startToChat
 from core.handle.reportHandle import enqueue_asr_report
 from core.utils.util import remove_punctuation_and_length
 from core.handle.receiveAudioHandle import handleAudioMessage
+from core.utils.metrics import get_histogram
+from core.utils.turn_trace import STAGE_ASR, get_turn_tracer
+from core.utils.worker_pool import get_worker_scheduler
 
 TAG = __name__
 logger = setup_logging()
 
+_thread_state = threading.local()
+
+
+def _run_in_thread_loop(coro):
+    """在当前工作线程复用的事件循环中运行协程，避免每句话新建事件循环"""
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _thread_state.loop = loop
+    asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
+
+
+class StreamState:
+    """单个连接的本地增量识别状态：说话期间逐帧解码并送入识别会话"""
+
+    def __init__(self, session, audio_format: str):
+        self.session = session
+        # opus解码器有状态，逐帧解码需要连接级别的解码器
+        self.decoder = (
+            opuslib_next.Decoder(16000, 1) if audio_format != "pcm" else None
+        )
+        self.pcm_frames: List[bytes] = []
+        self.last_partial = ""
+
+    def feed(self, frames: List[bytes]) -> Optional[str]:
+        """送入音频帧，中间结果有变化时返回新的中间结果"""
+        pcm_frames = []
+        for frame in frames:
+            if not frame:
+                continue
+            if self.decoder is None:
+                pcm_frames.append(frame)
+                continue
+            try:
+                pcm_frames.append(self.decoder.decode(frame, 960))
+            except opuslib_next.OpusError as e:
+                logger.bind(tag=TAG).warning(f"Opus解码错误，跳过数据包: {e}")
+        if not pcm_frames:
+            return None
+        self.pcm_frames.extend(pcm_frames)
+        self.session.accept_waveform(b"".join(pcm_frames))
+        partial = self.session.partial()
+        if partial == self.last_partial:
+            return None
+        self.last_partial = partial
+        return partial
+
+    def finish(self) -> str:
+        return self.session.finish()
+
 
 class ASRProviderBase(ABC):
+    # 支持增量识别的本地引擎开启后，说话期间即边收边识别
+    streaming = False
+    # 增量识别时是否向设备下发中间结果
+    send_partial_results = False
+
     def __init__(self):
         pass
 
     # 打开音频通道
     async def open_audio_channels(self, conn):
-        conn.asr_priority_thread = threading.Thread(
-            target=self.asr_text_priority_thread, args=(conn,), daemon=True
-        )
-        conn.asr_priority_thread.start()
+        conn.asr_priority_task = asyncio.create_task(self.asr_text_priority_task(conn))
 
-    # 有序处理ASR音频
-    def asr_text_priority_thread(self, conn):
+    # 有序处理ASR音频，帧的入队与消费都在事件循环中完成，没有线程切换
+    async def asr_text_priority_task(self, conn):
+        queue_latency = get_histogram(
+            "asr_frame_queue_latency_seconds", "音频帧从接收到开始处理的等待耗时"
+        )
+        process_time = get_histogram(
+            "asr_frame_process_seconds", "单个音频帧VAD及ASR处理耗时"
+        )
         while not conn.stop_event.is_set():
+            enqueue_time, message = await conn.asr_audio_queue.get()
+            start_time = time.perf_counter()
+            queue_latency.observe(start_time - enqueue_time)
             try:
-                message = conn.asr_audio_queue.get(timeout=1)
-                future = asyncio.run_coroutine_threadsafe(
-                    handleAudioMessage(conn, message),
-                    conn.loop,
-                )
-                future.result()
-            except queue.Empty:
-                continue
+                await handleAudioMessage(conn, message)
+                process_time.observe(time.perf_counter() - start_time)
             except Exception as e:
                 logger.bind(tag=TAG).error(
                     f"处理ASR文本失败: {str(e)}, 类型: {type(e).__name__}, 堆栈: {traceback.format_exc()}"
                 )
-                continue
 
     # 接收音频
     async def receive_audio(self, conn, audio, audio_have_voice):
@@ -62,8 +118,12 @@ class ASRProviderBase(ABC):
         conn.asr_audio.append(audio)
         if not have_voice and not conn.client_have_voice:
             conn.asr_audio = conn.asr_audio[-10:]
+            conn.asr_stream_state = None
             return
 
+        if self.streaming:
+            await self._feed_stream(conn, audio)
+
         if conn.client_voice_stop:
             asr_audio_task = conn.asr_audio.copy()
             conn.asr_audio.clear()
@@ -71,15 +131,66 @@ class ASRProviderBase(ABC):
 
             if len(asr_audio_task) > 15:
                 await self.handle_voice_stop(conn, asr_audio_task)
+            conn.asr_stream_state = None
+
+    @staticmethod
+    def get_preroll_frames(conn, count: int) -> List[bytes]:
+        """检测到说话前缓存的音频帧（不含当前帧），建立上游会话后补发"""
+        if count <= 0:
+            return []
+        return conn.asr_audio[:-1][-count:]
+
+    def create_stream_session(self):
+        """创建增量识别会话，需实现 accept_waveform(pcm)、partial()、finish()"""
+        return None
+
+    async def _feed_stream(self, conn, audio):
+        """说话期间把音频送入增量识别，语音结束时只需收尾即可得到最终结果"""
+        state = getattr(conn, "asr_stream_state", None)
+        if state is None:
+            session = self.create_stream_session()
+            if session is None:
+                return
+            state = StreamState(session, conn.audio_format)
+            conn.asr_stream_state = state
+            # 语音开始前缓存的帧一并送入
+            frames = list(conn.asr_audio)
+        else:
+            frames = [audio]
+        try:
+            partial = await get_worker_scheduler().get_pool("asr").run(
+                state.feed, frames
+            )
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"增量识别失败，回退为整句识别: {e}")
+            conn.asr_stream_state = None
+            return
+        if partial and self.send_partial_results:
+            await conn.websocket.send(
+                json.dumps(
+                    {
+                        "type": "stt",
+                        "text": partial,
+                        "state": "partial",
+                        "session_id": conn.session_id,
+                    }
+                )
+            )
 
     # 处理语音停止
     async def handle_voice_stop(self, conn, asr_audio_task: List[bytes]):
         """并行处理ASR和声纹识别"""
         try:
             total_start_time = time.monotonic()
+            tracer = get_turn_tracer()
+            tracer.ensure_turn(conn.session_id)
+            stream_state = getattr(conn, "asr_stream_state", None)
+            conn.asr_stream_state = None
             
-            # 准备音频数据
-            if conn.audio_format == "pcm":
+            # 准备音频数据，增量识别时说话期间已逐帧解码
+            if stream_state is not None:
+                pcm_data = stream_state.pcm_frames
+            elif conn.audio_format == "pcm":
                 pcm_data = asr_audio_task
             else:
                 pcm_data = self.decode_opus(asr_audio_task)
@@ -94,59 +205,58 @@ class ASRProviderBase(ABC):
             # 定义ASR任务
             def run_asr():
                 start_time = time.monotonic()
-                try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
+                if stream_state is not None:
                     try:
-                        result = loop.run_until_complete(
-                            self.speech_to_text(asr_audio_task, conn.session_id, conn.audio_format)
-                        )
+                        text = stream_state.finish()
                         end_time = time.monotonic()
-                        logger.bind(tag=TAG).debug(f"ASR耗时: {end_time - start_time:.3f}s")
-                        return result
-                    finally:
-                        loop.close()
+                        logger.bind(tag=TAG).debug(
+                            f"增量识别收尾耗时: {end_time - start_time:.3f}s"
+                        )
+                        tracer.record(
+                            conn.session_id, STAGE_ASR, end_time - start_time, self
+                        )
+                        if not getattr(self, "delete_audio_file", True):
+                            self.save_audio_in_background(pcm_data, conn.session_id)
+                        return (text, None)
+                    except Exception as e:
+                        logger.bind(tag=TAG).error(f"增量识别收尾失败，改为整句识别: {e}")
+                try:
+                    result = _run_in_thread_loop(
+                        self.speech_to_text(asr_audio_task, conn.session_id, conn.audio_format)
+                    )
+                    end_time = time.monotonic()
+                    logger.bind(tag=TAG).debug(f"ASR耗时: {end_time - start_time:.3f}s")
+                    tracer.record(
+                        conn.session_id, STAGE_ASR, end_time - start_time, self
+                    )
+                    return result
                 except Exception as e:
                     end_time = time.monotonic()
                     logger.bind(tag=TAG).error(f"ASR失败: {e}")
                     return ("", None)
             
-            # 定义声纹识别任务
-            def run_voiceprint():
-                if not wav_data:
-                    return None
+            # 定义声纹识别任务，HTTP请求直接在事件循环上异步执行
+            async def run_voiceprint():
                 try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        # 使用连接的声纹识别提供者
-                        result = loop.run_until_complete(
-                            conn.voiceprint_provider.identify_speaker(wav_data, conn.session_id)
-                        )
-                        return result
-                    finally:
-                        loop.close()
+                    return await conn.voiceprint_provider.identify_speaker(
+                        wav_data, conn.session_id
+                    )
                 except Exception as e:
                     logger.bind(tag=TAG).error(f"声纹识别失败: {e}")
                     return None
             
-            # 使用线程池执行器并行运行
-            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as thread_executor:
-                asr_future = thread_executor.submit(run_asr)
-                
-                if conn.voiceprint_provider and wav_data:
-                    voiceprint_future = thread_executor.submit(run_voiceprint)
-                    
-                    # 等待两个线程都完成
-                    asr_result = asr_future.result(timeout=15)
-                    voiceprint_result = voiceprint_future.result(timeout=15)
-                    
-                    results = {"asr": asr_result, "voiceprint": voiceprint_result}
-                else:
-                    asr_result = asr_future.result(timeout=15)
-                    results = {"asr": asr_result, "voiceprint": None}
-            
-            
+            # ASR在共享线程池中运行，与声纹识别并发等待，不阻塞事件循环
+            pool = get_worker_scheduler().get_pool("asr")
+            if conn.voiceprint_provider and wav_data:
+                asr_result, voiceprint_result = await asyncio.wait_for(
+                    asyncio.gather(pool.run(run_asr), run_voiceprint()),
+                    timeout=15,
+                )
+                results = {"asr": asr_result, "voiceprint": voiceprint_result}
+            else:
+                asr_result = await asyncio.wait_for(pool.run(run_asr), timeout=15)
+                results = {"asr": asr_result, "voiceprint": None}
+
             # 处理结果
             raw_text, _ = results.get("asr", ("", None))
             speaker_name = results.get("voiceprint", None)
@@ -220,17 +330,36 @@ class ASRProviderBase(ABC):
 
     def save_audio_to_file(self, pcm_data: List[bytes], session_id: str) -> str:
         """PCM数据保存为WAV文件"""
+        file_path = self._audio_file_path(session_id)
+        self._write_wav(file_path, b"".join(pcm_data))
+        return file_path
+
+    def save_audio_in_background(self, pcm_data: List[bytes], session_id: str) -> str:
+        """在上报线程池中异步保存WAV文件，识别无需等待磁盘写入，返回文件路径"""
+        file_path = self._audio_file_path(session_id)
+        pcm = b"".join(pcm_data)
+
+        def write():
+            try:
+                self._write_wav(file_path, pcm)
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"保存音频文件失败: {file_path} | 错误: {e}")
+
+        get_worker_scheduler().get_pool("report").submit(write)
+        return file_path
+
+    def _audio_file_path(self, session_id: str) -> str:
         module_name = __name__.split(".")[-1]
         file_name = f"asr_{module_name}_{session_id}_{uuid.uuid4()}.wav"
-        file_path = os.path.join(self.output_dir, file_name)
+        return os.path.join(self.output_dir, file_name)
 
+    @staticmethod
+    def _write_wav(file_path: str, pcm: bytes):
         with wave.open(file_path, "wb") as wf:
             wf.setnchannels(1)
             wf.setsampwidth(2)  # 2 bytes = 16-bit
             wf.setframerate(16000)
-            wf.writeframes(b"".join(pcm_data))
-
-        return file_path
+            wf.writeframes(pcm)
 
     @abstractmethod
     async def speech_to_text(
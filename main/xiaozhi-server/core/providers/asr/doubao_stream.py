@@ -8,6 +8,7 @@ import gc
 from core.providers.asr.base import ASRProviderBase
 from config.logger import setup_logging
 from core.providers.asr.dto.dto import InterfaceType
+from core.utils.asr_ws_pool import get_session_pool
 
 TAG = __name__
 logger = setup_logging()
@@ -51,8 +52,72 @@ class ASRProvider(ASRProviderBase):
         self.auth_method = config.get("auth_method", "token")
         self.secret = config.get("secret", "access_secret")
 
+        # Upstream sessions kept warm for first voice, 0 connects when voice is detected
+        self.prewarm_sessions = int(config.get("prewarm_sessions", 0))
+        self.prewarm_max_idle = float(config.get("prewarm_max_idle", 10))
+        # Frames buffered before voice was detected that are replayed to the new session
+        self.preroll_frames = int(config.get("preroll_frames", 5))
+        self.session_pool = None
+
     async def open_audio_channels(self, conn):
         await super().open_audio_channels(conn)
+        if self.prewarm_sessions > 0:
+            self.session_pool = get_session_pool(
+                "doubao_stream",
+                {
+                    "appid": self.appid,
+                    "access_token": self.access_token,
+                    "auth_method": self.auth_method,
+                },
+                self.prewarm_sessions,
+                self.prewarm_max_idle,
+            )
+            self.session_pool.add_user(self, self._open_session)
+
+    async def _open_session(self):
+        """Establish an authenticated connection, the initialization request is sent per utterance"""
+        headers = self.token_auth() if self.auth_method == "token" else None
+        logger.bind(tag=TAG).info(f"Connecting to ASR service, headers: {headers}")
+
+        return await websockets.connect(
+            self.ws_url,
+            additional_headers=headers,
+            max_size=1000000000,
+            ping_interval=None,
+            ping_timeout=None,
+            close_timeout=10,
+        )
+
+    async def _init_session(self, ws):
+        """Send this provider's recognition settings and wait for the server to accept them"""
+        # Send initialization request
+        request_params = self.construct_request(str(uuid.uuid4()))
+        try:
+            payload_bytes = str.encode(json.dumps(request_params))
+            payload_bytes = gzip.compress(payload_bytes)
+            full_client_request = self.generate_header()
+            full_client_request.extend((len(payload_bytes)).to_bytes(4, "big"))
+            full_client_request.extend(payload_bytes)
+
+            logger.bind(tag=TAG).info(f"Sending initialization request: {request_params}")
+            await ws.send(full_client_request)
+
+            # 等待初始化响应
+            init_res = await ws.recv()
+            result = self.parse_response(init_res)
+            logger.bind(tag=TAG).info(f"收到初始化响应: {result}")
+
+            # 检查初始化响应
+            if "code" in result and result["code"] != 1000:
+                error_msg = f"ASR服务初始化失败: {result.get('payload_msg', {}).get('error', '未知错误')}"
+                logger.bind(tag=TAG).error(error_msg)
+                raise Exception(error_msg)
+
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"发送初始化请求失败: {str(e)}")
+            if hasattr(e, "__cause__") and e.__cause__:
+                logger.bind(tag=TAG).error(f"错误原因: {str(e.__cause__)}")
+            raise e
 
     async def receive_audio(self, conn, audio, audio_have_voice):
         conn.asr_audio.append(audio)
@@ -72,67 +137,31 @@ class ASRProvider(ASRProviderBase):
         if audio_have_voice and self.asr_ws is None and not self.is_processing:
             try:
                 self.is_processing = True
-                # Establish new WebSocket connection
-                headers = self.token_auth() if self.auth_method == "token" else None
-                logger.bind(tag=TAG).info(f"Connecting to ASR service, headers: {headers}")
-
-                self.asr_ws = await websockets.connect(
-                    self.ws_url,
-                    additional_headers=headers,
-                    max_size=1000000000,
-                    ping_interval=None,
-                    ping_timeout=None,
-                    close_timeout=10,
-                )
-
-                # Send initialization request
-                request_params = self.construct_request(str(uuid.uuid4()))
-                try:
-                    payload_bytes = str.encode(json.dumps(request_params))
-                    payload_bytes = gzip.compress(payload_bytes)
-                    full_client_request = self.generate_header()
-                    full_client_request.extend((len(payload_bytes)).to_bytes(4, "big"))
-                    full_client_request.extend(payload_bytes)
-
-                    logger.bind(tag=TAG).info(f"Sending initialization request: {request_params}")
-                    await self.asr_ws.send(full_client_request)
-
-                    # 等待初始化响应
-                    init_res = await self.asr_ws.recv()
-                    result = self.parse_response(init_res)
-                    logger.bind(tag=TAG).info(f"收到初始化响应: {result}")
-
-                    # 检查初始化响应
-                    if "code" in result and result["code"] != 1000:
-                        error_msg = f"ASR服务初始化失败: {result.get('payload_msg', {}).get('error', '未知错误')}"
-                        logger.bind(tag=TAG).error(error_msg)
-                        raise Exception(error_msg)
-
-                except Exception as e:
-                    logger.bind(tag=TAG).error(f"发送初始化请求失败: {str(e)}")
-                    if hasattr(e, "__cause__") and e.__cause__:
-                        logger.bind(tag=TAG).error(f"错误原因: {str(e.__cause__)}")
-                    raise e
+                # Take a pre-warmed session, or establish a new one
+                if self.session_pool is not None:
+                    self.asr_ws = await self.session_pool.acquire()
+                if self.asr_ws is None:
+                    self.asr_ws = await self._open_session()
+                await self._init_session(self.asr_ws)
 
                 # 启动接收ASR结果的异步任务
                 self.forward_task = asyncio.create_task(self._forward_asr_results(conn))
 
-                # 发送缓存的音频数据
-                if conn.asr_audio and len(conn.asr_audio) > 0:
-                    for cached_audio in conn.asr_audio[-10:]:
-                        try:
-                            pcm_frame = self.decoder.decode(cached_audio, 960)
-                            payload = gzip.compress(pcm_frame)
-                            audio_request = bytearray(
-                                self.generate_audio_default_header()
-                            )
-                            audio_request.extend(len(payload).to_bytes(4, "big"))
-                            audio_request.extend(payload)
-                            await self.asr_ws.send(audio_request)
-                        except Exception as e:
-                            logger.bind(tag=TAG).info(
-                                f"发送缓存音频数据时发生错误: {e}"
-                            )
+                # 补发检测到说话前缓存的音频，当前帧随后正常发送
+                for cached_audio in self.get_preroll_frames(conn, self.preroll_frames):
+                    try:
+                        pcm_frame = self.decoder.decode(cached_audio, 960)
+                        payload = gzip.compress(pcm_frame)
+                        audio_request = bytearray(
+                            self.generate_audio_default_header()
+                        )
+                        audio_request.extend(len(payload).to_bytes(4, "big"))
+                        audio_request.extend(payload)
+                        await self.asr_ws.send(audio_request)
+                    except Exception as e:
+                        logger.bind(tag=TAG).info(
+                            f"发送缓存音频数据时发生错误: {e}"
+                        )
 
             except Exception as e:
                 logger.bind(tag=TAG).error(f"建立ASR连接失败: {str(e)}")
@@ -360,6 +389,9 @@ class ASRProvider(ASRProviderBase):
 
     async def close(self):
         """资源清理方法"""
+        if self.session_pool is not None:
+            self.session_pool.remove_user(self)
+            self.session_pool = None
         if self.asr_ws:
             await self.asr_ws.close()
             self.asr_ws = None
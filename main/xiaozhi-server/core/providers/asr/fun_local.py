@@ -10,6 +10,7 @@ from funasr import AutoModel
 from funasr.utils.postprocess_utils import rich_transcription_postprocess
 import shutil
 from core.providers.asr.dto.dto import InterfaceType
+from core.utils.asr_batcher import ASRBatcher
 
 TAG = __name__
 logger = setup_logging()
@@ -61,6 +62,18 @@ class ASRProvider(ASRProviderBase):
                 # device="cuda:0",  # 启用GPU加速
             )
 
+        # 微批调度：多个连接几乎同时结束说话时合并为一次generate
+        self.batcher = None
+        batch_window_ms = float(config.get("batch_window_ms", 0) or 0)
+        if batch_window_ms > 0:
+            self.batcher = ASRBatcher(
+                self.recognize_batch,
+                batch_window_ms=batch_window_ms,
+                max_batch_size=config.get("max_batch_size", 8),
+                max_batch_audio_seconds=config.get("max_batch_audio_seconds", 60),
+                name="funasr-batcher",
+            )
+
     async def speech_to_text(
         self, opus_data: List[bytes], session_id: str, audio_format="opus"
     ) -> Tuple[Optional[str], Optional[str]]:
@@ -92,14 +105,17 @@ class ASRProvider(ASRProviderBase):
 
                 # 语音识别
                 start_time = time.time()
-                result = self.model.generate(
-                    input=combined_pcm_data,
-                    cache={},
-                    language="auto",
-                    use_itn=True,
-                    batch_size_s=60,
-                )
-                text = rich_transcription_postprocess(result[0]["text"])
+                if self.batcher is not None:
+                    text = await self.batcher.recognize(combined_pcm_data)
+                else:
+                    result = self.model.generate(
+                        input=combined_pcm_data,
+                        cache={},
+                        language="auto",
+                        use_itn=True,
+                        batch_size_s=60,
+                    )
+                    text = rich_transcription_postprocess(result[0]["text"])
                 logger.bind(tag=TAG).debug(
                     f"语音识别耗时: {time.time() - start_time:.3f}s | 结果: {text}"
                 )
@@ -132,3 +148,20 @@ class ASRProvider(ASRProviderBase):
                         logger.bind(tag=TAG).error(
                             f"文件删除失败: {file_path} | 错误: {e}"
                         )
+
+    def recognize_batch(self, pcm_list: List[bytes]) -> List[str]:
+        """一次generate识别多段16kHz PCM，供ASR服务进程批量调用"""
+        texts = [""] * len(pcm_list)
+        indexes = [i for i, pcm in enumerate(pcm_list) if pcm]
+        if not indexes:
+            return texts
+        results = self.model.generate(
+            input=[pcm_list[i] for i in indexes],
+            cache={},
+            language="auto",
+            use_itn=True,
+            batch_size=len(indexes),
+        )
+        for i, result in zip(indexes, results):
+            texts[i] = rich_transcription_postprocess(result["text"])
+        return texts
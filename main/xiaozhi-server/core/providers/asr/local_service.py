@@ -0,0 +1,59 @@
+import os
+import time
+import asyncio
+from typing import Optional, Tuple, List
+from config.logger import setup_logging
+from core.providers.asr.base import ASRProviderBase
+from core.providers.asr.dto.dto import InterfaceType
+from core.utils.asr_service import get_asr_service_client
+
+TAG = __name__
+logger = setup_logging()
+
+
+class ASRProvider(ASRProviderBase):
+    """本地ASR服务客户端，识别请求提交给托管模型的服务进程批量处理"""
+
+    def __init__(self, config: dict, delete_audio_file: bool = True):
+        super().__init__()
+        # 客户端线程安全，作为本地模块在进程内所有连接间共享
+        self.interface_type = InterfaceType.LOCAL
+        self.socket_path = config.get("socket_path", "tmp/asr_service.sock")
+        self.timeout = float(config.get("timeout", 15))
+        self.output_dir = config.get("output_dir", "tmp/")
+        self.delete_audio_file = delete_audio_file
+        self.client = get_asr_service_client(self.socket_path)
+
+        # 确保输出目录存在
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    async def speech_to_text(
+        self, opus_data: List[bytes], session_id: str, audio_format="opus"
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """语音转文本主处理逻辑"""
+        file_path = None
+        try:
+            if audio_format == "pcm":
+                pcm_data = opus_data
+            else:
+                pcm_data = self.decode_opus(opus_data)
+            if not self.delete_audio_file:
+                file_path = self.save_audio_to_file(pcm_data, session_id)
+
+            start_time = time.time()
+            # 服务进程仍在加载模型时等待其就绪，连同识别耗时一起计入超时
+            future = self.client.submit(b"".join(pcm_data), connect_timeout=self.timeout)
+            remaining = self.timeout - (time.time() - start_time)
+            text = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=max(remaining, 0.1)
+            )
+            logger.bind(tag=TAG).debug(
+                f"ASR服务识别耗时: {time.time() - start_time:.3f}s | 结果: {text}"
+            )
+            return text, file_path
+        except asyncio.TimeoutError:
+            logger.bind(tag=TAG).error(f"ASR服务识别超时（{self.timeout}s）")
+            return "", file_path
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"ASR服务识别失败: {e}")
+            return "", file_path
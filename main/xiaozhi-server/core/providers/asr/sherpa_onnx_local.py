@@ -34,6 +34,46 @@ class CaptureOutput:
             logger.bind(tag=TAG).info(self.output.strip())
 
 
+def find_model_file(model_dir: str, prefix: str) -> str:
+    """在模型目录中查找以prefix开头的onnx文件，优先使用int8量化版本"""
+    candidates = sorted(
+        f
+        for f in os.listdir(model_dir)
+        if f.startswith(prefix) and f.endswith(".onnx")
+    )
+    if not candidates:
+        raise FileNotFoundError(f"模型文件不存在: {model_dir}/{prefix}*.onnx")
+    int8 = [f for f in candidates if ".int8." in f]
+    return os.path.join(model_dir, (int8 or candidates)[0])
+
+
+class SherpaStreamSession:
+    """sherpa-onnx流式模型的增量识别会话，每个连接一个独立的流"""
+
+    # 结束时补充的静音时长（秒），让模型输出尾部的字
+    TAIL_PADDING = 0.66
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+        self.stream = recognizer.create_stream()
+
+    def accept_waveform(self, pcm: bytes):
+        self.stream.accept_waveform(16000, ASRProvider.pcm_to_samples(pcm))
+        while self.recognizer.is_ready(self.stream):
+            self.recognizer.decode_stream(self.stream)
+
+    def partial(self) -> str:
+        return self.recognizer.get_result(self.stream).strip()
+
+    def finish(self) -> str:
+        tail = np.zeros(int(self.TAIL_PADDING * 16000), dtype=np.float32)
+        self.stream.accept_waveform(16000, tail)
+        self.stream.input_finished()
+        while self.recognizer.is_ready(self.stream):
+            self.recognizer.decode_stream(self.stream)
+        return self.recognizer.get_result(self.stream).strip()
+
+
 class ASRProvider(ASRProviderBase):
     def __init__(self, config: dict, delete_audio_file: bool):
         super().__init__()
@@ -96,6 +136,50 @@ class ASRProvider(ASRProviderBase):
                     use_itn=True,
                 )
 
+        # 增量识别：使用流式模型在说话期间边收边识别，语音结束时即可得到结果
+        self.online_model = None
+        streaming = str(config.get("streaming", False)).lower()
+        self.streaming = streaming in ("true", "1", "yes")
+        partial_results = str(config.get("partial_results", False)).lower()
+        self.send_partial_results = partial_results in ("true", "1", "yes")
+        if self.streaming:
+            self.online_model = self._load_online_model(
+                config.get("streaming_model_dir"),
+                config.get("streaming_model_type", "zipformer"),
+            )
+
+    def _load_online_model(self, model_dir: str, model_type: str):
+        """加载流式模型，支持 zipformer（transducer）和 paraformer"""
+        if not model_dir or not os.path.isdir(model_dir):
+            raise FileNotFoundError(f"流式模型目录不存在: {model_dir}")
+        tokens = os.path.join(model_dir, "tokens.txt")
+        with CaptureOutput():
+            if model_type == "paraformer":
+                return sherpa_onnx.OnlineRecognizer.from_paraformer(
+                    tokens=tokens,
+                    encoder=find_model_file(model_dir, "encoder"),
+                    decoder=find_model_file(model_dir, "decoder"),
+                    num_threads=2,
+                    sample_rate=16000,
+                    feature_dim=80,
+                    decoding_method="greedy_search",
+                )
+            return sherpa_onnx.OnlineRecognizer.from_transducer(
+                tokens=tokens,
+                encoder=find_model_file(model_dir, "encoder"),
+                decoder=find_model_file(model_dir, "decoder"),
+                joiner=find_model_file(model_dir, "joiner"),
+                num_threads=2,
+                sample_rate=16000,
+                feature_dim=80,
+                decoding_method="greedy_search",
+            )
+
+    def create_stream_session(self):
+        if self.online_model is None:
+            return None
+        return SherpaStreamSession(self.online_model)
+
     def read_wave(self, wave_filename: str) -> Tuple[np.ndarray, int]:
         """
         Args:
@@ -120,28 +204,32 @@ class ASRProvider(ASRProviderBase):
             samples_float32 = samples_float32 / 32768
             return samples_float32, f.getframerate()
 
+    @staticmethod
+    def pcm_to_samples(pcm: bytes) -> np.ndarray:
+        """16bit PCM直接转换为[-1, 1]范围的float32采样，无需经过wav文件"""
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+        samples *= 1 / 32768
+        return samples
+
     async def speech_to_text(
         self, opus_data: List[bytes], session_id: str, audio_format="opus"
     ) -> Tuple[Optional[str], Optional[str]]:
         """语音转文本主处理逻辑"""
         file_path = None
         try:
-            # 保存音频文件
-            start_time = time.time()
             if audio_format == "pcm":
                 pcm_data = opus_data
             else:
                 pcm_data = self.decode_opus(opus_data)
-            file_path = self.save_audio_to_file(pcm_data, session_id)
-            logger.bind(tag=TAG).debug(
-                f"音频文件保存耗时: {time.time() - start_time:.3f}s | 路径: {file_path}"
-            )
+
+            # 仅在需要保留音频时落盘，且在后台写入，不阻塞识别
+            if not self.delete_audio_file:
+                file_path = self.save_audio_in_background(pcm_data, session_id)
 
             # 语音识别
             start_time = time.time()
             s = self.model.create_stream()
-            samples, sample_rate = self.read_wave(file_path)
-            s.accept_waveform(sample_rate, samples)
+            s.accept_waveform(16000, self.pcm_to_samples(b"".join(pcm_data)))
             self.model.decode_stream(s)
             text = s.result.text
             logger.bind(tag=TAG).debug(
@@ -153,11 +241,13 @@ class ASRProvider(ASRProviderBase):
         except Exception as e:
             logger.bind(tag=TAG).error(f"语音识别失败: {e}", exc_info=True)
             return "", file_path
-        finally:
-            # 文件清理逻辑
-            if self.delete_audio_file and file_path and os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                    logger.bind(tag=TAG).debug(f"已删除临时音频文件: {file_path}")
-                except Exception as e:
-                    logger.bind(tag=TAG).error(f"文件删除失败: {file_path} | 错误: {e}")
+
+    def recognize_batch(self, pcm_list: List[bytes]) -> List[str]:
+        """一次decode_streams识别多段16kHz PCM，供ASR服务进程批量调用"""
+        streams = []
+        for pcm in pcm_list:
+            s = self.model.create_stream()
+            s.accept_waveform(16000, self.pcm_to_samples(pcm))
+            streams.append(s)
+        self.model.decode_streams(streams)
+        return [s.result.text for s in streams]
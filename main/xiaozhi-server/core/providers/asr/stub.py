@@ -0,0 +1,49 @@
+import time
+from typing import Optional, Tuple, List
+from config.logger import setup_logging
+from core.providers.asr.dto.dto import InterfaceType
+from core.providers.asr.base import ASRProviderBase
+from core.utils.latency_sampler import LatencySampler
+
+TAG = __name__
+logger = setup_logging()
+
+
+class ASRProvider(ASRProviderBase):
+    """离线桩ASR，按配置耗时返回固定识别文本，可选保留Opus解码开销"""
+
+    def __init__(self, config: dict, delete_audio_file: bool):
+        super().__init__()
+        self.interface_type = InterfaceType.NON_STREAM
+        self.output_dir = config.get("output_dir", "tmp/")
+        self.delete_audio_file = delete_audio_file
+
+        transcripts = config.get("transcripts") or [config.get("text") or "今天天气怎么样"]
+        self.transcripts = [str(t) for t in transcripts]
+        self._index = 0
+
+        seed = config.get("seed")
+        seed = int(seed) if seed not in (None, "") else None
+        self.latency = LatencySampler(config.get("latency_ms", 150), seed)
+        # 每秒音频额外增加的识别耗时（毫秒），模拟耗时随语音长度增长
+        per_second = config.get("latency_per_audio_second_ms", 0)
+        self.latency_per_second = float(per_second) / 1000 if per_second else 0.0
+        self.decode = str(config.get("decode_opus", True)).lower() in (
+            "true",
+            "1",
+            "yes",
+        )
+
+    async def speech_to_text(
+        self, opus_data: List[bytes], session_id: str, audio_format="opus"
+    ) -> Tuple[Optional[str], Optional[str]]:
+        # 每帧60ms
+        audio_seconds = len(opus_data) * 0.06
+        if audio_format != "pcm" and self.decode:
+            pcm_data = self.decode_opus(opus_data)
+            audio_seconds = sum(len(p) for p in pcm_data) / 2 / 16000
+        time.sleep(self.latency.sample() + audio_seconds * self.latency_per_second)
+
+        text = self.transcripts[self._index % len(self.transcripts)]
+        self._index += 1
+        return text, None
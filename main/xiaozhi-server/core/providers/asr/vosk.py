@@ -10,6 +10,29 @@ import vosk
 TAG = __name__
 logger = setup_logging()
 
+
+class VoskStreamSession:
+    """VOSK增量识别会话，每个连接一个独立识别器"""
+
+    def __init__(self, model):
+        self.recognizer = vosk.KaldiRecognizer(model, 16000)
+        self.texts = []
+
+    def accept_waveform(self, pcm: bytes):
+        if self.recognizer.AcceptWaveform(pcm):
+            text = json.loads(self.recognizer.Result()).get("text", "")
+            if text:
+                self.texts.append(text)
+
+    def partial(self) -> str:
+        partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        return " ".join(self.texts + [partial]).strip()
+
+    def finish(self) -> str:
+        final_text = json.loads(self.recognizer.FinalResult()).get("text", "")
+        return " ".join(self.texts + [final_text]).strip()
+
+
 class ASRProvider(ASRProviderBase):
     def __init__(self, config: dict, delete_audio_file: bool = True):
         super().__init__()
@@ -17,6 +40,11 @@ class ASRProvider(ASRProviderBase):
         self.model_path = config.get("model_path")
         self.output_dir = config.get("output_dir", "tmp/")
         self.delete_audio_file = delete_audio_file
+        # 增量识别：说话期间边收边识别，语音结束时即可得到结果
+        streaming = str(config.get("streaming", False)).lower()
+        self.streaming = streaming in ("true", "1", "yes")
+        partial_results = str(config.get("partial_results", False)).lower()
+        self.send_partial_results = partial_results in ("true", "1", "yes")
         
         # 初始化VOSK模型
         self.model = None
@@ -43,6 +71,11 @@ class ASRProvider(ASRProviderBase):
             logger.bind(tag=TAG).error(f"加载VOSK模型失败: {e}")
             raise
 
+    def create_stream_session(self):
+        if not self.model:
+            return None
+        return VoskStreamSession(self.model)
+
     async def speech_to_text(
         self, audio_data: List[bytes], session_id: str, audio_format: str = "opus"
     ) -> Tuple[Optional[str], Optional[str]]:
@@ -112,3 +145,21 @@ class ASRProvider(ASRProviderBase):
                     logger.bind(tag=TAG).debug(f"已删除临时音频文件: {file_path}")
                 except Exception as e:
                     logger.bind(tag=TAG).error(f"文件删除失败: {file_path} | 错误: {e}")
+
+    def recognize_batch(self, pcm_list: List[bytes]) -> List[str]:
+        """逐段识别多段16kHz PCM，供ASR服务进程批量调用
+
+        VOSK没有批量接口，每段使用独立的识别器，避免共享识别器的状态串扰
+        """
+        texts = []
+        for pcm in pcm_list:
+            recognizer = vosk.KaldiRecognizer(self.model, 16000)
+            text_result = ""
+            for i in range(0, len(pcm), 2000):
+                if recognizer.AcceptWaveform(pcm[i : i + 2000]):
+                    text = json.loads(recognizer.Result()).get("text", "")
+                    if text:
+                        text_result += text + " "
+            text_result += json.loads(recognizer.FinalResult()).get("text", "")
+            texts.append(text_result.strip())
+        return texts
@@ -14,6 +14,7 @@ from config.logger import setup_logging
 from wsgiref.handlers import format_date_time
 from core.providers.asr.base import ASRProviderBase
 from core.providers.asr.dto.dto import InterfaceType
+from core.utils.asr_ws_pool import get_session_pool
 
 TAG = __name__
 logger = setup_logging()
@@ -59,6 +60,13 @@ class ASRProvider(ASRProviderBase):
         self.output_dir = config.get("output_dir", "tmp/")
         self.delete_audio_file = delete_audio_file
 
+        # Upstream connections kept warm for first voice, 0 connects when voice is detected
+        self.prewarm_sessions = int(config.get("prewarm_sessions", 0))
+        self.prewarm_max_idle = float(config.get("prewarm_max_idle", 8))
+        # Frames buffered before voice was detected that are replayed to the new session
+        self.preroll_frames = int(config.get("preroll_frames", 5))
+        self.session_pool = None
+
     def create_url(self) -> str:
         """Generate authentication URL"""
         url = "ws://iat.cn-huabei-1.xf-yun.com/v1"
@@ -100,6 +108,26 @@ class ASRProvider(ASRProviderBase):
 
     async def open_audio_channels(self, conn):
         await super().open_audio_channels(conn)
+        if self.prewarm_sessions > 0:
+            self.session_pool = get_session_pool(
+                "xunfei_stream",
+                {"app_id": self.app_id, "api_key": self.api_key},
+                self.prewarm_sessions,
+                self.prewarm_max_idle,
+            )
+            self.session_pool.add_user(self, self._open_session)
+
+    async def _open_session(self):
+        """Establish an authenticated connection, the first audio frame starts recognition"""
+        ws_url = self.create_url()
+        logger.bind(tag=TAG).info(f"Connecting to ASR service: {ws_url[:50]}...")
+        return await websockets.connect(
+            ws_url,
+            max_size=1000000000,
+            ping_interval=None,
+            ping_timeout=None,
+            close_timeout=10,
+        )
 
     async def receive_audio(self, conn, audio, audio_have_voice):
         # Call parent method first to handle basic logic
@@ -113,11 +141,12 @@ class ASRProvider(ASRProviderBase):
         # If there's voice this time, and connection hasn't been established before
         if audio_have_voice and self.asr_ws is None and not self.is_processing:
             try:
-                await self._start_recognition(conn)
+                await self._start_recognition(conn, audio)
             except Exception as e:
                 logger.bind(tag=TAG).error(f"Failed to establish ASR connection: {str(e)}")
                 await self._cleanup(conn)
-                return
+            # The current frame has been sent together with the preroll
+            return
 
         # Send current audio data
         if self.asr_ws and self.is_processing and self.server_ready:
@@ -128,21 +157,15 @@ class ASRProvider(ASRProviderBase):
                 logger.bind(tag=TAG).warning(f"Error occurred while sending audio data: {e}")
                 await self._cleanup(conn)
 
-    async def _start_recognition(self, conn):
+    async def _start_recognition(self, conn, audio: bytes):
         """Start recognition session"""
         try:
             self.is_processing = True
-            # Establish WebSocket connection
-            ws_url = self.create_url()
-            logger.bind(tag=TAG).info(f"Connecting to ASR service: {ws_url[:50]}...")
-
-            self.asr_ws = await websockets.connect(
-                ws_url,
-                max_size=1000000000,
-                ping_interval=None,
-                ping_timeout=None,
-                close_timeout=10,
-            )
+            # Take a pre-warmed connection, or establish a new one
+            if self.session_pool is not None:
+                self.asr_ws = await self.session_pool.acquire()
+            if self.asr_ws is None:
+                self.asr_ws = await self._open_session()
 
             logger.bind(tag=TAG).info("ASR WebSocket connection established")
             self.server_ready = False
@@ -150,24 +173,24 @@ class ASRProvider(ASRProviderBase):
             self.best_text = ""
             self.forward_task = asyncio.create_task(self._forward_results(conn))
 
-            # Send first frame audio
-            if conn.asr_audio and len(conn.asr_audio) > 0:
-                first_audio = conn.asr_audio[-1] if conn.asr_audio else b""
-                pcm_frame = (
-                    self.decoder.decode(first_audio, 960) if first_audio else b""
-                )
-                await self._send_audio_frame(pcm_frame, STATUS_FIRST_FRAME)
-                self.server_ready = True
-                logger.bind(tag=TAG).info("First frame sent, starting recognition")
-
-                # Send cached audio data
-                for cached_audio in conn.asr_audio[-10:]:
-                    try:
-                        pcm_frame = self.decoder.decode(cached_audio, 960)
-                        await self._send_audio_frame(pcm_frame, STATUS_CONTINUE_FRAME)
-                    except Exception as e:
-                        logger.bind(tag=TAG).info(f"Error occurred while sending cached audio data: {e}")
-                        break
+            # Preroll frames followed by the current frame, the first one carries the start status
+            frames = self.get_preroll_frames(conn, self.preroll_frames) + [audio]
+            for index, cached_audio in enumerate(frames):
+                try:
+                    pcm_frame = (
+                        self.decoder.decode(cached_audio, 960) if cached_audio else b""
+                    )
+                    await self._send_audio_frame(
+                        pcm_frame,
+                        STATUS_FIRST_FRAME if index == 0 else STATUS_CONTINUE_FRAME,
+                    )
+                except Exception as e:
+                    if index == 0:
+                        raise
+                    logger.bind(tag=TAG).info(f"Error occurred while sending cached audio data: {e}")
+                    break
+            self.server_ready = True
+            logger.bind(tag=TAG).info("First frame sent, starting recognition")
 
         except Exception as e:
             logger.bind(tag=TAG).error(f"Failed to establish ASR connection: {str(e)}")
@@ -502,6 +525,9 @@ class ASRProvider(ASRProviderBase):
 
     async def close(self):
         """Resource cleanup method"""
+        if self.session_pool is not None:
+            self.session_pool.remove_user(self)
+            self.session_pool = None
         if self.asr_ws:
             await self.asr_ws.close()
             self.asr_ws = None
@@ -0,0 +1,106 @@
+import json
+import time
+import uuid
+from types import SimpleNamespace
+from config.logger import setup_logging
+from core.providers.llm.base import LLMProviderBase
+from core.utils.latency_sampler import LatencySampler
+
+TAG = __name__
+logger = setup_logging()
+
+DEFAULT_REPLY = (
+    "好的，我来帮你看看。今天天气晴朗，气温二十度左右，适合出门散步。"
+    "记得多喝水，注意防晒哦！还有什么想聊的吗？"
+)
+
+
+class LLMProvider(LLMProviderBase):
+    """离线桩LLM，按配置的首字耗时和输出速率吐出固定回复，可模拟工具调用"""
+
+    def __init__(self, config):
+        replies = config.get("replies") or [config.get("reply") or DEFAULT_REPLY]
+        self.replies = [str(r) for r in replies]
+        # echo模式下复述用户最后一句话，便于核对分句和播报
+        self.echo = str(config.get("echo", False)).lower() in ("true", "1", "yes")
+
+        seed = config.get("seed")
+        seed = int(seed) if seed not in (None, "") else None
+        self.first_token_latency = LatencySampler(
+            config.get("first_token_latency_ms", 300), seed
+        )
+        tokens_per_second = float(config.get("tokens_per_second", 30) or 0)
+        self.token_interval = 1 / tokens_per_second if tokens_per_second > 0 else 0
+        chars_per_token = config.get("chars_per_token", 2)
+        self.chars_per_token = max(1, int(chars_per_token)) if chars_per_token else 2
+
+        # 用户消息包含触发词且请求带有该函数时，先返回一次工具调用
+        tool_call = config.get("tool_call") or {}
+        self.tool_name = tool_call.get("name")
+        self.tool_arguments = tool_call.get("arguments", {})
+        self.tool_trigger = tool_call.get("trigger", "")
+
+        self._reply_index = 0
+
+    def _next_reply(self, dialogue) -> str:
+        if self.echo:
+            for message in reversed(dialogue):
+                if message.get("role") == "user" and message.get("content"):
+                    return str(message["content"])
+        reply = self.replies[self._reply_index % len(self.replies)]
+        self._reply_index += 1
+        return reply
+
+    def _stream_text(self, text):
+        time.sleep(self.first_token_latency.sample())
+        for i in range(0, len(text), self.chars_per_token):
+            if i > 0 and self.token_interval:
+                time.sleep(self.token_interval)
+            yield text[i : i + self.chars_per_token]
+
+    def response(self, session_id, dialogue, **kwargs):
+        yield from self._stream_text(self._next_reply(dialogue))
+
+    def _should_call_tool(self, dialogue, functions) -> bool:
+        if not self.tool_name or not functions or not dialogue:
+            return False
+        # 工具结果已返回时不再重复调用，进入正常回复
+        if dialogue[-1].get("role") != "user":
+            return False
+        names = {f.get("function", {}).get("name") for f in functions}
+        if self.tool_name not in names:
+            return False
+        return self.tool_trigger in str(dialogue[-1].get("content", ""))
+
+    def response_with_functions(self, session_id, dialogue, functions=None, **kwargs):
+        if not self._should_call_tool(dialogue, functions):
+            for token in self._stream_text(self._next_reply(dialogue)):
+                yield token, None
+            return
+
+        time.sleep(self.first_token_latency.sample())
+        call_id = uuid.uuid4().hex
+        # 与OpenAI流式增量格式一致：首包带名称，参数分片到达
+        yield None, [
+            SimpleNamespace(
+                index=0,
+                id=call_id,
+                type="function",
+                function=SimpleNamespace(name=self.tool_name, arguments=""),
+            )
+        ]
+        arguments = json.dumps(self.tool_arguments, ensure_ascii=False)
+        step = self.chars_per_token * 4
+        for i in range(0, len(arguments), step):
+            if self.token_interval:
+                time.sleep(self.token_interval)
+            yield None, [
+                SimpleNamespace(
+                    index=0,
+                    id=None,
+                    type="function",
+                    function=SimpleNamespace(
+                        name=None, arguments=arguments[i : i + step]
+                    ),
+                )
+            ]
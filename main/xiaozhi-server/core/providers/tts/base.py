@@ -16,6 +16,17 @@ from core.utils.tts import MarkdownCleaner
 from core.utils.output_counter import add_device_output
 from core.handle.reportHandle import enqueue_tts_report
 from core.handle.sendAudioHandle import sendAudioMessage
+from core.utils.async_queue import AwaitableQueue
+from core.utils.worker_pool import get_worker_scheduler
+from core.utils.opus_encoder_utils import OpusEncoderUtils
+from core.utils.audio_decoder import StreamingAudioDecoder
+from core.utils.tts_cache import get_tts_cache, build_namespace
+from core.utils.tts_lookahead import LookaheadSynthesizer
+from core.utils.turn_trace import (
+    STAGE_FIRST_SENTENCE,
+    STAGE_TTS_FIRST_BYTE,
+    get_turn_tracer,
+)
 from core.utils.util import audio_bytes_to_data_stream, audio_to_data_stream
 from core.providers.tts.dto.dto import (
     TTSMessageDTO,
@@ -27,16 +38,27 @@ from core.providers.tts.dto.dto import (
 TAG = __name__
 logger = setup_logging()
 
+# 合成请求期间检查句子是否已被打断作废的间隔（秒）
+STALE_CHECK_INTERVAL = 0.1
+
 
 class TTSProviderBase(ABC):
+    # 是否实现了 text_to_speak_stream(text)，按到达顺序返回合成音频字节块
+    supports_stream_audio = False
+
     def __init__(self, config, delete_audio_file):
         self.interface_type = InterfaceType.NON_STREAM
         self.conn = None
         self.delete_audio_file = delete_audio_file
         self.audio_file_type = "wav"
         self.output_file = config.get("output_dir", "tmp/")
-        self.tts_text_queue = queue.Queue()
-        self.tts_audio_queue = queue.Queue()
+        self.tts_text_queue = AwaitableQueue()
+        self.tts_audio_queue = AwaitableQueue()
+        self.tts_priority_task = None
+        self.tts_priority_thread = None
+        # 非流式多句预合成，open_audio_channels时创建
+        self.lookahead = None
+        self.audio_play_priority_task = None
         self.tts_audio_first_sentence = True
         self.before_stop_play_files = []
 
@@ -69,6 +91,20 @@ class TTSProviderBase(ABC):
         self.processed_chars = 0
         self.is_first_sentence = True
 
+        # 边接收边解码编码，仅对supports_stream_audio且返回wav/pcm的供应商生效
+        self.stream_audio = str(config.get("stream_audio", True)).lower() in (
+            "true",
+            "1",
+            "yes",
+        )
+        # 裸PCM响应的采样率，由子类按接口设置
+        self.stream_sample_rate = 16000
+        # 空闲编码器复用，每句话开始时重置状态；多句并行合成时各占一个
+        self._opus_encoders = []
+        self._opus_encoder_lock = threading.Lock()
+        # 语句缓存命名空间，供应商类型与合成参数不同则互不命中
+        self.cache_namespace = build_namespace(config)
+
     def generate_filename(self, extension=".wav"):
         return os.path.join(
             self.output_file,
@@ -82,16 +118,97 @@ class TTSProviderBase(ABC):
     def handle_audio_file(self, file_audio: bytes, text):
         self.before_stop_play_files.append((file_audio, text))
 
-    def to_tts_stream(self, text, opus_handler: Callable[[bytes], None] = None) -> None:
+    def to_tts_stream(
+        self, text, opus_handler: Callable[[bytes], None] = None, audio_queue=None
+    ) -> None:
+        """合成一句话，句首标记写入audio_queue（默认播放队列），音频帧交给opus_handler"""
         text = MarkdownCleaner.clean_markdown(text)
+        if audio_queue is None:
+            audio_queue = self.tts_audio_queue
+        tts_cache = get_tts_cache()
+        cache_key = None
+        if opus_handler is not None:
+            cache_key = tts_cache.make_key(
+                self.cache_namespace, self._output_audio_format(), text
+            )
+        if cache_key is None:
+            self._synthesize_stream(
+                text, self._trace_first_byte(opus_handler, self), audio_queue
+            )
+            return None
+
+        audio_datas = tts_cache.get(cache_key)
+        if audio_datas is not None:
+            logger.bind(tag=TAG).debug(f"TTS缓存命中: {text}")
+            audio_queue.put((SentenceType.FIRST, None, text))
+            opus_handler = self._trace_first_byte(opus_handler, "tts_cache")
+            for audio_data in audio_datas:
+                opus_handler(audio_data)
+            return None
+
+        recorded = []
+        traced_handler = self._trace_first_byte(opus_handler, self)
+
+        def recording_handler(audio_data):
+            recorded.append(audio_data)
+            traced_handler(audio_data)
+
+        if (
+            self._synthesize_stream(text, recording_handler, audio_queue)
+            and not self.conn.client_abort
+        ):
+            tts_cache.put(cache_key, recorded)
+        return None
+
+    def _trace_first_byte(self, opus_handler, provider):
+        """首帧音频到达时记录TTS首包耗时，每轮只记录最先到达的一句"""
+        if opus_handler is None or self.conn is None:
+            return opus_handler
+        tracer = get_turn_tracer()
+        session_id = self.conn.session_id
+        if tracer.has_stage(session_id, STAGE_TTS_FIRST_BYTE):
+            return opus_handler
+        sentence_id = self.conn.sentence_id
+        start_time = time.monotonic()
+        first_frame = [True]
+
+        def handler(audio_data):
+            if first_frame[0]:
+                first_frame[0] = False
+                tracer.record(
+                    session_id,
+                    STAGE_TTS_FIRST_BYTE,
+                    time.monotonic() - start_time,
+                    provider,
+                    sentence_id,
+                )
+            opus_handler(audio_data)
+
+        return handler
+
+    def _output_audio_format(self) -> str:
+        """合成结果的帧格式，仅保存临时文件且设备要求pcm时输出PCM帧"""
+        if not self.delete_audio_file and self.conn and self.conn.audio_format == "pcm":
+            return "pcm"
+        return "opus"
+
+    def _synthesize_stream(
+        self, text, opus_handler: Callable[[bytes], None], audio_queue
+    ) -> bool:
+        """调用供应商合成并逐帧回调，返回是否完整合成"""
+        if self._can_stream_audio():
+            return self._to_tts_stream_incremental(text, opus_handler, audio_queue)
         max_repeat_time = 5
         if self.delete_audio_file:
             # Files that need to be deleted are directly converted to audio data
             while max_repeat_time > 0:
+                if self._is_output_stale(audio_queue):
+                    logger.bind(tag=TAG).info(f"句子已被打断，停止合成: {text}")
+                    return False
                 try:
-                    audio_bytes = asyncio.run(self.text_to_speak(text, None))
+                    audio_bytes = self._run_text_to_speak(text, None, audio_queue)
                     if audio_bytes:
-                        self.tts_audio_queue.put((SentenceType.FIRST, None, text))
+                        audio_queue.put((SentenceType.FIRST, None, text))
                         audio_bytes_to_data_stream(
                             audio_bytes,
                             file_type=self.audio_file_type,
@@ -114,13 +231,15 @@ class TTSProviderBase(ABC):
                 logger.bind(tag=TAG).error(
                     f"Speech generation failed: {text}, please check if network or service is normal"
                 )
-            return None
+            return max_repeat_time > 0
         else:
             tmp_file = self.generate_filename()
             try:
                 while not os.path.exists(tmp_file) and max_repeat_time > 0:
+                    if self._is_output_stale(audio_queue):
+                        break
                     try:
-                        asyncio.run(self.text_to_speak(text, tmp_file))
+                        self._run_text_to_speak(text, tmp_file, audio_queue)
                     except Exception as e:
                         logger.bind(tag=TAG).warning(
                             f"Speech generation failed {5 - max_repeat_time + 1} times: {text}, error: {e}"
@@ -130,6 +249,14 @@ class TTSProviderBase(ABC):
                             os.remove(tmp_file)
                         max_repeat_time -= 1
 
+                if self._is_output_stale(audio_queue):
+                    # 被取消的请求可能只写了一部分文件
+                    logger.bind(tag=TAG).info(f"句子已被打断，停止合成: {text}")
+                    if os.path.exists(tmp_file):
+                        os.remove(tmp_file)
+                    return False
+                # 句首标记与缓存命中时一致，合成失败时也照常发送以显示文本
+                audio_queue.put((SentenceType.FIRST, None, text))
                 if max_repeat_time > 0:
                     logger.bind(tag=TAG).info(
                         f"语音生成成功: {text}:{tmp_file}，重试{5 - max_repeat_time}次"
@@ -138,12 +265,35 @@ class TTSProviderBase(ABC):
                     logger.bind(tag=TAG).error(
                         f"Speech generation failed: {text}, please check if network or service is normal"
                     )
-                    self.tts_audio_queue.put((SentenceType.FIRST, None, text))
+                    return False
                 self._process_audio_file_stream(tmp_file, callback=opus_handler)
+                return True
             except Exception as e:
                 logger.bind(tag=TAG).error(f"Failed to generate TTS file: {e}")
+                return False
+
+    @staticmethod
+    def _is_output_stale(audio_queue) -> bool:
+        """预合成的句子被打断后其输出作废，直接写播放队列时不会作废"""
+        return getattr(audio_queue, "stale", False)
+
+    def _run_text_to_speak(self, text, output_file, audio_queue):
+        """在当前线程运行供应商合成，句子作废时取消请求并返回None"""
+
+        async def run():
+            task = asyncio.ensure_future(self.text_to_speak(text, output_file))
+            while not task.done():
+                if self._is_output_stale(audio_queue):
+                    task.cancel()
+                    break
+                await asyncio.wait({task}, timeout=STALE_CHECK_INTERVAL)
+            try:
+                return await task
+            except asyncio.CancelledError:
                 return None
-    
+
+        return asyncio.run(run())
+
     def to_tts(self, text):
         text = MarkdownCleaner.clean_markdown(text)
         max_repeat_time = 5
@@ -210,6 +360,87 @@ class TTSProviderBase(ABC):
     async def text_to_speak(self, text, output_file):
         pass
 
+    def _can_stream_audio(self) -> bool:
+        return (
+            self.stream_audio
+            and self.delete_audio_file
+            and self.supports_stream_audio
+            and StreamingAudioDecoder.supports(self.audio_file_type)
+        )
+
+    def _to_tts_stream_incremental(
+        self, text, opus_handler: Callable[[bytes], None], audio_queue
+    ) -> bool:
+        """边接收响应边解码并编码Opus，首包无需等待整句合成完成"""
+        opus_encoder = self._acquire_opus_encoder()
+        try:
+            return self._stream_with_encoder(
+                text, opus_handler, audio_queue, opus_encoder
+            )
+        finally:
+            self._release_opus_encoder(opus_encoder)
+
+    def _acquire_opus_encoder(self) -> OpusEncoderUtils:
+        with self._opus_encoder_lock:
+            if self._opus_encoders:
+                return self._opus_encoders.pop()
+        return OpusEncoderUtils(sample_rate=16000, channels=1, frame_size_ms=60)
+
+    def _release_opus_encoder(self, opus_encoder: OpusEncoderUtils):
+        with self._opus_encoder_lock:
+            self._opus_encoders.append(opus_encoder)
+
+    def _stream_with_encoder(
+        self, text, opus_handler, audio_queue, opus_encoder: OpusEncoderUtils
+    ) -> bool:
+        max_repeat_time = 5
+        while max_repeat_time > 0:
+            if self._is_output_stale(audio_queue):
+                logger.bind(tag=TAG).info(f"句子已被打断，停止合成: {text}")
+                return False
+            audio_started = False
+            try:
+                decoder = StreamingAudioDecoder(
+                    self.audio_file_type, self.stream_sample_rate
+                )
+                opus_encoder.reset_state()
+                for chunk in self.text_to_speak_stream(text):
+                    if self.conn.client_abort or self._is_output_stale(audio_queue):
+                        logger.bind(tag=TAG).info(f"收到打断信息，停止接收语音: {text}")
+                        return False
+                    pcm = decoder.feed(chunk)
+                    if not pcm:
+                        continue
+                    if not audio_started:
+                        audio_queue.put((SentenceType.FIRST, None, text))
+                        audio_started = True
+                    opus_encoder.encode_pcm_to_opus_stream(pcm, False, opus_handler)
+
+                pcm = decoder.flush()
+                if not audio_started:
+                    if not pcm:
+                        raise Exception("empty audio response")
+                    audio_queue.put((SentenceType.FIRST, None, text))
+                    audio_started = True
+                opus_encoder.encode_pcm_to_opus_stream(pcm, True, opus_handler)
+                logger.bind(tag=TAG).info(
+                    f"Speech generation successful: {text}, retried {5 - max_repeat_time} times"
+                )
+                return True
+            except Exception as e:
+                if audio_started:
+                    # 部分音频已下发，重试会重复播放
+                    logger.bind(tag=TAG).error(f"Speech stream interrupted: {text}, error: {e}")
+                    return False
+                max_repeat_time -= 1
+                logger.bind(tag=TAG).warning(
+                    f"Speech generation failed {5 - max_repeat_time} times: {text}, error: {e}"
+                )
+        logger.bind(tag=TAG).error(
+            f"Speech generation failed: {text}, please check if network or service is normal"
+        )
+        return False
+
     def audio_to_pcm_data_stream(
         self, audio_file_path, callback: Callable[[Any], Any] = None
     ):
@@ -252,17 +483,52 @@ class TTSProviderBase(ABC):
 
     async def open_audio_channels(self, conn):
         self.conn = conn
-        # tts 消化线程
-        self.tts_priority_thread = threading.Thread(
-            target=self.tts_text_priority_thread, daemon=True
-        )
-        self.tts_priority_thread.start()
+        if type(self).tts_text_priority_thread is TTSProviderBase.tts_text_priority_thread:
+            # 默认非流式处理：在事件循环中等待文本，合成放到共享TTS线程池执行
+            self.lookahead = LookaheadSynthesizer(
+                self.tts_audio_queue,
+                get_worker_scheduler().get_pool("tts"),
+                max_inflight=int(conn.config.get("tts_lookahead_sentences", 3)),
+                is_aborted=lambda: self.conn.client_abort,
+            )
+            self.tts_priority_task = asyncio.create_task(self._tts_text_priority_task())
+        else:
+            # 流式子类重写了文本处理线程，保持原有线程方式
+            self.tts_priority_thread = threading.Thread(
+                target=self.tts_text_priority_thread, daemon=True
+            )
+            self.tts_priority_thread.start()
 
-        # 音频播放 消化线程
-        self.audio_play_priority_thread = threading.Thread(
-            target=self._audio_play_priority_thread, daemon=True
+        # 音频播放 消化任务
+        self.audio_play_priority_task = asyncio.create_task(
+            self._audio_play_priority_task()
         )
-        self.audio_play_priority_thread.start()
+
+    def close_audio_channels(self):
+        """取消音频通道任务，连接关闭时调用"""
+        for task in (self.tts_priority_task, self.audio_play_priority_task):
+            if task is not None and not task.done():
+                task.cancel()
+        self.tts_priority_task = None
+        self.audio_play_priority_task = None
+
+    def clear_pending_audio(self):
+        """打断时丢弃已预合成但尚未进入播放队列的句子"""
+        if self.lookahead is not None:
+            self.lookahead.reset()
+
+    async def _tts_text_priority_task(self):
+        pool = get_worker_scheduler().get_pool("tts")
+        while not self.conn.stop_event.is_set():
+            # 预合成句数达到上限时暂停取文本，由在途句子完成后唤醒
+            await self.lookahead.wait_for_capacity()
+            message = await self.tts_text_queue.get_async()
+            try:
+                await pool.run(self._handle_tts_text_message, message)
+            except Exception as e:
+                logger.bind(tag=TAG).error(
+                    f"处理TTS文本失败: {str(e)}, 类型: {type(e).__name__}, 堆栈: {traceback.format_exc()}"
+                )
 
     # 这里默认是非流式的处理方式
     # 流式处理方式请在子类中重写
@@ -270,36 +536,7 @@ class TTSProviderBase(ABC):
         while not self.conn.stop_event.is_set():
             try:
                 message = self.tts_text_queue.get(timeout=1)
-                if message.sentence_type == SentenceType.FIRST:
-                    self.conn.client_abort = False
-                if self.conn.client_abort:
-                    logger.bind(tag=TAG).info("收到打断信息，终止TTS文本处理线程")
-                    continue
-                if message.sentence_type == SentenceType.FIRST:
-                    # 初始化参数
-                    self.tts_stop_request = False
-                    self.processed_chars = 0
-                    self.tts_text_buff = []
-                    self.is_first_sentence = True
-                    self.tts_audio_first_sentence = True
-                elif ContentType.TEXT == message.content_type:
-                    self.tts_text_buff.append(message.content_detail)
-                    segment_text = self._get_segment_text()
-                    if segment_text:
-                        self.to_tts_stream(segment_text, opus_handler=self.handle_opus)
-                elif ContentType.FILE == message.content_type:
-                    self._process_remaining_text_stream(opus_handler=self.handle_opus)
-                    tts_file = message.content_file
-                    if tts_file and os.path.exists(tts_file):
-                        self._process_audio_file_stream(
-                            tts_file, callback=self.handle_opus
-                        )
-                if message.sentence_type == SentenceType.LAST:
-                    self._process_remaining_text_stream(opus_handler=self.handle_opus)
-                    self.tts_audio_queue.put(
-                        (message.sentence_type, [], message.content_detail)
-                    )
-
+                self._handle_tts_text_message(message)
             except queue.Empty:
                 continue
             except Exception as e:
@@ -308,21 +545,59 @@ class TTSProviderBase(ABC):
                 )
                 continue
 
-    def _audio_play_priority_thread(self):
+    def _handle_tts_text_message(self, message):
+        """非流式处理一条TTS文本消息，在TTS线程池中执行
+
+        切分出的句子提交给预合成流水线后立即返回，音频按提交顺序进入播放队列
+        """
+        if message.sentence_type == SentenceType.FIRST:
+            self.conn.client_abort = False
+        if self.conn.client_abort:
+            logger.bind(tag=TAG).info("收到打断信息，终止TTS文本处理线程")
+            return
+        if message.sentence_type == SentenceType.FIRST:
+            # 初始化参数
+            self.tts_stop_request = False
+            self.processed_chars = 0
+            self.tts_text_buff = []
+            self.is_first_sentence = True
+            self.tts_audio_first_sentence = True
+        elif ContentType.TEXT == message.content_type:
+            self.tts_text_buff.append(message.content_detail)
+            segment_text = self._get_segment_text()
+            if segment_text:
+                self._submit_sentence(segment_text)
+        elif ContentType.FILE == message.content_type:
+            self._submit_sentence(self._get_remaining_text())
+            tts_file = message.content_file
+            if tts_file and os.path.exists(tts_file):
+                self.lookahead.submit(
+                    lambda sink: self._process_audio_file_stream(
+                        tts_file, callback=sink.handle_opus
+                    )
+                )
+        if message.sentence_type == SentenceType.LAST:
+            self._submit_sentence(self._get_remaining_text())
+            last_item = (message.sentence_type, [], message.content_detail)
+            self.lookahead.submit(lambda sink: sink.put(last_item))
+
+    def _submit_sentence(self, segment_text):
+        if not segment_text:
+            return
+        self.lookahead.submit(
+            lambda sink: self.to_tts_stream(
+                segment_text, opus_handler=sink.handle_opus, audio_queue=sink
+            )
+        )
+
+    async def _audio_play_priority_task(self):
         # 需要上报的文本和音频列表
         enqueue_text = None
         enqueue_audio = None
         while not self.conn.stop_event.is_set():
             text = None
             try:
-                try:
-                    sentence_type, audio_datas, text = self.tts_audio_queue.get(
-                        timeout=0.1
-                    )
-                except queue.Empty:
-                    if self.conn.stop_event.is_set():
-                        break
-                    continue
+                sentence_type, audio_datas, text = await self.tts_audio_queue.get_async()
 
                 if self.conn.client_abort:
                     logger.bind(tag=TAG).debug("收到打断信号，跳过当前音频数据")
@@ -341,19 +616,15 @@ class TTSProviderBase(ABC):
                 if isinstance(audio_datas, bytes) and enqueue_audio is not None:
                     enqueue_audio.append(audio_datas)
 
-                # 发送音频
-                future = asyncio.run_coroutine_threadsafe(
-                    sendAudioMessage(self.conn, sentence_type, audio_datas, text),
-                    self.conn.loop,
-                )
-                future.result()
+                # 发送音频，已在事件循环中，直接等待
+                await sendAudioMessage(self.conn, sentence_type, audio_datas, text)
 
                 # 记录输出和报告
                 if self.conn.max_output_size > 0 and text:
                     add_device_output(self.conn.headers.get("device-id"), len(text))
 
             except Exception as e:
-                logger.bind(tag=TAG).error(f"audio_play_priority_thread: {text} {e}")
+                logger.bind(tag=TAG).error(f"audio_play_priority_task: {text} {e}")
 
     async def start_session(self, session_id):
         pass
@@ -396,6 +667,12 @@ class TTSProviderBase(ABC):
             # 如果是第一句话，在找到第一个逗号后，将标志设置为False
             if self.is_first_sentence:
                 self.is_first_sentence = False
+                get_turn_tracer().record(
+                    self.conn.session_id,
+                    STAGE_FIRST_SENTENCE,
+                    provider=self,
+                    sentence_id=self.conn.sentence_id,
+                )
 
             return segment_text
         elif self.tts_stop_request and current_text:
@@ -443,12 +720,19 @@ class TTSProviderBase(ABC):
         Returns:
             bool: 是否成功处理了文本
         """
+        segment_text = self._get_remaining_text()
+        if segment_text:
+            self.to_tts_stream(segment_text, opus_handler=opus_handler)
+            return True
+        return False
+
+    def _get_remaining_text(self):
+        """取出尚未切分的剩余文本并标记为已处理，没有可合成内容时返回None"""
         full_text = "".join(self.tts_text_buff)
         remaining_text = full_text[self.processed_chars :]
         if remaining_text:
             segment_text = textUtils.get_string_no_punctuation_or_emoji(remaining_text)
             if segment_text:
-                self.to_tts_stream(segment_text, opus_handler=opus_handler)
                 self.processed_chars += len(full_text)
-                return True
-        return False
+                return segment_text
+        return None
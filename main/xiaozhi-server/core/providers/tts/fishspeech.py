@@ -78,6 +78,7 @@ def read_ref_text(ref_text):
 
 
 class TTSProvider(TTSProviderBase):
+    supports_stream_audio = True
 
     def __init__(self, config, delete_audio_file):
         super().__init__(config, delete_audio_file)
@@ -134,8 +135,10 @@ class TTSProvider(TTSProviderBase):
         self.use_memory_cache = config.get("use_memory_cache", "on")
         self.seed = int(config.get("seed")) if config.get("seed") else None
         self.api_url = config.get("api_url", "http://127.0.0.1:8080/v1/tts")
+        # 裸PCM无文件头，按配置的采样率解析
+        self.stream_sample_rate = self.rate
 
-    async def text_to_speak(self, text, output_file):
+    def _build_request(self, text):
         # Prepare reference data
         byte_audios = [audio_to_bytes(ref_audio) for ref_audio in self.reference_audio]
         ref_texts = [read_ref_text(ref_text) for ref_text in self.reference_text]
@@ -160,17 +163,18 @@ class TTSProvider(TTSProviderBase):
         }
 
         pydantic_data = ServeTTSRequest(**data)
-
-        response = requests.post(
-            self.api_url,
-            data=ormsgpack.packb(
-                pydantic_data, option=ormsgpack.OPT_SERIALIZE_PYDANTIC
-            ),
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/msgpack",
-            },
+        payload = ormsgpack.packb(
+            pydantic_data, option=ormsgpack.OPT_SERIALIZE_PYDANTIC
         )
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/msgpack",
+        }
+        return payload, headers
+
+    async def text_to_speak(self, text, output_file):
+        payload, headers = self._build_request(text)
+        response = requests.post(self.api_url, data=payload, headers=headers)
 
         if response.status_code == 200:
             audio_content = response.content
@@ -186,3 +190,14 @@ class TTSProvider(TTSProviderBase):
             print(error_msg)
             print(response.json())
             raise Exception(error_msg)
+
+    def text_to_speak_stream(self, text):
+        payload, headers = self._build_request(text)
+        with requests.post(
+            self.api_url, data=payload, headers=headers, stream=True
+        ) as response:
+            if response.status_code != 200:
+                raise Exception(
+                    f"Request failed with status code {response.status_code}"
+                )
+            yield from response.iter_content(chunk_size=None)
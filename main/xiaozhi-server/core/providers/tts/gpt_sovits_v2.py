@@ -8,6 +8,8 @@ logger = setup_logging()
 
 
 class TTSProvider(TTSProviderBase):
+    supports_stream_audio = True
+
     def __init__(self, config, delete_audio_file):
         super().__init__(config, delete_audio_file)
         self.url = config.get("url")
@@ -67,7 +69,7 @@ class TTSProvider(TTSProviderBase):
         )
         self.audio_file_type = config.get("format", "wav")
 
-    async def text_to_speak(self, text, output_file):
+    def _build_request(self, text):
         request_json = {
             "text": text,
             "text_lang": self.text_lang,
@@ -89,7 +91,10 @@ class TTSProvider(TTSProviderBase):
             "parallel_infer": self.parallel_infer,
             "repetition_penalty": self.repetition_penalty,
         }
+        return request_json
 
+    async def text_to_speak(self, text, output_file):
+        request_json = self._build_request(text)
         resp = requests.post(self.url, json=request_json)
         if resp.status_code == 200:
             if output_file:
@@ -101,3 +106,12 @@ class TTSProvider(TTSProviderBase):
             error_msg = f"GPT_SoVITS_V2 TTS请求失败: {resp.status_code} - {resp.text}"
             logger.bind(tag=TAG).error(error_msg)
             raise Exception(error_msg)
+
+    def text_to_speak_stream(self, text):
+        request_json = self._build_request(text)
+        with requests.post(self.url, json=request_json, stream=True) as resp:
+            if resp.status_code != 200:
+                error_msg = f"GPT_SoVITS_V2 TTS请求失败: {resp.status_code} - {resp.text}"
+                logger.bind(tag=TAG).error(error_msg)
+                raise Exception(error_msg)
+            yield from resp.iter_content(chunk_size=None)
@@ -8,6 +8,8 @@ logger = setup_logging()
 
 
 class TTSProvider(TTSProviderBase):
+    supports_stream_audio = True
+
     def __init__(self, config, delete_audio_file):
         super().__init__(config, delete_audio_file)
         self.url = config.get("url")
@@ -34,7 +36,7 @@ class TTSProvider(TTSProviderBase):
         self.if_sr = str(config.get("if_sr", False)).lower() in ("true", "1", "yes")
         self.audio_file_type = config.get("format", "wav")
 
-    async def text_to_speak(self, text, output_file):
+    def _build_request(self, text):
         request_params = {
             "refer_wav_path": self.refer_wav_path,
             "prompt_text": self.prompt_text,
@@ -50,7 +52,10 @@ class TTSProvider(TTSProviderBase):
             "sample_steps": self.sample_steps,
             "if_sr": self.if_sr,
         }
+        return request_params
 
+    async def text_to_speak(self, text, output_file):
+        request_params = self._build_request(text)
         resp = requests.get(self.url, params=request_params)
         if resp.status_code == 200:
             if output_file:
@@ -62,3 +67,12 @@ class TTSProvider(TTSProviderBase):
             error_msg = f"GPT_SoVITS_V3 TTS请求失败: {resp.status_code} - {resp.text}"
             logger.bind(tag=TAG).error(error_msg)
             raise Exception(error_msg)
+
+    def text_to_speak_stream(self, text):
+        request_params = self._build_request(text)
+        with requests.get(self.url, params=request_params, stream=True) as resp:
+            if resp.status_code != 200:
+                error_msg = f"GPT_SoVITS_V3 TTS请求失败: {resp.status_code} - {resp.text}"
+                logger.bind(tag=TAG).error(error_msg)
+                raise Exception(error_msg)
+            yield from resp.iter_content(chunk_size=None)
@@ -8,6 +8,8 @@ logger = setup_logging()
 
 
 class TTSProvider(TTSProviderBase):
+    supports_stream_audio = True
+
     def __init__(self, config, delete_audio_file):
         super().__init__(config, delete_audio_file)
         self.api_key = config.get("api_key")
@@ -29,7 +31,7 @@ class TTSProvider(TTSProviderBase):
         if model_key_msg:
             logger.bind(tag=TAG).error(model_key_msg)
 
-    async def text_to_speak(self, text, output_file):
+    def _build_request(self, text):
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
@@ -41,6 +43,10 @@ class TTSProvider(TTSProviderBase):
             "response_format": "wav",
             "speed": self.speed,
         }
+        return headers, data
+
+    async def text_to_speak(self, text, output_file):
+        headers, data = self._build_request(text)
         response = requests.post(self.api_url, json=data, headers=headers)
         if response.status_code == 200:
             if output_file:
@@ -52,3 +58,15 @@ class TTSProvider(TTSProviderBase):
             raise Exception(
                 f"OpenAI TTS请求失败: {response.status_code} - {response.text}"
             )
+
+    def text_to_speak_stream(self, text):
+        headers, data = self._build_request(text)
+        with requests.post(
+            self.api_url, json=data, headers=headers, stream=True
+        ) as response:
+            if response.status_code != 200:
+                raise Exception(
+                    f"OpenAI TTS请求失败: {response.status_code} - {response.text}"
+                )
+            # 按分块到达即返回，不等待整段响应
+            yield from response.iter_content(chunk_size=None)
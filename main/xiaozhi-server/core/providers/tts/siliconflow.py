@@ -3,6 +3,8 @@ from core.providers.tts.base import TTSProviderBase
 
 
 class TTSProvider(TTSProviderBase):
+    supports_stream_audio = True
+
     def __init__(self, config, delete_audio_file):
         super().__init__(config, delete_audio_file)
         self.model = config.get("model")
@@ -17,10 +19,13 @@ class TTSProvider(TTSProviderBase):
         self.speed = float(config.get("speed", 1.0))
         self.gain = config.get("gain")
 
+        # 裸PCM无文件头，按请求的采样率解析，接口默认44100
+        self.stream_sample_rate = int(self.sample_rate) if self.sample_rate else 44100
+
         self.host = "api.siliconflow.cn"
         self.api_url = f"https://{self.host}/v1/audio/speech"
 
-    async def text_to_speak(self, text, output_file):
+    def _build_request(self, text):
         request_json = {
             "model": self.model,
             "input": text,
@@ -31,6 +36,10 @@ class TTSProvider(TTSProviderBase):
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json",
         }
+        return request_json, headers
+
+    async def text_to_speak(self, text, output_file):
+        request_json, headers = self._build_request(text)
         try:
             response = requests.request(
                 "POST", self.api_url, json=request_json, headers=headers
@@ -43,3 +52,17 @@ class TTSProvider(TTSProviderBase):
                 return data
         except Exception as e:
             raise Exception(f"{__name__} error: {e}")
+
+    def text_to_speak_stream(self, text):
+        request_json, headers = self._build_request(text)
+        request_json["stream"] = True
+        if self.sample_rate:
+            request_json["sample_rate"] = int(self.sample_rate)
+        with requests.post(
+            self.api_url, json=request_json, headers=headers, stream=True
+        ) as response:
+            if response.status_code != 200:
+                raise Exception(
+                    f"{__name__} error: {response.status_code} - {response.text}"
+                )
+            yield from response.iter_content(chunk_size=None)
@@ -0,0 +1,99 @@
+import io
+import time
+import wave
+import zlib
+import numpy as np
+from config.logger import setup_logging
+from core.providers.tts.base import TTSProviderBase
+from core.utils.latency_sampler import LatencySampler
+
+TAG = __name__
+logger = setup_logging()
+
+
+class TTSProvider(TTSProviderBase):
+    """离线桩TTS，按文本长度生成确定性的类语音音频，模拟首包耗时、合成速度和分块大小"""
+
+    supports_stream_audio = True
+
+    def __init__(self, config, delete_audio_file):
+        super().__init__(config, delete_audio_file)
+        self.audio_file_type = config.get("format", "wav")
+        sample_rate = config.get("sample_rate", 24000)
+        self.sample_rate = int(sample_rate) if sample_rate else 24000
+        # 裸PCM按生成时的采样率解析
+        self.stream_sample_rate = self.sample_rate
+
+        seed = config.get("seed")
+        seed = int(seed) if seed not in (None, "") else None
+        self.first_byte_latency = LatencySampler(
+            config.get("first_byte_latency_ms", 200), seed
+        )
+        seconds_per_char = config.get("seconds_per_char", 0.2)
+        self.seconds_per_char = float(seconds_per_char) if seconds_per_char else 0.2
+        # 合成耗时与音频时长之比，0.1表示合成速度为播放速度的10倍
+        realtime_factor = config.get("realtime_factor", 0.1)
+        self.realtime_factor = float(realtime_factor) if realtime_factor else 0.0
+        chunk_ms = config.get("chunk_ms", 100)
+        self.chunk_ms = int(chunk_ms) if chunk_ms else 100
+
+    def _synthesize_pcm(self, text) -> bytes:
+        """同一文本总是生成相同的音频：音高随字符变化的谐波叠加，带音节包络"""
+        samples_per_char = int(self.sample_rate * self.seconds_per_char)
+        t = np.arange(samples_per_char) / self.sample_rate
+        envelope = np.sin(np.pi * np.arange(samples_per_char) / samples_per_char) ** 2
+        segments = []
+        for char in text or " ":
+            pitch = 120 + zlib.crc32(char.encode("utf-8")) % 160
+            tone = sum(
+                np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 5)
+            )
+            segments.append(0.25 * tone * envelope)
+        signal = np.concatenate(segments)
+        return (np.clip(signal, -1, 1) * 32767).astype("<i2").tobytes()
+
+    def _wav_header(self) -> bytes:
+        """流式接口先发出的文件头，数据长度未知"""
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(self.sample_rate)
+        header = bytearray(buffer.getvalue())
+        header[4:8] = b"\xff\xff\xff\xff"
+        header[40:44] = b"\xff\xff\xff\xff"
+        return bytes(header)
+
+    def _encode(self, pcm: bytes) -> bytes:
+        if self.audio_file_type == "pcm":
+            return pcm
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(self.sample_rate)
+            wf.writeframes(pcm)
+        return buffer.getvalue()
+
+    async def text_to_speak(self, text, output_file):
+        pcm = self._synthesize_pcm(text)
+        duration = len(pcm) / 2 / self.sample_rate
+        time.sleep(self.first_byte_latency.sample() + duration * self.realtime_factor)
+        audio_bytes = self._encode(pcm)
+        if output_file:
+            with open(output_file, "wb") as audio_file:
+                audio_file.write(audio_bytes)
+        else:
+            return audio_bytes
+
+    def text_to_speak_stream(self, text):
+        pcm = self._synthesize_pcm(text)
+        chunk_bytes = max(2, int(self.sample_rate * self.chunk_ms / 1000) * 2)
+        chunk_delay = self.chunk_ms / 1000 * self.realtime_factor
+        time.sleep(self.first_byte_latency.sample())
+        if self.audio_file_type != "pcm":
+            yield self._wav_header()
+        for i in range(0, len(pcm), chunk_bytes):
+            if chunk_delay:
+                time.sleep(chunk_delay)
+            yield pcm[i : i + chunk_bytes]
@@ -1,9 +1,275 @@
+import time
+import numpy as np
+import opuslib_next
 from abc import ABC, abstractmethod
-from typing import Optional
+from collections import deque
+from typing import Optional, Tuple
+from config.logger import setup_logging
+from core.utils.turn_trace import STAGE_VAD_STOP, get_turn_tracer
+from core.providers.vad.batch_engine import (
+    CHUNK_SAMPLES,
+    CONTEXT_SAMPLES,
+    STATE_SHAPE,
+    VADBatchEngine,
+)
+
+TAG = __name__
+logger = setup_logging()
+
+
+class VADSession:
+    """Per-connection VAD state
+
+    Holds the connection's own Opus decoder, the model's recurrent state, a preallocated
+    PCM ring buffer and the hysteresis window, so connections sharing one VAD provider
+    never touch each other's state.
+    """
+
+    __slots__ = (
+        "decoder",
+        "state",
+        "context",
+        "voice_window",
+        "last_is_voice",
+        "_ring",
+        "_read_pos",
+        "_size",
+        "_chunk",
+    )
+
+    def __init__(self, ring_capacity: int = 4096, window_size: int = 5):
+        self.decoder = opuslib_next.Decoder(16000, 1)
+        self.state = np.zeros(STATE_SHAPE, dtype=np.float32)
+        self.context = np.zeros((1, CONTEXT_SAMPLES), dtype=np.float32)
+        self.voice_window = deque(maxlen=window_size)
+        self.last_is_voice = False
+        self._ring = np.zeros(ring_capacity, dtype=np.int16)
+        self._read_pos = 0
+        self._size = 0
+        self._chunk = np.empty(CHUNK_SAMPLES, dtype=np.float32)
+
+    def decode(self, opus_packet: bytes) -> bytes:
+        """Decode one 60ms Opus packet to 16kHz mono PCM"""
+        return self.decoder.decode(opus_packet, 960)
+
+    def push_pcm(self, pcm: bytes):
+        """Append 16-bit PCM to the ring buffer, oldest samples are dropped on overflow"""
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        capacity = len(self._ring)
+        n = len(samples)
+        if n >= capacity:
+            samples = samples[-capacity:]
+            n = capacity
+            self._read_pos, self._size = 0, 0
+        elif self._size + n > capacity:
+            overflow = self._size + n - capacity
+            self._read_pos = (self._read_pos + overflow) % capacity
+            self._size -= overflow
+
+        write_pos = (self._read_pos + self._size) % capacity
+        first = min(n, capacity - write_pos)
+        self._ring[write_pos : write_pos + first] = samples[:first]
+        if first < n:
+            self._ring[: n - first] = samples[first:]
+        self._size += n
+
+    def pop_chunk(self) -> Optional[np.ndarray]:
+        """Take the next 512 samples as normalized float32
+
+        The returned array is reused by the next call, consume it before popping again.
+        """
+        if self._size < CHUNK_SAMPLES:
+            return None
+        capacity = len(self._ring)
+        first = min(CHUNK_SAMPLES, capacity - self._read_pos)
+        np.multiply(
+            self._ring[self._read_pos : self._read_pos + first],
+            1.0 / 32768.0,
+            out=self._chunk[:first],
+            casting="unsafe",
+        )
+        if first < CHUNK_SAMPLES:
+            np.multiply(
+                self._ring[: CHUNK_SAMPLES - first],
+                1.0 / 32768.0,
+                out=self._chunk[first:],
+                casting="unsafe",
+            )
+        self._read_pos = (self._read_pos + CHUNK_SAMPLES) % capacity
+        self._size -= CHUNK_SAMPLES
+        return self._chunk
+
+    def clear_audio(self):
+        """Drop buffered PCM, the model state and voice window are kept"""
+        self._read_pos = 0
+        self._size = 0
 
 
 class VADProviderBase(ABC):
+    def create_session(self, conn) -> VADSession:
+        """Create the VAD state owned by one connection"""
+        return VADSession()
+
+    def get_session(self, conn) -> VADSession:
+        """Return the connection's VAD session, creating it on first use"""
+        session = getattr(conn, "vad_session", None)
+        if session is None:
+            session = self.create_session(conn)
+            conn.vad_session = session
+        return session
+
     @abstractmethod
     def is_vad(self, conn, data) -> bool:
         """Detect voice activity in audio data"""
         pass
+
+    async def is_vad_async(self, conn, data) -> bool:
+        """Detect voice activity without blocking the event loop, defaults to is_vad"""
+        return self.is_vad(conn, data)
+
+
+class SileroVADProviderBase(VADProviderBase):
+    """Shared chunking, hysteresis and batching for Silero VAD backends
+
+    Subclasses only provide _infer_batch, which runs the model on a batch of
+    512-sample chunks with explicit per-stream state.
+    """
+
+    def __init__(self, config):
+        # Handle empty string case
+        threshold = config.get("threshold", "0.5")
+        threshold_low = config.get("threshold_low", "0.2")
+        min_silence_duration_ms = config.get("min_silence_duration_ms", "1000")
+
+        self.vad_threshold = float(threshold) if threshold else 0.5
+        self.vad_threshold_low = float(threshold_low) if threshold_low else 0.2
+
+        self.silence_threshold_ms = (
+            int(min_silence_duration_ms) if min_silence_duration_ms else 1000
+        )
+
+        # Minimum number of frames to count as having voice
+        self.frame_window_threshold = 3
+
+        # Cross-connection batched inference, disabled by default
+        self.batch_engine = None
+        if str(config.get("batch_enabled", False)).lower() in ("true", "1", "yes"):
+            self.batch_engine = VADBatchEngine(
+                self._infer_batch,
+                batch_window_ms=float(config.get("batch_window_ms") or 5),
+                max_batch_size=int(config.get("max_batch_size") or 64),
+            )
+            logger.bind(tag=TAG).info("Silero VAD batched inference enabled")
+
+    def __del__(self):
+        if getattr(self, "batch_engine", None) is not None:
+            self.batch_engine.stop()
+
+    @abstractmethod
+    def _infer_batch(
+        self, x: np.ndarray, state: np.ndarray, context: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Run one forward pass over a batch of chunks with explicit per-stream state
+
+        Args:
+            x: float32 array of shape (B, 512)
+            state: float32 array of shape (2, B, 128)
+            context: float32 array of shape (B, 64)
+
+        Returns:
+            (probs[B], new_state, new_context)
+        """
+        pass
+
+    def _update_voice_state(self, conn, session, speech_prob):
+        """Apply dual threshold and sliding window to one chunk's speech probability"""
+        # Dual threshold judgment
+        if speech_prob >= self.vad_threshold:
+            is_voice = True
+        elif speech_prob <= self.vad_threshold_low:
+            is_voice = False
+        else:
+            is_voice = session.last_is_voice
+
+        # If sound doesn't drop below minimum value, continue previous state, judge as having voice
+        session.last_is_voice = is_voice
+
+        # Update sliding window
+        session.voice_window.append(is_voice)
+        client_have_voice = (
+            session.voice_window.count(True) >= self.frame_window_threshold
+        )
+
+        # If there was voice before, but no voice this time, and the time difference from last voice has exceeded silence threshold, consider sentence finished
+        if conn.client_have_voice and not client_have_voice:
+            stop_duration = time.time() * 1000 - conn.last_activity_time
+            if stop_duration >= self.silence_threshold_ms:
+                conn.client_voice_stop = True
+                # The turn starts when the user stopped speaking, not when silence was confirmed
+                tracer = get_turn_tracer()
+                tracer.start_turn(
+                    conn.session_id, time.monotonic() - stop_duration / 1000
+                )
+                tracer.record(
+                    conn.session_id, STAGE_VAD_STOP, stop_duration / 1000, self
+                )
+        if client_have_voice:
+            conn.client_have_voice = True
+            conn.last_activity_time = time.time() * 1000
+
+        return client_have_voice
+
+    def is_vad(self, conn, opus_packet):
+        try:
+            session = self.get_session(conn)
+            session.push_pcm(session.decode(opus_packet))
+
+            # Process complete frames in buffer (process 512 samples each time)
+            client_have_voice = False
+            while True:
+                chunk = session.pop_chunk()
+                if chunk is None:
+                    break
+
+                # Detect voice activity with this connection's own model state
+                probs, session.state, session.context = self._infer_batch(
+                    chunk[np.newaxis, :], session.state, session.context
+                )
+
+                client_have_voice = self._update_voice_state(
+                    conn, session, float(probs[0])
+                )
+
+            return client_have_voice
+        except opuslib_next.OpusError as e:
+            logger.bind(tag=TAG).info(f"Decoding error: {e}")
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"Error processing audio packet: {e}")
+
+    async def is_vad_async(self, conn, opus_packet):
+        if self.batch_engine is None:
+            return self.is_vad(conn, opus_packet)
+        try:
+            session = self.get_session(conn)
+            session.push_pcm(session.decode(opus_packet))
+
+            client_have_voice = False
+            while True:
+                chunk = session.pop_chunk()
+                if chunk is None:
+                    break
+
+                # Wait for the batch engine, the event loop keeps serving other devices meanwhile
+                speech_prob, session.state, session.context = (
+                    await self.batch_engine.infer(chunk, session.state, session.context)
+                )
+
+                client_have_voice = self._update_voice_state(
+                    conn, session, speech_prob
+                )
+
+            return client_have_voice
+        except opuslib_next.OpusError as e:
+            logger.bind(tag=TAG).info(f"Decoding error: {e}")
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"Error processing audio packet: {e}")
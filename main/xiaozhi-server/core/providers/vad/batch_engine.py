@@ -0,0 +1,154 @@
+import time
+import queue
+import asyncio
+import threading
+import numpy as np
+from typing import Callable, Optional, Tuple
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+# Silero VAD at 16kHz: 512 samples per chunk, 64 samples of context, state shape (2, B, 128)
+CHUNK_SAMPLES = 512
+CONTEXT_SAMPLES = 64
+STATE_SHAPE = (2, 1, 128)
+
+InferBatchFn = Callable[
+    [np.ndarray, np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray, np.ndarray]
+]
+
+
+class VADBatchEngine:
+    """Cross-connection batched VAD inference
+
+    Chunks submitted by all connections within a short time window are stacked into
+    one batch and run through a single forward pass. Each caller carries its own
+    recurrent state and context, so batching never mixes state between devices.
+    """
+
+    def __init__(
+        self,
+        infer_batch: InferBatchFn,
+        batch_window_ms: float = 5,
+        max_batch_size: int = 64,
+    ):
+        """
+        Args:
+            infer_batch: fn(x[B, 512], state[2, B, 128], context[B, 64]) -> (probs[B], state, context)
+            batch_window_ms: How long to wait for more chunks after the first one arrives
+            max_batch_size: Maximum number of chunks in one forward pass
+        """
+        self._infer_batch = infer_batch
+        self.batch_window = max(float(batch_window_ms), 0.0) / 1000.0
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self._queue = queue.Queue()
+        self._stats = {"batches": 0, "chunks": 0, "max_batch": 0, "infer_time": 0.0}
+        self._thread = threading.Thread(
+            target=self._run, name="vad-batch-engine", daemon=True
+        )
+        self._thread.start()
+
+    @staticmethod
+    def initial_state() -> Tuple[np.ndarray, np.ndarray]:
+        """Return a fresh (state, context) pair for a new stream"""
+        return (
+            np.zeros(STATE_SHAPE, dtype=np.float32),
+            np.zeros((1, CONTEXT_SAMPLES), dtype=np.float32),
+        )
+
+    async def infer(
+        self,
+        chunk: np.ndarray,
+        state: Optional[np.ndarray],
+        context: Optional[np.ndarray],
+    ) -> Tuple[float, np.ndarray, np.ndarray]:
+        """Submit one 512-sample float32 chunk and wait for its speech probability
+
+        Returns:
+            (speech_prob, new_state, new_context)
+        """
+        if state is None or context is None:
+            state, context = self.initial_state()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put((chunk, state, context, loop, future))
+        return await future
+
+    def get_stats(self) -> dict:
+        stats = dict(self._stats)
+        stats["avg_batch"] = (
+            stats["chunks"] / stats["batches"] if stats["batches"] else 0.0
+        )
+        return stats
+
+    def stop(self):
+        self._queue.put(None)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    if timeout > 0:
+                        item = self._queue.get(timeout=timeout)
+                    else:
+                        # Window is over, but still take whatever is already waiting
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._process(batch)
+        logger.bind(tag=TAG).info("VAD batch engine exited")
+
+    def _process(self, batch):
+        try:
+            x = np.stack([item[0] for item in batch]).astype(np.float32, copy=False)
+            state = np.concatenate([item[1] for item in batch], axis=1)
+            context = np.concatenate([item[2] for item in batch], axis=0)
+
+            start_time = time.perf_counter()
+            probs, new_state, new_context = self._infer_batch(x, state, context)
+            self._stats["infer_time"] += time.perf_counter() - start_time
+            self._stats["batches"] += 1
+            self._stats["chunks"] += len(batch)
+            self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+
+            for i, (_, _, _, loop, future) in enumerate(batch):
+                result = (
+                    float(probs[i]),
+                    new_state[:, i : i + 1].copy(),
+                    new_context[i : i + 1].copy(),
+                )
+                _dispatch(loop, _set_future_result, future, result)
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"Batched VAD inference failed: {e}")
+            for _, _, _, loop, future in batch:
+                _dispatch(loop, _set_future_exception, future, e)
+
+
+def _dispatch(loop, callback, future, value):
+    try:
+        loop.call_soon_threadsafe(callback, future, value)
+    except RuntimeError:
+        # The caller's event loop is already closed, nobody is waiting for the result
+        pass
+
+
+def _set_future_result(future, result):
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_future_exception(future, exc):
+    if not future.done():
+        future.set_exception(exc)
@@ -0,0 +1,43 @@
+import os
+import numpy as np
+import onnxruntime
+from config.logger import setup_logging
+from core.providers.vad.base import SileroVADProviderBase
+from core.providers.vad.batch_engine import CONTEXT_SAMPLES
+
+TAG = __name__
+logger = setup_logging()
+
+DEFAULT_MODEL_FILE = os.path.join("src", "silero_vad", "data", "silero_vad.onnx")
+
+
+class VADProvider(SileroVADProviderBase):
+    """Silero VAD running on onnxruntime, no torch import needed"""
+
+    def __init__(self, config):
+        logger.bind(tag=TAG).info("SileroVAD(onnx)", config)
+        model_path = config.get("model_path") or os.path.join(
+            config.get("model_dir", "models/snakers4_silero-vad"), DEFAULT_MODEL_FILE
+        )
+
+        # The network is tiny, more threads only add synchronization overhead
+        intra_op_num_threads = config.get("intra_op_num_threads", 1)
+        opts = onnxruntime.SessionOptions()
+        opts.intra_op_num_threads = int(intra_op_num_threads) if intra_op_num_threads else 1
+        opts.inter_op_num_threads = 1
+        opts.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+        opts.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.ort_session = onnxruntime.InferenceSession(
+            model_path, sess_options=opts, providers=["CPUExecutionProvider"]
+        )
+        self._sample_rate = np.array(16000, dtype=np.int64)
+
+        super().__init__(config)
+
+    def _infer_batch(self, x, state, context):
+        # The model expects the previous 64 samples in front of each chunk
+        x = np.concatenate((context, x), axis=1)
+        out, new_state = self.ort_session.run(
+            None, {"input": x, "state": state, "sr": self._sample_rate}
+        )
+        return out.reshape(-1), new_state, x[:, -CONTEXT_SAMPLES:]
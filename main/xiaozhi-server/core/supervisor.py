@@ -0,0 +1,263 @@
+import os
+import sys
+import time
+import signal
+import socket
+import asyncio
+import threading
+import multiprocessing
+from multiprocessing.connection import wait
+from typing import Callable, Dict, Optional, Union
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+# Seconds before a crashed worker is started again, doubled up to the maximum on repeated crashes
+RESPAWN_DELAY = 1.0
+RESPAWN_DELAY_MAX = 30.0
+# Workers alive at least this long reset the respawn backoff
+STABLE_SECONDS = 60.0
+
+
+def reuse_port_supported() -> bool:
+    return hasattr(socket, "SO_REUSEPORT") and sys.platform != "win32"
+
+
+class WorkerChannel:
+    """Worker-side end of the supervisor pipe
+
+    Device-targeted operations handled by one worker are broadcast through the
+    supervisor so every worker applies them, e.g. update_config.
+    """
+
+    def __init__(self, worker_id: int, conn):
+        self.worker_id = worker_id
+        self._conn = conn
+        self._send_lock = threading.Lock()
+        self._handlers: Dict[str, Callable[[dict], None]] = {}
+
+    def on(self, action: str, handler: Callable[[dict], None]):
+        """Register a handler for an action broadcast by another worker"""
+        self._handlers[action] = handler
+
+    def start(self):
+        threading.Thread(
+            target=self._receive_loop, name="worker-channel", daemon=True
+        ).start()
+
+    def broadcast(self, action: str, **payload):
+        """Ask the supervisor to deliver an action to all other workers"""
+        self._send({"type": "broadcast", "action": action, **payload})
+
+    def request_restart(self):
+        """Ask the supervisor to restart every worker"""
+        self._send({"type": "restart"})
+
+    def _send(self, message: dict):
+        message["origin"] = self.worker_id
+        with self._send_lock:
+            self._conn.send(message)
+
+    def _receive_loop(self):
+        while True:
+            try:
+                message = self._conn.recv()
+            except (EOFError, OSError):
+                # Supervisor went away, nothing left to coordinate with
+                return
+            handler = self._handlers.get(message.get("action"))
+            if handler is None:
+                continue
+            try:
+                handler(message)
+            except Exception as e:
+                logger.bind(tag=TAG).error(
+                    f"Failed to handle broadcast {message.get('action')}: {e}"
+                )
+
+
+_worker_channel: Optional[WorkerChannel] = None
+
+
+def set_worker_channel(channel: Optional[WorkerChannel]):
+    global _worker_channel
+    _worker_channel = channel
+
+
+def get_worker_channel() -> Optional[WorkerChannel]:
+    """Channel to the supervisor, None when running as a single process"""
+    return _worker_channel
+
+
+def dispatch_to_loop(loop: asyncio.AbstractEventLoop, coro_factory):
+    """Build a channel handler that runs a coroutine on the worker's event loop"""
+
+    def handler(message):
+        asyncio.run_coroutine_threadsafe(coro_factory(message), loop)
+
+    return handler
+
+
+class WorkerSupervisor:
+    """Runs N worker processes sharing the WebSocket and HTTP ports via SO_REUSEPORT
+
+    Each worker is a full server with its own event loop and its own VAD/ASR
+    models, so the hot path is no longer limited to one GIL. The kernel
+    balances new connections across the listening workers.
+
+    Service processes added with add_service (e.g. the local ASR service) are
+    started before the workers, respawned the same way and stopped after them.
+    """
+
+    def __init__(self, worker_count: int, target: Callable, args: tuple = ()):
+        self.worker_count = worker_count
+        self.target = target
+        self.args = args
+        # spawn: the logger owns a queue thread, forking it is unsafe
+        self._context = multiprocessing.get_context("spawn")
+        # Keyed by worker id, or by name for service processes
+        self._services: Dict[str, tuple] = {}
+        self._workers: Dict[Union[int, str], multiprocessing.Process] = {}
+        self._pipes = {}
+        self._started_at: Dict[Union[int, str], float] = {}
+        self._respawn_delay: Dict[Union[int, str], float] = {}
+        self._respawn_at: Dict[Union[int, str], float] = {}
+        self._stopping = False
+        self._restart_requested = False
+
+    def add_service(self, name: str, target: Callable, args: tuple = ()):
+        """Run target(*args) in a supervised process next to the workers"""
+        self._services[name] = (target, args)
+
+    def run(self):
+        signal.signal(signal.SIGINT, self._handle_signal)
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        for name in self._services:
+            self._spawn(name)
+        logger.bind(tag=TAG).info(
+            f"Starting {self.worker_count} worker processes, pid {os.getpid()}"
+        )
+        for worker_id in range(self.worker_count):
+            self._spawn(worker_id)
+
+        while not self._stopping:
+            self._respawn_due()
+            waitables = list(self._pipes.values()) + [
+                p.sentinel for p in self._workers.values()
+            ]
+            for ready in wait(waitables, timeout=1.0):
+                self._handle_ready(ready)
+
+        self._stop_workers()
+        if self._restart_requested:
+            logger.bind(tag=TAG).info("Restarting server process...")
+            os.execv(sys.executable, [sys.executable] + sys.argv)
+
+    def _label(self, key: Union[int, str]) -> str:
+        return f"Service {key}" if key in self._services else f"Worker {key}"
+
+    def _spawn(self, worker_id: Union[int, str]):
+        if worker_id in self._services:
+            target, args = self._services[worker_id]
+            process = self._context.Process(
+                target=target, args=args, name=f"xiaozhi-{worker_id}"
+            )
+            process.start()
+            self._workers[worker_id] = process
+            self._started_at[worker_id] = time.monotonic()
+            logger.bind(tag=TAG).info(
+                f"Service {worker_id} started, pid {process.pid}"
+            )
+            return
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=self.target,
+            args=self.args + (worker_id, child_conn),
+            name=f"xiaozhi-worker-{worker_id}",
+        )
+        process.start()
+        child_conn.close()
+        self._workers[worker_id] = process
+        self._pipes[worker_id] = parent_conn
+        self._started_at[worker_id] = time.monotonic()
+        logger.bind(tag=TAG).info(f"Worker {worker_id} started, pid {process.pid}")
+
+    def _handle_ready(self, ready):
+        for worker_id, conn in list(self._pipes.items()):
+            if ready is conn:
+                try:
+                    self._handle_message(worker_id, conn.recv())
+                except (EOFError, OSError):
+                    # The worker exited, its sentinel reports the exit
+                    self._pipes.pop(worker_id, None)
+                return
+        for worker_id, process in list(self._workers.items()):
+            if ready == process.sentinel:
+                self._handle_exit(worker_id, process)
+                return
+
+    def _handle_message(self, worker_id: int, message: dict):
+        if message.get("type") == "broadcast":
+            logger.bind(tag=TAG).info(
+                f"Broadcasting {message.get('action')} from worker {worker_id}"
+            )
+            for other_id, conn in list(self._pipes.items()):
+                if other_id == worker_id:
+                    continue
+                try:
+                    conn.send(message)
+                except (BrokenPipeError, OSError):
+                    self._pipes.pop(other_id, None)
+        elif message.get("type") == "restart":
+            logger.bind(tag=TAG).info(f"Worker {worker_id} requested a restart")
+            self._restart_requested = True
+            self._stopping = True
+
+    def _handle_exit(self, worker_id: Union[int, str], process):
+        process.join()
+        self._workers.pop(worker_id, None)
+        conn = self._pipes.pop(worker_id, None)
+        if conn is not None:
+            conn.close()
+        if self._stopping:
+            return
+        uptime = time.monotonic() - self._started_at.get(worker_id, 0)
+        delay = self._respawn_delay.get(worker_id, RESPAWN_DELAY)
+        if uptime >= STABLE_SECONDS:
+            delay = RESPAWN_DELAY
+        logger.bind(tag=TAG).error(
+            f"{self._label(worker_id)} exited with code {process.exitcode}, restarting in {delay:.0f}s"
+        )
+        self._respawn_at[worker_id] = time.monotonic() + delay
+        self._respawn_delay[worker_id] = min(delay * 2, RESPAWN_DELAY_MAX)
+
+    def _respawn_due(self):
+        now = time.monotonic()
+        for worker_id, respawn_at in list(self._respawn_at.items()):
+            if now >= respawn_at:
+                del self._respawn_at[worker_id]
+                self._spawn(worker_id)
+
+    def _handle_signal(self, signum, frame):
+        self._stopping = True
+
+    def _stop_workers(self, timeout: float = 10.0):
+        # Workers first, services keep serving them until they are gone
+        workers = [p for k, p in self._workers.items() if k not in self._services]
+        services = [p for k, p in self._workers.items() if k in self._services]
+        for group in (workers, services):
+            for process in group:
+                if process.is_alive():
+                    process.terminate()
+            deadline = time.monotonic() + timeout
+            for process in group:
+                process.join(max(0.0, deadline - time.monotonic()))
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+        for conn in self._pipes.values():
+            conn.close()
+        self._workers.clear()
+        self._pipes.clear()
+        logger.bind(tag=TAG).info("All worker processes stopped")
@@ -0,0 +1,135 @@
+"""
+ASR批量识别调度模块
+把短时间内先后到达的多段语音合并为一次批量推理，结果按提交顺序分别返回给各调用方
+每批在窗口期结束、达到最大条数或达到最大音频时长时提交
+本地模型单次推理有固定开销，批量执行可显著提高每核（每GB内存）的吞吐
+"""
+
+import time
+import queue
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+
+class ASRBatcher:
+    """收集窗口期内到达的语音，在专用线程中调用 recognize_batch 批量识别"""
+
+    def __init__(
+        self,
+        recognize_batch: Callable[[List[bytes]], List[str]],
+        batch_window_ms: float = 10,
+        max_batch_size: int = 8,
+        max_batch_audio_seconds: float = 0,
+        name: str = "asr-batcher",
+    ):
+        self.recognize_batch = recognize_batch
+        self.batch_window = max(float(batch_window_ms), 0) / 1000
+        self.max_batch_size = max(int(max_batch_size), 1)
+        # 单批音频总时长上限，按16kHz 16bit换算为字节数，0表示不限制
+        self.max_batch_bytes = int(
+            max(float(max_batch_audio_seconds), 0) * 16000 * 2
+        )
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        # 超出时长上限的请求留给下一批
+        self._carry: Optional[tuple] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "batches": 0,
+            "max_batch": 0,
+            "failed": 0,
+            "infer_time": 0.0,
+        }
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, pcm: bytes) -> Future:
+        """提交一段16kHz单声道PCM，返回识别文本的Future"""
+        future = Future()
+        self._queue.put((pcm, future))
+        return future
+
+    async def recognize(self, pcm: bytes) -> str:
+        return await asyncio.wrap_future(self.submit(pcm))
+
+    def _collect(self) -> Optional[list]:
+        if self._carry is not None:
+            item, self._carry = self._carry, None
+        else:
+            item = self._queue.get()
+        if item is None:
+            return None
+        batch = [item]
+        batch_bytes = len(item[0])
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    item = self._queue.get(timeout=timeout)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            size = len(item[0])
+            if self.max_batch_bytes and batch_bytes + size > self.max_batch_bytes:
+                self._carry = item
+                break
+            batch.append(item)
+            batch_bytes += size
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            # 调用方已取消的请求不再识别
+            batch = [
+                (pcm, future)
+                for pcm, future in batch
+                if future.set_running_or_notify_cancel()
+            ]
+            if not batch:
+                continue
+            start_time = time.perf_counter()
+            try:
+                texts = self.recognize_batch([pcm for pcm, _ in batch])
+                if len(texts) != len(batch):
+                    raise RuntimeError(
+                        f"批量识别结果数量不匹配: {len(texts)} != {len(batch)}"
+                    )
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"批量识别失败: {e}")
+                with self._lock:
+                    self._stats["failed"] += len(batch)
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            with self._lock:
+                self._stats["requests"] += len(batch)
+                self._stats["batches"] += 1
+                self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+                self._stats["infer_time"] += time.perf_counter() - start_time
+            for (_, future), text in zip(batch, texts):
+                future.set_result(text)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["avg_batch"] = (
+            stats["requests"] / stats["batches"] if stats["batches"] else 0.0
+        )
+        return stats
+
+    def close(self):
+        self._queue.put(None)
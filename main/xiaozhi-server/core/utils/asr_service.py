@@ -0,0 +1,319 @@
+"""
+本地ASR服务模块
+多进程部署时由一个独立进程加载本地ASR模型（FunASR / SherpaASR / VoskASR），
+各WebSocket工作进程通过Unix Socket提交语音，避免每个进程各自加载一份模型；
+服务端把先后到达的请求合并为一次批量推理，提高单位内存的识别吞吐
+
+帧格式（小端）：
+    请求: magic(4s) request_id(Q) length(I) + 16kHz单声道s16le PCM
+    响应: magic(4s) request_id(Q) status(B) length(I) + utf-8文本（失败时为错误信息）
+"""
+
+import os
+import sys
+import struct
+import time
+import socket
+import signal
+import asyncio
+import itertools
+import threading
+from concurrent.futures import Future, InvalidStateError
+from typing import Dict, Optional
+from config.logger import setup_logging
+from core.utils.asr_batcher import ASRBatcher
+
+TAG = __name__
+logger = setup_logging()
+
+MAGIC = b"XZAS"
+REQUEST_HEADER = struct.Struct("<4sQI")
+RESPONSE_HEADER = struct.Struct("<4sQBI")
+STATUS_OK = 0
+STATUS_ERROR = 1
+# 单次请求的PCM上限（16kHz 16bit 约5分钟）
+MAX_PAYLOAD = 16000 * 2 * 300
+
+# 支持由服务进程托管的本地ASR类型，需实现 recognize_batch
+SERVICE_ASR_TYPES = ("fun_local", "sherpa_onnx_local", "vosk")
+
+
+def is_service_enabled(config: dict) -> bool:
+    service_config = config.get("asr_service") or {}
+    return str(service_config.get("enabled", False)).lower() in ("true", "1", "yes")
+
+
+def get_selected_asr(config: dict):
+    """返回当前选择的ASR模块名及类型"""
+    select_asr_module = config["selected_module"]["ASR"]
+    asr_type = config["ASR"][select_asr_module].get("type", select_asr_module)
+    return select_asr_module, asr_type
+
+
+def should_use_service(config: dict) -> bool:
+    """开启服务模式且所选ASR可由服务进程托管"""
+    if not is_service_enabled(config):
+        return False
+    _, asr_type = get_selected_asr(config)
+    return asr_type in SERVICE_ASR_TYPES
+
+
+def _read_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            raise ConnectionError("ASR服务连接已关闭")
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+
+class ASRServiceServer:
+    """在Unix Socket上提供识别服务，所有连接的请求共用一个批量调度器"""
+
+    def __init__(
+        self,
+        provider,
+        socket_path: str,
+        batch_window_ms=10,
+        max_batch_size=8,
+        max_batch_audio_seconds=60,
+    ):
+        self.provider = provider
+        self.socket_path = socket_path
+        self.batcher = ASRBatcher(
+            provider.recognize_batch,
+            batch_window_ms=batch_window_ms,
+            max_batch_size=max_batch_size,
+            max_batch_audio_seconds=max_batch_audio_seconds,
+        )
+        self._server = None
+        self._writers = set()
+
+    async def start(self):
+        socket_dir = os.path.dirname(self.socket_path)
+        if socket_dir:
+            os.makedirs(socket_dir, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        self._server = await asyncio.start_unix_server(
+            self._handle_client, path=self.socket_path
+        )
+        logger.bind(tag=TAG).info(f"本地ASR服务已启动: {self.socket_path}")
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            # 关闭已建立的连接，工作进程的未完成请求随之失败
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        self.batcher.close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        stats = self.batcher.get_stats()
+        logger.bind(tag=TAG).info(
+            f"本地ASR服务已停止，共识别{stats['requests']}条，"
+            f"{stats['batches']}批，平均批大小{stats['avg_batch']:.2f}"
+        )
+
+    async def _handle_client(self, reader, writer):
+        self._writers.add(writer)
+        try:
+            while True:
+                header = await reader.readexactly(REQUEST_HEADER.size)
+                magic, request_id, length = REQUEST_HEADER.unpack(header)
+                if magic != MAGIC or length > MAX_PAYLOAD:
+                    logger.bind(tag=TAG).error("ASR服务收到非法请求，关闭连接")
+                    break
+                pcm = await reader.readexactly(length)
+                # 同一连接上的请求并发处理，响应按完成顺序返回
+                asyncio.ensure_future(
+                    self._reply(writer, request_id, self.batcher.submit(pcm))
+                )
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            # 服务停止时对端仍保持连接，读取被取消
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _reply(self, writer, request_id: int, future: Future):
+        try:
+            text = await asyncio.wrap_future(future)
+            status, payload = STATUS_OK, (text or "").encode("utf-8")
+        except Exception as e:
+            status, payload = STATUS_ERROR, str(e).encode("utf-8")
+        if writer.is_closing():
+            return
+        writer.write(
+            RESPONSE_HEADER.pack(MAGIC, request_id, status, len(payload)) + payload
+        )
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+class ASRServiceClient:
+    """工作进程侧的服务客户端，线程安全，多个连接复用同一条Unix Socket连接"""
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count(1)
+
+    # 服务未就绪时的重连间隔（秒）
+    CONNECT_RETRY_INTERVAL = 0.2
+
+    def submit(self, pcm: bytes, connect_timeout: float = 0) -> Future:
+        """提交一段16kHz单声道PCM，返回识别文本的Future
+
+        服务进程启动时需先加载模型，Socket尚未就绪时在 connect_timeout 秒内重试建连，
+        调用方线程会阻塞到连接建立
+        """
+        future = Future()
+        with self._lock:
+            try:
+                sock = self._connect(time.monotonic() + connect_timeout)
+                request_id = next(self._ids)
+                self._pending[request_id] = future
+                sock.sendall(REQUEST_HEADER.pack(MAGIC, request_id, len(pcm)) + pcm)
+            except OSError as e:
+                self._disconnect(e)
+                if not future.done():
+                    future.set_exception(ConnectionError(f"ASR服务不可用: {e}"))
+        return future
+
+    def _connect(self, deadline: float) -> socket.socket:
+        while self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.socket_path)
+            except (FileNotFoundError, ConnectionRefusedError):
+                sock.close()
+                if time.monotonic() + self.CONNECT_RETRY_INTERVAL > deadline:
+                    raise
+                time.sleep(self.CONNECT_RETRY_INTERVAL)
+                continue
+            self._sock = sock
+            threading.Thread(
+                target=self._receive_loop,
+                args=(sock,),
+                name="asr-service-client",
+                daemon=True,
+            ).start()
+        return self._sock
+
+    def _disconnect(self, error: Exception, sock: Optional[socket.socket] = None):
+        """关闭连接并让所有未完成的请求失败，下次提交时自动重连，需持有锁"""
+        if sock is not None and sock is not self._sock:
+            return
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            try:
+                future.set_exception(ConnectionError(f"ASR服务连接中断: {error}"))
+            except InvalidStateError:
+                pass
+
+    def _receive_loop(self, sock: socket.socket):
+        try:
+            while True:
+                header = _read_exactly(sock, RESPONSE_HEADER.size)
+                magic, request_id, status, length = RESPONSE_HEADER.unpack(header)
+                if magic != MAGIC:
+                    raise ConnectionError("ASR服务响应格式错误")
+                payload = _read_exactly(sock, length).decode("utf-8", errors="replace")
+                with self._lock:
+                    future = self._pending.pop(request_id, None)
+                if future is None:
+                    continue
+                try:
+                    if status == STATUS_OK:
+                        future.set_result(payload)
+                    else:
+                        future.set_exception(RuntimeError(payload))
+                except InvalidStateError:
+                    # 调用方已超时取消
+                    pass
+        except (OSError, ConnectionError) as e:
+            with self._lock:
+                self._disconnect(e, sock)
+
+
+# 全局单例
+_client_instances: Dict[str, ASRServiceClient] = {}
+_client_lock = threading.Lock()
+
+
+def get_asr_service_client(socket_path: str) -> ASRServiceClient:
+    """获取进程内共享的服务客户端"""
+    with _client_lock:
+        if socket_path not in _client_instances:
+            _client_instances[socket_path] = ASRServiceClient(socket_path)
+        return _client_instances[socket_path]
+
+
+async def serve(config: dict):
+    """加载所选本地ASR模型并提供服务，直到收到退出信号"""
+    from core.utils import asr
+
+    service_config = config.get("asr_service") or {}
+    select_asr_module, asr_type = get_selected_asr(config)
+    loop = asyncio.get_running_loop()
+    # 服务端自带微批调度，关闭供应器自身的批处理，避免多启动一个闲置的批处理线程
+    asr_config = dict(config["ASR"][select_asr_module], batch_window_ms=0)
+    # 模型加载耗时较长，放到线程中执行
+    provider = await loop.run_in_executor(
+        None,
+        lambda: asr.create_instance(
+            asr_type,
+            asr_config,
+            str(config.get("delete_audio", True)).lower() in ("true", "1", "yes"),
+        ),
+    )
+    server = ASRServiceServer(
+        provider,
+        service_config.get("socket_path", "tmp/asr_service.sock"),
+        batch_window_ms=service_config.get("batch_window_ms", 10),
+        max_batch_size=service_config.get("max_batch_size", 8),
+        max_batch_audio_seconds=service_config.get("max_batch_audio_seconds", 60),
+    )
+    await server.start()
+
+    stop_event = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+    try:
+        await stop_event.wait()
+    finally:
+        await server.stop()
+
+
+def run_asr_service(config: dict):
+    """ASR服务进程入口，由主进程启动"""
+    try:
+        asyncio.run(serve(config))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    # 单独运行: python -m core.utils.asr_service
+    from config.settings import load_config
+
+    if sys.platform == "win32":
+        logger.bind(tag=TAG).error("本地ASR服务依赖Unix Socket，不支持Windows")
+        sys.exit(1)
+    run_asr_service(load_config())
@@ -0,0 +1,147 @@
+"""
+流式ASR上游WebSocket会话池
+按供应器和凭证维护预先建立好（已完成TLS和鉴权）的上游连接，
+检测到说话时直接取用后再发送本连接的识别参数，建连耗时不再落在每句话的关键路径上；
+上游会话按句使用，取走后在后台补充新会话替换。
+只有存在使用该池的连接时才保持预热，没有设备连接时不占用上游连接
+"""
+
+import json
+import time
+import asyncio
+import hashlib
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+# 建连失败后的重试间隔上限（秒）
+MAX_RETRY_DELAY = 30
+
+
+def is_ws_open(ws) -> bool:
+    """判断WebSocket连接是否仍可用"""
+    state = getattr(ws, "state", None)
+    if state is not None:
+        return state.name == "OPEN"
+    return not getattr(ws, "closed", True)
+
+
+class UpstreamSessionPool:
+    """单个供应器+凭证的预热会话池"""
+
+    def __init__(self, name: str, size: int = 1, max_idle: float = 10):
+        self.name = name
+        self.size = size
+        # 空闲会话的最长保留时间，需小于上游的空闲断开时间
+        self.max_idle = max_idle
+        self._idle: List[Tuple[float, object]] = []
+        # 使用者 -> 建立会话的协程函数，刷新时任取一个
+        self._users: Dict[int, Callable[[], Awaitable[object]]] = {}
+        self._refill_task: Optional[asyncio.Task] = None
+        self._expire_task: Optional[asyncio.Task] = None
+        self._failures = 0
+        self._retry_at = 0.0
+        self._stats = {"hits": 0, "misses": 0, "opened": 0, "failed": 0}
+
+    def add_user(self, owner, connect: Callable[[], Awaitable[object]]):
+        """登记使用者，connect 用于建立一个只完成鉴权、不含识别参数的新连接"""
+        self._users[id(owner)] = connect
+        if self._expire_task is None or self._expire_task.done():
+            self._expire_task = asyncio.create_task(self._expire_loop())
+        self._schedule_refill()
+
+    def remove_user(self, owner):
+        """注销使用者，最后一个使用者离开时关闭全部空闲会话"""
+        self._users.pop(id(owner), None)
+        if not self._users:
+            idle, self._idle = self._idle, []
+            for _, ws in idle:
+                self._close_later(ws)
+
+    async def acquire(self):
+        """取出一个预热会话，没有可用会话时返回 None，由调用方自行建连"""
+        while self._idle:
+            created_at, ws = self._idle.pop(0)
+            if is_ws_open(ws) and time.monotonic() - created_at < self.max_idle:
+                self._stats["hits"] += 1
+                self._schedule_refill()
+                return ws
+            self._close_later(ws)
+        self._stats["misses"] += 1
+        self._schedule_refill()
+        return None
+
+    def get_stats(self) -> dict:
+        return dict(self._stats, idle=len(self._idle), users=len(self._users))
+
+    def _schedule_refill(self):
+        if not self._users or time.monotonic() < self._retry_at:
+            return
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._refill())
+
+    async def _refill(self):
+        while self._users and len(self._idle) < self.size:
+            connect = next(iter(self._users.values()))
+            try:
+                ws = await connect()
+            except Exception as e:
+                self._failures += 1
+                self._stats["failed"] += 1
+                delay = min(MAX_RETRY_DELAY, 2 ** self._failures)
+                self._retry_at = time.monotonic() + delay
+                logger.bind(tag=TAG).warning(
+                    f"预热上游ASR会话失败 {self.name}: {e}，{delay}秒后重试"
+                )
+                return
+            self._failures = 0
+            self._stats["opened"] += 1
+            if self._users and len(self._idle) < self.size:
+                self._idle.append((time.monotonic(), ws))
+            else:
+                self._close_later(ws)
+
+    async def _expire_loop(self):
+        """定期关闭超时或已断开的空闲会话并补充新会话"""
+        while self._users:
+            await asyncio.sleep(max(self.max_idle / 2, 0.5))
+            now = time.monotonic()
+            alive = []
+            for created_at, ws in self._idle:
+                if is_ws_open(ws) and now - created_at < self.max_idle:
+                    alive.append((created_at, ws))
+                else:
+                    self._close_later(ws)
+            self._idle = alive
+            self._schedule_refill()
+
+    def _close_later(self, ws):
+        async def close():
+            try:
+                await asyncio.wait_for(ws.close(), timeout=2.0)
+            except Exception:
+                pass
+
+        asyncio.create_task(close())
+
+
+# 全局会话池，按供应器和凭证区分
+_session_pools: Dict[str, UpstreamSessionPool] = {}
+
+
+def get_session_pool(
+    provider: str, credentials: dict, size: int, max_idle: float
+) -> UpstreamSessionPool:
+    """获取供应器+凭证对应的会话池，池大小和空闲时间以首次创建时为准"""
+    digest = hashlib.sha1(
+        json.dumps(credentials, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()[:16]
+    key = f"{provider}:{digest}"
+    pool = _session_pools.get(key)
+    if pool is None:
+        pool = UpstreamSessionPool(key, size, max_idle)
+        _session_pools[key] = pool
+    return pool
+
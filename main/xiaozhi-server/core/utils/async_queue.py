@@ -0,0 +1,60 @@
+"""
+可在事件循环中等待的线程安全队列
+保留queue.Queue的全部接口供线程生产者/消费者使用，同时提供get_async，
+让连接的消费者以asyncio任务的形式挂起等待，无需专用线程轮询
+"""
+
+import asyncio
+import queue
+from collections import deque
+
+
+class AwaitableQueue(queue.Queue):
+    """queue.Queue的子类，额外支持在事件循环中await取数据"""
+
+    def __init__(self, maxsize: int = 0):
+        super().__init__(maxsize)
+        self._async_waiters = deque()
+
+    def _put(self, item):
+        # 在queue.Queue的互斥锁内调用，任何线程put后都会唤醒一个等待中的协程
+        super()._put(item)
+        self._wakeup_next()
+
+    def _wakeup_next(self):
+        while self._async_waiters:
+            loop, waiter = self._async_waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(_set_waiter_result, waiter)
+                return
+            except RuntimeError:
+                # 等待方的事件循环已关闭，尝试下一个
+                continue
+
+    async def get_async(self):
+        """挂起等待直到队列中有数据，不占用线程"""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self.mutex:
+                if self._qsize():
+                    item = self._get()
+                    self.not_full.notify()
+                    return item
+                waiter = loop.create_future()
+                entry = (loop, waiter)
+                self._async_waiters.append(entry)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self.mutex:
+                    if entry in self._async_waiters:
+                        self._async_waiters.remove(entry)
+                    elif self._qsize():
+                        # 已被唤醒但被取消，把唤醒机会转交给下一个等待者
+                        self._wakeup_next()
+                raise
+
+
+def _set_waiter_result(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,76 @@
+"""
+提示音资源缓存模块
+config/assets 下的固定提示音只编码一次，Opus/PCM帧常驻内存，
+以 路径 + 修改时间 + 格式 为键，文件被替换后自动重新编码
+"""
+
+import os
+import asyncio
+from typing import List
+from config.logger import setup_logging
+from core.utils.util import audio_to_data
+from core.utils.cache.manager import cache_manager, CacheType
+
+TAG = __name__
+logger = setup_logging()
+
+ASSET_DIR = os.path.join("config", "assets")
+ASSET_EXTENSIONS = (".wav", ".mp3", ".ogg", ".flac", ".m4a")
+
+
+def _asset_key(audio_file_path: str, is_opus: bool) -> str:
+    mtime_ns = os.stat(audio_file_path).st_mtime_ns
+    audio_format = "opus" if is_opus else "pcm"
+    return f"{os.path.abspath(audio_file_path)}|{mtime_ns}|{audio_format}"
+
+
+def get_audio_asset(audio_file_path: str, is_opus: bool = True) -> List[bytes]:
+    """
+    获取音频文件的Opus/PCM帧列表，命中缓存时无需调用ffmpeg
+
+    Args:
+        audio_file_path: 音频文件路径
+        is_opus: 是否为Opus编码
+    """
+    key = _asset_key(audio_file_path, is_opus)
+    packets = cache_manager.get(CacheType.AUDIO_ASSET, key)
+    if packets is None:
+        packets = tuple(audio_to_data(audio_file_path, is_opus=is_opus))
+        cache_manager.set(CacheType.AUDIO_ASSET, key, packets)
+    # 返回副本，避免调用方修改缓存内容
+    return list(packets)
+
+
+async def load_audio_asset(audio_file_path: str, is_opus: bool = True) -> List[bytes]:
+    """
+    get_audio_asset 的异步版本，未命中缓存时在线程池中编码，不阻塞事件循环
+
+    Args:
+        audio_file_path: 音频文件路径
+        is_opus: 是否为Opus编码
+    """
+    packets = cache_manager.get(
+        CacheType.AUDIO_ASSET, _asset_key(audio_file_path, is_opus)
+    )
+    if packets is not None:
+        return list(packets)
+    return await asyncio.get_running_loop().run_in_executor(
+        None, get_audio_asset, audio_file_path, is_opus
+    )
+
+
+def preload_audio_assets(asset_dir: str = ASSET_DIR) -> int:
+    """启动时预编码目录下全部提示音为Opus帧，返回成功加载的文件数"""
+    loaded = 0
+    for root, _, files in os.walk(asset_dir):
+        for file_name in files:
+            if not file_name.lower().endswith(ASSET_EXTENSIONS):
+                continue
+            file_path = os.path.join(root, file_name)
+            try:
+                get_audio_asset(file_path, is_opus=True)
+                loaded += 1
+            except Exception as e:
+                logger.bind(tag=TAG).warning(f"预加载提示音失败 {file_path}: {e}")
+    logger.bind(tag=TAG).info(f"提示音预编码完成，共 {loaded} 个文件")
+    return loaded
@@ -0,0 +1,351 @@
+"""
+进程内音频解码模块
+WAV/裸PCM直接用numpy解析，采样率转换使用向量化多相重采样，
+输出16kHz单声道16位PCM；压缩格式返回None，由调用方回退到ffmpeg
+"""
+
+import struct
+from math import gcd
+from typing import Optional, Tuple
+import numpy as np
+
+TARGET_SAMPLE_RATE = 16000
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# 每个相位的滤波器半长（以低采样率侧的采样点计），越大过渡带越陡
+FILTER_HALF_TAPS = 12
+KAISER_BETA = 8.0
+
+# 滤波器按(up, down)缓存，TTS输出采样率种类很少
+_filter_cache = {}
+
+
+def _design_filter(up: int, down: int) -> Tuple[np.ndarray, int, int]:
+    """设计Kaiser窗sinc低通滤波器并拆分为多相形式
+
+    Returns:
+        (polyphase[up, taps]，每个相位已反转，可直接与输入窗口点乘), 每相位抽头数, 滤波器中心偏移
+    """
+    key = (up, down)
+    cached = _filter_cache.get(key)
+    if cached is not None:
+        return cached
+
+    max_rate = max(up, down)
+    half_len = FILTER_HALF_TAPS * max_rate
+    n = np.arange(-half_len, half_len + 1)
+    h = np.sinc(n / max_rate) / max_rate * np.kaiser(2 * half_len + 1, KAISER_BETA)
+    # 补偿插零带来的幅度损失
+    h *= up
+
+    taps = -(-len(h) // up)
+    h_padded = np.zeros(taps * up)
+    h_padded[: len(h)] = h
+    polyphase = h_padded.reshape(taps, up).T[:, ::-1].astype(np.float32)
+
+    result = (np.ascontiguousarray(polyphase), taps, half_len)
+    _filter_cache[key] = result
+    return result
+
+
+def resample_poly(samples: np.ndarray, up: int, down: int) -> np.ndarray:
+    """多相重采样，采样率变为原来的 up/down 倍
+
+    Args:
+        samples: 一维float32数组
+    """
+    divisor = gcd(up, down)
+    up //= divisor
+    down //= divisor
+    if up == down:
+        return samples
+
+    polyphase, taps, half_len = _design_filter(up, down)
+    out_len = -(-len(samples) * up // down)
+    padded = np.concatenate(
+        (
+            np.zeros(taps - 1, dtype=np.float32),
+            samples.astype(np.float32, copy=False),
+            np.zeros(taps + 1, dtype=np.float32),
+        )
+    )
+    windows = np.lib.stride_tricks.sliding_window_view(padded, taps)
+    out = np.empty(out_len, dtype=np.float32)
+
+    # 同一余数的输出点共用一组相位系数，输入窗口按 down 步进
+    for r in range(min(up, out_len)):
+        m0 = r * down + half_len
+        phase = m0 % up
+        start = m0 // up
+        count = len(range(r, out_len, up))
+        out[r::up] = windows[start : start + count * down : down] @ polyphase[phase]
+    return out
+
+
+def _find_wav_data(audio_bytes: bytes) -> Optional[Tuple[bytes, int, int]]:
+    """查找WAV的fmt块和data块
+
+    Returns:
+        (fmt块内容, data起始偏移, data声明长度)，不是WAV或头部不完整时返回None
+    """
+    if len(audio_bytes) < 12 or audio_bytes[:4] != b"RIFF" or audio_bytes[8:12] != b"WAVE":
+        return None
+
+    pos = 12
+    fmt = None
+    while pos + 8 <= len(audio_bytes):
+        chunk_id = audio_bytes[pos : pos + 4]
+        chunk_size = struct.unpack_from("<I", audio_bytes, pos + 4)[0]
+        body = pos + 8
+        if chunk_id == b"fmt ":
+            if body + chunk_size > len(audio_bytes):
+                return None
+            fmt = audio_bytes[body : body + chunk_size]
+        elif chunk_id == b"data":
+            if fmt is None:
+                return None
+            return fmt, body, chunk_size
+        pos = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+def _parse_fmt(fmt: bytes) -> Optional[Tuple[int, int, int, int]]:
+    """解析fmt块，返回(格式码, 声道数, 采样率, 位深)，不支持的编码返回None"""
+    if len(fmt) < 16:
+        return None
+    format_tag, channels, sample_rate, _, _, bits = struct.unpack_from("<HHIIHH", fmt)
+    if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        format_tag = struct.unpack_from("<H", fmt, 24)[0]
+    if channels == 0 or sample_rate == 0:
+        return None
+    if format_tag == WAVE_FORMAT_PCM and bits in (8, 16, 24, 32):
+        return format_tag, channels, sample_rate, bits
+    if format_tag == WAVE_FORMAT_IEEE_FLOAT and bits in (32, 64):
+        return format_tag, channels, sample_rate, bits
+    # A-law/μ-law/ADPCM等交给ffmpeg
+    return None
+
+
+def _bytes_to_samples(data: bytes, format_tag: int, bits: int) -> np.ndarray:
+    """按WAV编码把字节转换为样本数组，data长度须为样本字节数的整数倍"""
+    if format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        return np.frombuffer(data, dtype="<f4" if bits == 32 else "<f8")
+    if bits == 16:
+        return np.frombuffer(data, dtype="<i2")
+    if bits == 8:
+        return np.frombuffer(data, dtype=np.uint8)
+    if bits == 24:
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+        return (
+            raw[:, 0].astype(np.int32)
+            | (raw[:, 1].astype(np.int32) << 8)
+            | (raw[:, 2].astype(np.int8).astype(np.int32) << 16)
+        )
+    return np.frombuffer(data, dtype="<i4")
+
+
+def _parse_wav(audio_bytes: bytes) -> Optional[Tuple[np.ndarray, int, int, int]]:
+    """解析完整的WAV数据
+
+    Returns:
+        (原始样本数组, 采样率, 声道数, 位深)，不支持的编码返回None
+    """
+    found = _find_wav_data(audio_bytes)
+    if found is None:
+        return None
+    fmt, offset, data_size = found
+    parsed = _parse_fmt(fmt)
+    if parsed is None:
+        return None
+    format_tag, channels, sample_rate, bits = parsed
+
+    # 流式合成的WAV头里长度常为0或0xFFFFFFFF，此时取到文件末尾
+    end = offset + data_size
+    if data_size == 0 or end > len(audio_bytes):
+        end = len(audio_bytes)
+    data = audio_bytes[offset:end]
+    frame_bytes = bits // 8 * channels
+    data = data[: len(data) - len(data) % frame_bytes]
+    return _bytes_to_samples(data, format_tag, bits), sample_rate, channels, bits
+
+
+def _to_float(samples: np.ndarray, bits: int) -> np.ndarray:
+    if samples.dtype.kind == "f":
+        return samples.astype(np.float32, copy=False)
+    if samples.dtype == np.uint8:
+        return (samples.astype(np.float32) - 128.0) / 128.0
+    return samples.astype(np.float32) / float(1 << (bits - 1))
+
+
+def _convert(samples: np.ndarray, sample_rate: int, channels: int, bits: int) -> bytes:
+    """转换为16kHz单声道16位PCM"""
+    # 已是目标格式时只需去掉文件头
+    if channels == 1 and bits == 16 and samples.dtype.kind == "i" and sample_rate == TARGET_SAMPLE_RATE:
+        return samples.tobytes()
+
+    audio = _to_float(samples, bits)
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    if sample_rate != TARGET_SAMPLE_RATE:
+        audio = resample_poly(audio, TARGET_SAMPLE_RATE, sample_rate)
+    return (np.clip(audio, -1.0, 32767 / 32768) * 32768).astype("<i2").tobytes()
+
+
+def decode_to_pcm(
+    audio_bytes: bytes, file_type: str, sample_rate: int = TARGET_SAMPLE_RATE
+) -> Optional[bytes]:
+    """
+    在进程内把WAV/裸PCM转换为16kHz单声道16位PCM
+
+    Args:
+        audio_bytes: 音频二进制数据
+        file_type: 文件类型，如wav、pcm
+        sample_rate: 裸PCM的采样率（单声道16位）
+
+    Returns:
+        PCM数据，压缩格式或无法解析时返回None
+    """
+    file_type = (file_type or "").lower().lstrip(".")
+    if file_type in ("pcm", "raw"):
+        samples = np.frombuffer(
+            audio_bytes[: len(audio_bytes) - len(audio_bytes) % 2], dtype="<i2"
+        )
+        return _convert(samples, sample_rate, 1, 16)
+
+    if file_type == "wav" or audio_bytes[:4] == b"RIFF":
+        parsed = _parse_wav(audio_bytes)
+        if parsed is None:
+            return None
+        return _convert(*parsed)
+
+    return None
+
+
+class StreamingResampler:
+    """增量多相重采样，分块输入与一次性调用resample_poly的结果一致"""
+
+    def __init__(self, up: int, down: int):
+        divisor = gcd(up, down)
+        self.up = up // divisor
+        self.down = down // divisor
+        self.passthrough = self.up == self.down
+        if self.passthrough:
+            return
+        self.polyphase, self.taps, self.half_len = _design_filter(self.up, self.down)
+        # 与批量版本一致，在输入前补taps-1个0
+        self._buffer = np.zeros(self.taps - 1, dtype=np.float32)
+        self._buffer_start = -(self.taps - 1)
+        self._total_in = 0
+        self._next_out = 0
+
+    def process(self, samples: np.ndarray, end_of_stream: bool = False) -> np.ndarray:
+        if self.passthrough:
+            return samples
+        if len(samples):
+            self._buffer = np.concatenate(
+                (self._buffer, samples.astype(np.float32, copy=False))
+            )
+            self._total_in += len(samples)
+
+        if end_of_stream:
+            out_end = -(-self._total_in * self.up // self.down)
+            self._buffer = np.concatenate(
+                (self._buffer, np.zeros(self.taps + 1, dtype=np.float32))
+            )
+        else:
+            # 只输出所需输入已全部到达的采样点
+            out_end = (self._total_in * self.up - 1 - self.half_len) // self.down + 1
+        if out_end <= self._next_out:
+            return np.empty(0, dtype=np.float32)
+
+        n = np.arange(self._next_out, out_end)
+        m = n * self.down + self.half_len
+        first = m // self.up - (self.taps - 1) - self._buffer_start
+        windows = self._buffer[first[:, np.newaxis] + np.arange(self.taps)]
+        out = np.einsum("ij,ij->i", windows, self.polyphase[m % self.up])
+        self._next_out = out_end
+
+        # 丢弃后续输出不再需要的输入
+        keep_from = (out_end * self.down + self.half_len) // self.up - (self.taps - 1)
+        drop = keep_from - self._buffer_start
+        if drop > 0:
+            self._buffer = self._buffer[drop:]
+            self._buffer_start += drop
+        return out.astype(np.float32, copy=False)
+
+
+class StreamingAudioDecoder:
+    """增量解码WAV/裸PCM，边接收边输出16kHz单声道16位PCM"""
+
+    def __init__(self, file_type: str, sample_rate: int = TARGET_SAMPLE_RATE):
+        """
+        Args:
+            file_type: wav 或 pcm
+            sample_rate: 裸PCM的采样率（单声道16位），WAV以文件头为准
+        """
+        self._pending = b""
+        self._remaining = None
+        self._format = None
+        self._resampler = None
+        if (file_type or "").lower() in ("pcm", "raw"):
+            self._set_format(WAVE_FORMAT_PCM, 1, sample_rate, 16)
+
+    @staticmethod
+    def supports(file_type: str) -> bool:
+        return (file_type or "").lower() in ("wav", "pcm", "raw")
+
+    def _set_format(self, format_tag, channels, sample_rate, bits):
+        self._format = (format_tag, channels, sample_rate, bits)
+        self._resampler = StreamingResampler(TARGET_SAMPLE_RATE, sample_rate)
+
+    def feed(self, data: bytes) -> bytes:
+        """送入一段数据，返回已可输出的PCM（可能为空）"""
+        return self._decode(data, end_of_stream=False)
+
+    def flush(self) -> bytes:
+        """数据接收完毕，输出剩余PCM"""
+        return self._decode(b"", end_of_stream=True)
+
+    def _decode(self, data: bytes, end_of_stream: bool) -> bytes:
+        if self._format is None:
+            header = self._pending + data
+            found = _find_wav_data(header)
+            if found is None:
+                if end_of_stream or len(header) >= 12 and header[:4] != b"RIFF":
+                    raise ValueError("无法解析WAV文件头")
+                self._pending = header
+                return b""
+            fmt, offset, data_size = found
+            parsed = _parse_fmt(fmt)
+            if parsed is None:
+                raise ValueError("不支持的WAV编码")
+            self._set_format(*parsed)
+            # 长度字段有效时按声明长度截断，流式头的0或0xFFFFFFFF表示读到结束
+            if 0 < data_size < 0xFFFFFFFF:
+                self._remaining = data_size
+            self._pending = b""
+            data = header[offset:]
+
+        if self._remaining is not None:
+            data = data[: self._remaining]
+            self._remaining -= len(data)
+        buffer = self._pending + data if self._pending else data
+
+        format_tag, channels, sample_rate, bits = self._format
+        frame_bytes = bits // 8 * channels
+        usable = len(buffer) - len(buffer) % frame_bytes
+        self._pending = buffer[usable:]
+        samples = _bytes_to_samples(buffer[:usable], format_tag, bits)
+
+        # 已是目标格式时直接透传
+        if channels == 1 and bits == 16 and format_tag == WAVE_FORMAT_PCM and sample_rate == TARGET_SAMPLE_RATE:
+            return samples.tobytes()
+
+        audio = _to_float(samples, bits)
+        if channels > 1:
+            audio = audio.reshape(-1, channels).mean(axis=1)
+        audio = self._resampler.process(audio, end_of_stream)
+        return (np.clip(audio, -1.0, 32767 / 32768) * 32768).astype("<i2").tobytes()
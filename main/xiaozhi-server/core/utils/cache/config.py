@@ -19,6 +19,11 @@ class CacheType(Enum):
     CONFIG = "config"
     DEVICE_PROMPT = "device_prompt"
     VOICEPRINT_HEALTH = "voiceprint_health"  # 声纹识别健康检查
+    AUDIO_ASSET = "audio_asset"  # 预编码的提示音音频帧
+    VISION_CONFIG = "vision_config"  # 设备的视觉分析模型配置
+    VISION_IMAGE = "vision_image"  # 预处理后的视觉请求图片
+    VOICEPRINT_EMBEDDING = "voiceprint_embedding"  # 本地声纹注册音频的说话人向量
+    VOICEPRINT_ENROLLMENT = "voiceprint_enrollment"  # 本地声纹全部注册说话人的向量矩阵
 
 
 @dataclass
@@ -58,5 +63,20 @@ class CacheConfig:
             CacheType.VOICEPRINT_HEALTH: cls(
                 strategy=CacheStrategy.TTL, ttl=600, max_size=100  # 10分钟过期
             ),
+            CacheType.AUDIO_ASSET: cls(
+                strategy=CacheStrategy.LRU, ttl=None, max_size=256  # 文件修改时间变化即换键
+            ),
+            CacheType.VISION_CONFIG: cls(
+                strategy=CacheStrategy.TTL, ttl=60, max_size=1000  # 1分钟过期
+            ),
+            CacheType.VISION_IMAGE: cls(
+                strategy=CacheStrategy.TTL_LRU, ttl=600, max_size=64  # 10分钟
+            ),
+            CacheType.VOICEPRINT_EMBEDDING: cls(
+                strategy=CacheStrategy.LRU, ttl=None, max_size=4096  # 文件修改时间变化即换键
+            ),
+            CacheType.VOICEPRINT_ENROLLMENT: cls(
+                strategy=CacheStrategy.LRU, ttl=None, max_size=16  # 说话人或文件变化即换键
+            ),
         }
         return configs.get(cache_type, cls())
@@ -21,6 +21,8 @@ class GlobalCacheManager:
         self._global_lock = threading.RLock()
         self._last_cleanup = time.time()
         self._stats = {"hits": 0, "misses": 0, "evictions": 0, "cleanups": 0}
+        # 按缓存类型分别统计命中情况
+        self._type_stats: Dict[str, Dict[str, int]] = {}
 
     @property
     def logger(self):
@@ -31,6 +33,40 @@ class GlobalCacheManager:
             self._logger = setup_logging()
         return self._logger
 
+    def _count(self, cache_type: CacheType, field: str):
+        """累加全局及对应缓存类型的统计"""
+        self._stats[field] += 1
+        type_stats = self._type_stats.get(cache_type.value)
+        if type_stats is None:
+            type_stats = self._type_stats.setdefault(
+                cache_type.value, {"hits": 0, "misses": 0, "evictions": 0}
+            )
+        type_stats[field] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回全局及各缓存类型的命中次数、命中率和条目数"""
+        entries: Dict[str, int] = {}
+        with self._global_lock:
+            for cache_name, cache in self._caches.items():
+                type_name = cache_name.split(":", 1)[0]
+                entries[type_name] = entries.get(type_name, 0) + len(cache)
+
+        types = {}
+        for type_name in set(entries) | set(self._type_stats):
+            type_stats = dict(
+                self._type_stats.get(type_name, {"hits": 0, "misses": 0, "evictions": 0})
+            )
+            lookups = type_stats["hits"] + type_stats["misses"]
+            type_stats["hit_ratio"] = type_stats["hits"] / lookups if lookups else 0.0
+            type_stats["entries"] = entries.get(type_name, 0)
+            types[type_name] = type_stats
+
+        stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        stats["types"] = types
+        return stats
+
     def _get_cache_name(self, cache_type: CacheType, namespace: str = "") -> str:
         """生成缓存名称"""
         if namespace:
@@ -84,7 +120,7 @@ class GlobalCacheManager:
                     # 移除最旧的条目
                     oldest_key = next(iter(cache))
                     del cache[oldest_key]
-                    self._stats["evictions"] += 1
+                    self._count(cache_type, "evictions")
 
             else:
                 cache[key] = entry
@@ -94,7 +130,7 @@ class GlobalCacheManager:
                     # 简单策略：随机移除一个条目
                     victim_key = next(iter(cache))
                     del cache[victim_key]
-                    self._stats["evictions"] += 1
+                    self._count(cache_type, "evictions")
 
         # 定期清理过期条目
         self._maybe_cleanup(cache_name)
@@ -106,7 +142,7 @@ class GlobalCacheManager:
         cache_name = self._get_cache_name(cache_type, namespace)
 
         if cache_name not in self._caches:
-            self._stats["misses"] += 1
+            self._count(cache_type, "misses")
             return None
 
         cache = self._caches[cache_name]
@@ -114,7 +150,7 @@ class GlobalCacheManager:
 
         with self._locks[cache_name]:
             if key not in cache:
-                self._stats["misses"] += 1
+                self._count(cache_type, "misses")
                 return None
 
             entry = cache[key]
@@ -122,7 +158,7 @@ class GlobalCacheManager:
             # 检查过期
             if entry.is_expired():
                 del cache[key]
-                self._stats["misses"] += 1
+                self._count(cache_type, "misses")
                 return None
 
             # 更新访问信息
@@ -133,7 +169,7 @@ class GlobalCacheManager:
                 del cache[key]
                 cache[key] = entry
 
-            self._stats["hits"] += 1
+            self._count(cache_type, "hits")
             return entry.value
 
     def delete(self, cache_type: CacheType, key: str, namespace: str = "") -> bool:
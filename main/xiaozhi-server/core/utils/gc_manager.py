@@ -4,6 +4,7 @@
 """
 
 import gc
+import time
 import asyncio
 import threading
 from config.logger import setup_logging
@@ -26,6 +27,16 @@ class GlobalGCManager:
         self._task = None
         self._stop_event = asyncio.Event()
         self._lock = threading.Lock()
+        # GC停顿统计，包括解释器自动触发的回收
+        # 回调在回收过程中执行，任何线程都可能触发，不能加锁，否则持锁线程分配内存触发GC会死锁
+        self._gc_start = None
+        self._pause_total = 0.0
+        self._pause_max = 0.0
+        self._last_pause = 0.0
+        self._collections = [0, 0, 0]
+        self._collected = 0
+        self._manual_runs = 0
+        self._last_manual_duration = 0.0
 
     async def start(self):
         """启动定时GC任务"""
@@ -34,6 +45,8 @@ class GlobalGCManager:
             return
 
         logger.bind(tag=TAG).info(f"启动全局GC管理器，间隔{self.interval_seconds}秒")
+        if self._on_gc not in gc.callbacks:
+            gc.callbacks.append(self._on_gc)
         self._stop_event.clear()
         self._task = asyncio.create_task(self._gc_loop())
 
@@ -43,6 +56,8 @@ class GlobalGCManager:
             return
 
         logger.bind(tag=TAG).info("停止全局GC管理器")
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
         self._stop_event.set()
 
         if self._task and not self._task.done():
@@ -54,6 +69,38 @@ class GlobalGCManager:
 
         self._task = None
 
+    def _on_gc(self, phase, info):
+        """gc.callbacks回调，统计每次回收的停顿时间"""
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+            return
+        if self._gc_start is None:
+            return
+        pause = time.perf_counter() - self._gc_start
+        self._gc_start = None
+        self._pause_total += pause
+        self._last_pause = pause
+        if pause > self._pause_max:
+            self._pause_max = pause
+        generation = info.get("generation", 0)
+        if 0 <= generation < len(self._collections):
+            self._collections[generation] += 1
+        self._collected += info.get("collected", 0)
+
+    def get_stats(self) -> dict:
+        """返回GC次数、停顿耗时及定时GC执行情况"""
+        return {
+            "collections": {
+                f"gen{i}": count for i, count in enumerate(self._collections)
+            },
+            "collected": self._collected,
+            "pause_total_seconds": self._pause_total,
+            "pause_max_seconds": self._pause_max,
+            "last_pause_seconds": self._last_pause,
+            "manual_runs": self._manual_runs,
+            "last_manual_duration_seconds": self._last_manual_duration,
+        }
+
     async def _gc_loop(self):
         """GC循环任务"""
         try:
@@ -88,10 +135,13 @@ class GlobalGCManager:
 
             def do_gc():
                 with self._lock:
+                    start_time = time.perf_counter()
                     before = len(gc.get_objects())
                     collected = gc.collect()
                     after = len(gc.get_objects())
-                    return before, collected, after
+                    self._manual_runs += 1
+                    self._last_manual_duration = time.perf_counter() - start_time
+                return before, collected, after
 
             before, collected, after = await loop.run_in_executor(None, do_gc)
             logger.bind(tag=TAG).debug(
@@ -0,0 +1,89 @@
+"""
+视觉请求图片预处理模块
+设备上传的原始摄像头画面在发送给视觉模型前先解码、按最长边缩放并重新编码为JPEG，
+减少上传体积和模型耗时；相同内容的图片按哈希缓存处理结果，重复帧无需再次编码
+"""
+
+import io
+import hashlib
+from typing import Optional
+from config.logger import setup_logging
+from core.utils.cache.manager import cache_manager
+from core.utils.cache.config import CacheType
+
+TAG = __name__
+logger = setup_logging()
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow未安装时跳过预处理
+    Image = None
+    ImageOps = None
+
+
+class ImagePreprocessor:
+    """图片缩放与重编码，处理失败时返回原图"""
+
+    def __init__(self, config: Optional[dict] = None):
+        config = config or {}
+        self.enabled = str(config.get("enabled", True)).lower() in ("true", "1", "yes")
+        self.max_edge = int(config.get("max_edge", 1024))
+        self.quality = int(config.get("quality", 80))
+        if self.enabled and Image is None:
+            logger.bind(tag=TAG).warning("未安装Pillow，视觉请求图片预处理已关闭")
+            self.enabled = False
+
+    def process(self, image_data: bytes) -> bytes:
+        """返回缩放并重编码后的JPEG，无需处理或处理失败时返回原图
+
+        缓存只保存缩放或重编码后的结果，每项不超过max_edge对应的JPEG大小
+        """
+        if not self.enabled:
+            return image_data
+
+        digest = hashlib.sha1(image_data).hexdigest()
+        cache_key = f"{digest}:{self.max_edge}:{self.quality}"
+        cached = cache_manager.get(CacheType.VISION_IMAGE, cache_key)
+        if cached is not None:
+            return cached or image_data
+
+        try:
+            result = self._transcode(image_data)
+        except Exception as e:
+            logger.bind(tag=TAG).warning(f"图片预处理失败，使用原图: {e}")
+            return image_data
+        # 保留原图时只缓存空标记，原图可达数MB，不占用缓存
+        cache_manager.set(
+            CacheType.VISION_IMAGE,
+            cache_key,
+            b"" if result is image_data else result,
+        )
+        return result
+
+    def _transcode(self, image_data: bytes) -> bytes:
+        with Image.open(io.BytesIO(image_data)) as image:
+            source_format = image.format
+            resized = max(image.size) > self.max_edge
+            if resized and source_format == "JPEG":
+                # JPEG按DCT缩放直接解码为接近目标尺寸的图像，省去全分辨率解码
+                image.draft("RGB", (self.max_edge, self.max_edge))
+            # 按EXIF方向摆正，重编码后方向信息会丢失
+            image = ImageOps.exif_transpose(image)
+            if resized:
+                image.thumbnail((self.max_edge, self.max_edge), Image.BICUBIC)
+            if image.mode in ("RGBA", "LA", "P"):
+                # 透明背景铺白后再转为JPEG
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel("A"))
+                image = background
+            elif image.mode != "RGB":
+                image = image.convert("RGB")
+
+            output = io.BytesIO()
+            image.save(output, format="JPEG", quality=self.quality)
+        result = output.getvalue()
+        # 未缩放的JPEG重编码后反而更大时保留原图
+        if not resized and source_format == "JPEG" and len(result) >= len(image_data):
+            return image_data
+        return result
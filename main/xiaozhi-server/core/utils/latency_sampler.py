@@ -0,0 +1,60 @@
+"""
+耗时分布采样模块
+供离线桩供应商模拟上游耗时，配置相同的种子时采样序列可复现，便于与基线对比
+
+配置既可以是单个数字（固定毫秒数），也可以是字典：
+    distribution: fixed | uniform | normal | lognormal
+    mean: 平均值（毫秒），uniform 时为区间中点
+    std: 标准差（毫秒），uniform 时为区间半宽
+    min / max: 截断范围（毫秒），可选
+"""
+
+import math
+import random
+import threading
+from typing import Optional, Union
+
+DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+
+class LatencySampler:
+    """线程安全的耗时采样器，sample() 返回秒"""
+
+    def __init__(self, spec: Union[int, float, dict, None], seed: Optional[int] = None):
+        if spec is None or spec == "":
+            spec = 0
+        if not isinstance(spec, dict):
+            spec = {"distribution": "fixed", "mean": float(spec)}
+        self.distribution = spec.get("distribution", "fixed")
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(
+                f"不支持的耗时分布: {self.distribution}，可选 {', '.join(DISTRIBUTIONS)}"
+            )
+        self.mean = float(spec.get("mean", 0))
+        self.std = float(spec.get("std", 0))
+        self.min = float(spec.get("min", 0))
+        self.max = float(spec["max"]) if spec.get("max") is not None else None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        with self._lock:
+            value = self._sample_ms()
+        value = max(self.min, value)
+        if self.max is not None:
+            value = min(self.max, value)
+        return value / 1000
+
+    def _sample_ms(self) -> float:
+        if self.distribution == "fixed" or self.std <= 0:
+            return self.mean
+        if self.distribution == "uniform":
+            return self._random.uniform(self.mean - self.std, self.mean + self.std)
+        if self.distribution == "normal":
+            return self._random.gauss(self.mean, self.std)
+        # 对数正态：换算底层正态参数，使采样结果的均值和标准差与配置一致
+        if self.mean <= 0:
+            return 0.0
+        sigma2 = math.log(1 + (self.std / self.mean) ** 2)
+        mu = math.log(self.mean) - sigma2 / 2
+        return self._random.lognormvariate(mu, math.sqrt(sigma2))
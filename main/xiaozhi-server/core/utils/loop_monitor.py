@@ -0,0 +1,176 @@
+"""
+事件循环监控模块
+持续采样事件循环延迟，并可开启阻塞检测：回调占用事件循环超过阈值时，
+输出事件循环线程当时的调用栈以及所属连接的设备ID，便于定位导致所有设备音频抖动的阻塞调用
+"""
+
+import sys
+import time
+import asyncio
+import threading
+import traceback
+from typing import Optional
+from config.logger import setup_logging
+from core.utils.metrics import get_histogram
+
+TAG = __name__
+logger = setup_logging()
+
+# 事件循环延迟分桶（秒）
+LOOP_LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _find_connection(frame):
+    """沿调用栈查找正在处理的连接，返回 (device_id, session_id)"""
+    while frame is not None:
+        for name in ("self", "conn"):
+            obj = frame.f_locals.get(name)
+            if type(obj).__name__ == "ConnectionHandler":
+                return obj.device_id, obj.session_id
+        frame = frame.f_back
+    return None, None
+
+
+class LoopMonitor:
+    """事件循环延迟采样器及阻塞调用检测器"""
+
+    def __init__(
+        self,
+        interval_ms: float = 500,
+        blocking_detect: bool = False,
+        blocking_threshold_ms: float = 100,
+    ):
+        self.interval = max(float(interval_ms), 10) / 1000
+        self.blocking_detect = blocking_detect
+        self.threshold = max(float(blocking_threshold_ms), 10) / 1000
+        # 心跳间隔取阈值的一半，保证阈值内至少有一次心跳
+        self.heartbeat_interval = self.threshold / 2
+        self._histogram = get_histogram(
+            "event_loop_lag_sampled_seconds",
+            "事件循环定时采样的调度延迟",
+            LOOP_LAG_BUCKETS,
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id = None
+        self._task = None
+        self._heartbeat_handle = None
+        self._watchdog = None
+        self._stop = threading.Event()
+        self._last_beat = time.perf_counter()
+        self._last_lag = 0.0
+        self._max_lag = 0.0
+        self._stalls = 0
+        self._stall_total = 0.0
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> "LoopMonitor":
+        config = config or {}
+        return cls(
+            interval_ms=config.get("interval_ms", 500),
+            blocking_detect=str(config.get("blocking_detect", False)).lower()
+            in ("true", "1", "yes"),
+            blocking_threshold_ms=config.get("blocking_threshold_ms", 100),
+        )
+
+    async def start(self):
+        """在事件循环中启动采样，开启阻塞检测时另起看门狗线程"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._sample_loop())
+        if self.blocking_detect:
+            self._last_beat = time.perf_counter()
+            self._heartbeat()
+            self._watchdog = threading.Thread(
+                target=self._watchdog_loop, name="loop-watchdog", daemon=True
+            )
+            self._watchdog.start()
+            logger.bind(tag=TAG).info(
+                f"事件循环阻塞检测已开启，阈值{self.threshold * 1000:.0f}ms"
+            )
+
+    async def stop(self):
+        self._stop.set()
+        if self._heartbeat_handle is not None:
+            self._heartbeat_handle.cancel()
+            self._heartbeat_handle = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _sample_loop(self):
+        while not self._stop.is_set():
+            start_time = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - start_time - self.interval)
+            self._last_lag = lag
+            if lag > self._max_lag:
+                self._max_lag = lag
+            self._histogram.observe(lag)
+
+    def _heartbeat(self):
+        self._last_beat = time.perf_counter()
+        if not self._stop.is_set():
+            self._heartbeat_handle = self._loop.call_later(
+                self.heartbeat_interval, self._heartbeat
+            )
+
+    def _watchdog_loop(self):
+        """在独立线程中检查心跳，事件循环被占用时抓取其调用栈"""
+        check_interval = self.heartbeat_interval / 2
+        stall_started = None
+        while not self._stop.wait(check_interval):
+            last_beat = self._last_beat
+            blocked = time.perf_counter() - last_beat - self.heartbeat_interval
+            if blocked >= self.threshold:
+                if stall_started is None:
+                    stall_started = last_beat
+                    self._report_stall(blocked)
+            elif stall_started is not None:
+                duration = last_beat - stall_started - self.heartbeat_interval
+                self._stalls += 1
+                self._stall_total += duration
+                logger.bind(tag=TAG).warning(
+                    f"事件循环阻塞结束，共阻塞约{duration * 1000:.0f}ms"
+                )
+                stall_started = None
+
+    def _report_stall(self, blocked: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        device_id, session_id = _find_connection(frame)
+        stack = "".join(traceback.format_stack(frame))
+        logger.bind(tag=TAG).warning(
+            f"事件循环被阻塞已超过{blocked * 1000:.0f}ms，"
+            f"设备: {device_id}，会话: {session_id}，调用栈:\n{stack}"
+        )
+
+    def get_stats(self) -> dict:
+        snapshot = self._histogram.snapshot()
+        return {
+            "last_lag_seconds": self._last_lag,
+            "max_lag_seconds": self._max_lag,
+            "p99_lag_seconds": snapshot["p99"],
+            "blocking_detect": self.blocking_detect,
+            "stalls": self._stalls,
+            "stall_total_seconds": self._stall_total,
+        }
+
+
+# 全局单例
+_loop_monitor_instance: Optional[LoopMonitor] = None
+
+
+def get_loop_monitor(config: Optional[dict] = None) -> LoopMonitor:
+    """获取全局事件循环监控器，config 仅在首次创建时生效"""
+    global _loop_monitor_instance
+    if _loop_monitor_instance is None:
+        _loop_monitor_instance = LoopMonitor.from_config(config)
+    return _loop_monitor_instance
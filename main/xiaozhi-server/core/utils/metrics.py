@@ -0,0 +1,204 @@
+"""
+进程内指标模块
+提供线程安全的固定分桶直方图，用于统计音频帧延迟等耗时分布，并可导出为Prometheus文本格式
+"""
+
+import bisect
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+# 默认耗时分桶（秒），覆盖0.1ms到2.5s
+DEFAULT_LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+# 整轮对话耗时分桶（秒），覆盖50ms到30s
+TURN_LATENCY_BUCKETS = (
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    1.5,
+    2.0,
+    3.0,
+    5.0,
+    7.5,
+    10.0,
+    20.0,
+    30.0,
+)
+
+
+class Histogram:
+    """固定分桶直方图，记录观测值的分布、总和与次数"""
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+        labels: Optional[Dict[str, str]] = None,
+    ):
+        self.name = name
+        self.description = description
+        self.labels = dict(labels or {})
+        self.buckets = tuple(sorted(buckets))
+        # 最后一个位置存放超出最大分桶的观测值
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def quantile(self, q: float) -> float:
+        """按分桶线性插值估算分位数"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+        return self._quantile(counts, total, q)
+
+    def _quantile(self, counts, total, q) -> float:
+        if total == 0:
+            return 0.0
+        rank = q * total
+        cumulative = 0
+        for i, count in enumerate(counts):
+            if count and cumulative + count >= rank:
+                if i >= len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def snapshot(self) -> dict:
+        """返回累计分桶计数、总和、次数及常用分位数"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            value_sum = self._sum
+        cumulative = 0
+        buckets = []
+        for upper, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            buckets.append((upper, cumulative))
+        return {
+            "buckets": buckets,
+            "sum": value_sum,
+            "count": total,
+            "p50": self._quantile(counts, total, 0.5),
+            "p95": self._quantile(counts, total, 0.95),
+            "p99": self._quantile(counts, total, 0.99),
+        }
+
+
+# 全局直方图注册表，同名不同标签的直方图分别注册
+_histograms: Dict[Tuple[str, tuple], Histogram] = {}
+_registry_lock = threading.Lock()
+
+
+def get_histogram(
+    name: str,
+    description: str = "",
+    buckets: Optional[Iterable[float]] = None,
+    labels: Optional[Dict[str, str]] = None,
+) -> Histogram:
+    """按名称和标签获取直方图，不存在时创建"""
+    key = (name, tuple(sorted((labels or {}).items())))
+    histogram = _histograms.get(key)
+    if histogram is None:
+        with _registry_lock:
+            histogram = _histograms.get(key)
+            if histogram is None:
+                histogram = Histogram(
+                    name, description, buckets or DEFAULT_LATENCY_BUCKETS, labels
+                )
+                _histograms[key] = histogram
+    return histogram
+
+
+def get_all_histograms() -> Dict[str, Histogram]:
+    """返回全部直方图，键为带标签的指标名"""
+    return {
+        _format_name(h.name, h.labels): h for h in list(_histograms.values())
+    }
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_name(name: str, labels: Dict[str, str]) -> str:
+    if not labels:
+        return name
+    pairs = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+    return f"{name}{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def render_family(name: str, description: str, metric_type: str, samples) -> str:
+    """渲染一组gauge/counter样本，samples 为 (标签字典, 数值) 列表"""
+    metric = f"xiaozhi_{name}"
+    lines = []
+    if description:
+        lines.append(f"# HELP {metric} {description}")
+    lines.append(f"# TYPE {metric} {metric_type}")
+    for labels, value in samples:
+        lines.append(f"{_format_name(metric, labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def render_prometheus() -> str:
+    """将全部直方图渲染为Prometheus文本格式"""
+    families: Dict[str, list] = {}
+    for histogram in list(_histograms.values()):
+        families.setdefault(histogram.name, []).append(histogram)
+
+    lines = []
+    for name in sorted(families):
+        histograms = families[name]
+        metric = f"xiaozhi_{name}"
+        if histograms[0].description:
+            lines.append(f"# HELP {metric} {histograms[0].description}")
+        lines.append(f"# TYPE {metric} histogram")
+        for histogram in histograms:
+            snapshot = histogram.snapshot()
+            for upper, cumulative in snapshot["buckets"]:
+                labels = dict(histogram.labels, le=_format_value(upper))
+                lines.append(f"{_format_name(metric + '_bucket', labels)} {cumulative}")
+            lines.append(
+                f"{_format_name(metric + '_sum', histogram.labels)} {snapshot['sum']!r}"
+            )
+            lines.append(
+                f"{_format_name(metric + '_count', histogram.labels)} {snapshot['count']}"
+            )
+    return "\n".join(lines) + "\n"
@@ -1,6 +1,7 @@
 from typing import Dict, Any
 from config.logger import setup_logging
 from core.utils import tts, llm, intent, memory, vad, asr
+from core.utils.asr_service import should_use_service
 
 TAG = __name__
 logger = setup_logging()
@@ -114,6 +115,25 @@ def initialize_tts(config):
 
 
 def initialize_asr(config):
+    if should_use_service(config):
+        # 模型由ASR服务进程托管，本进程只创建客户端
+        service_config = config.get("asr_service") or {}
+        select_asr_module = config["selected_module"]["ASR"]
+        new_asr = asr.create_instance(
+            "local_service",
+            {
+                "socket_path": service_config.get(
+                    "socket_path", "tmp/asr_service.sock"
+                ),
+                "timeout": service_config.get("timeout", 15),
+                "output_dir": config["ASR"][select_asr_module].get(
+                    "output_dir", "tmp/"
+                ),
+            },
+            str(config.get("delete_audio", True)).lower() in ("true", "1", "yes"),
+        )
+        logger.bind(tag=TAG).info("ASR模块初始化完成（本地ASR服务）")
+        return new_asr
     select_asr_module = config["selected_module"]["ASR"]
     asr_type = (
         select_asr_module
@@ -0,0 +1,215 @@
+"""
+服务运行状态采集模块
+汇总连接数、各连接队列深度、线程数、线程池积压、缓存命中率、事件循环延迟、GC停顿和内存占用，
+供 /metrics（Prometheus文本格式）和 /debug/stats（JSON）接口使用
+"""
+
+import time
+import asyncio
+import threading
+import psutil
+from core.utils.cache.manager import cache_manager
+from core.utils.gc_manager import get_gc_manager
+from core.utils.loop_monitor import get_loop_monitor
+from core.utils.metrics import render_family
+from core.utils.tts_cache import get_tts_cache
+from core.utils.worker_pool import get_worker_scheduler
+
+# 每个连接上需要观察积压情况的队列
+CONNECTION_QUEUES = (
+    "asr_audio_queue",
+    "tts_text_queue",
+    "tts_audio_queue",
+    "report_queue",
+)
+
+_process = psutil.Process()
+
+
+def _queue_depth(conn, name: str) -> int:
+    owner = conn.tts if name.startswith("tts_") else conn
+    queue = getattr(owner, name, None) if owner is not None else None
+    return queue.qsize() if queue is not None else 0
+
+
+async def measure_loop_lag() -> float:
+    """测量当前事件循环中回调从就绪到执行的等待时间（秒）"""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    start_time = time.perf_counter()
+    loop.call_soon(future.set_result, None)
+    await future
+    return time.perf_counter() - start_time
+
+
+def _default_executor_backlog() -> int:
+    """事件循环默认线程池（run_in_executor(None, ...)）中等待执行的任务数"""
+    executor = getattr(asyncio.get_running_loop(), "_default_executor", None)
+    work_queue = getattr(executor, "_work_queue", None)
+    return work_queue.qsize() if work_queue is not None else 0
+
+
+def _collect_connections(ws_server) -> dict:
+    connections = list(getattr(ws_server, "active_connections", ()) or ())
+    totals = {name: 0 for name in CONNECTION_QUEUES}
+    maxima = {name: 0 for name in CONNECTION_QUEUES}
+    details = []
+    for conn in connections:
+        depths = {name: _queue_depth(conn, name) for name in CONNECTION_QUEUES}
+        for name, depth in depths.items():
+            totals[name] += depth
+            maxima[name] = max(maxima[name], depth)
+        details.append(
+            {
+                "session_id": conn.session_id,
+                "device_id": conn.device_id,
+                "queues": depths,
+            }
+        )
+    return {
+        "active": len(connections),
+        "queue_total": totals,
+        "queue_max": maxima,
+        "details": details,
+    }
+
+
+async def collect_server_stats(ws_server=None) -> dict:
+    """采集一次完整的服务状态快照，需在事件循环中调用"""
+    memory = _process.memory_info()
+    caches = cache_manager.get_stats()
+    tts_stats = get_tts_cache().get_stats()
+    tts_stats["hits"] = tts_stats["memory_hits"] + tts_stats["disk_hits"]
+    caches["types"]["tts_audio"] = tts_stats
+    return {
+        "timestamp": time.time(),
+        "connections": _collect_connections(ws_server),
+        "threads": {
+            "python": threading.active_count(),
+            "os": _process.num_threads(),
+        },
+        "executors": {
+            "worker_pools": get_worker_scheduler().get_stats(),
+            "default_backlog": _default_executor_backlog(),
+        },
+        "caches": caches,
+        "event_loop": dict(
+            get_loop_monitor().get_stats(), lag_seconds=await measure_loop_lag()
+        ),
+        "gc": get_gc_manager().get_stats(),
+        "memory": {"rss_bytes": memory.rss, "vms_bytes": memory.vms},
+    }
+
+
+def render_server_metrics(stats: dict) -> str:
+    """将状态快照渲染为Prometheus文本格式"""
+    connections = stats["connections"]
+    pools = stats["executors"]["worker_pools"]
+    cache_types = stats["caches"]["types"]
+    gc_stats = stats["gc"]
+    parts = [
+        render_family(
+            "active_connections",
+            "当前WebSocket连接数",
+            "gauge",
+            [({}, connections["active"])],
+        ),
+        render_family(
+            "connection_queue_depth_total",
+            "全部连接的队列积压之和",
+            "gauge",
+            [({"queue": k}, v) for k, v in connections["queue_total"].items()],
+        ),
+        render_family(
+            "connection_queue_depth_max",
+            "单个连接的最大队列积压",
+            "gauge",
+            [({"queue": k}, v) for k, v in connections["queue_max"].items()],
+        ),
+        render_family(
+            "threads",
+            "进程线程数",
+            "gauge",
+            [({"kind": k}, v) for k, v in stats["threads"].items()],
+        ),
+        render_family(
+            "worker_pool_queue_depth",
+            "工作线程池排队任务数",
+            "gauge",
+            [({"pool": k}, v["queue_depth"]) for k, v in pools.items()]
+            + [({"pool": "default"}, stats["executors"]["default_backlog"])],
+        ),
+        render_family(
+            "worker_pool_active",
+            "工作线程池执行中任务数",
+            "gauge",
+            [({"pool": k}, v["active"]) for k, v in pools.items()],
+        ),
+        render_family(
+            "worker_pool_wait_max_seconds",
+            "工作线程池最长排队耗时",
+            "gauge",
+            [({"pool": k}, v["wait_max_ms"] / 1000) for k, v in pools.items()],
+        ),
+        render_family(
+            "cache_hits_total",
+            "缓存命中次数",
+            "counter",
+            [({"cache_type": k}, v["hits"]) for k, v in cache_types.items()],
+        ),
+        render_family(
+            "cache_misses_total",
+            "缓存未命中次数",
+            "counter",
+            [({"cache_type": k}, v["misses"]) for k, v in cache_types.items()],
+        ),
+        render_family(
+            "cache_hit_ratio",
+            "缓存命中率",
+            "gauge",
+            [({"cache_type": k}, v["hit_ratio"]) for k, v in cache_types.items()],
+        ),
+        render_family(
+            "event_loop_lag_seconds",
+            "事件循环回调等待时间",
+            "gauge",
+            [({}, stats["event_loop"]["lag_seconds"])],
+        ),
+        render_family(
+            "event_loop_lag_max_seconds",
+            "事件循环采样到的最大调度延迟",
+            "gauge",
+            [({}, stats["event_loop"]["max_lag_seconds"])],
+        ),
+        render_family(
+            "event_loop_stalls_total",
+            "阻塞检测发现的事件循环阻塞次数",
+            "counter",
+            [({}, stats["event_loop"]["stalls"])],
+        ),
+        render_family(
+            "gc_collections_total",
+            "GC次数",
+            "counter",
+            [({"generation": k}, v) for k, v in gc_stats["collections"].items()],
+        ),
+        render_family(
+            "gc_pause_seconds_total",
+            "GC累计停顿时间",
+            "counter",
+            [({}, gc_stats["pause_total_seconds"])],
+        ),
+        render_family(
+            "gc_pause_max_seconds",
+            "GC最长单次停顿",
+            "gauge",
+            [({}, gc_stats["pause_max_seconds"])],
+        ),
+        render_family(
+            "process_resident_memory_bytes",
+            "进程常驻内存",
+            "gauge",
+            [({}, stats["memory"]["rss_bytes"])],
+        ),
+    ]
+    return "".join(parts)
@@ -0,0 +1,314 @@
+"""
+TTS语句音频缓存模块
+问候语、工具确认、错误提示等短句会反复合成，按 供应商配置 + 输出格式 + 规范化文本
+计算内容寻址键，缓存编码后的音频帧列表，命中时跳过网络请求和解码编码。
+内存层为LRU+TTL并限制总字节数；可选磁盘层保存在 tmp/ 下，进程重启后仍可命中
+"""
+
+import os
+import json
+import time
+import struct
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+DEFAULT_DISK_DIR = os.path.join("tmp", "tts_cache")
+
+# 不影响合成结果的配置项，不参与键计算
+NAMESPACE_IGNORED_KEYS = ("output_dir", "stream_audio")
+
+# 磁盘文件格式：魔数 + 创建时间 + 帧数，之后每帧为 长度 + 数据
+_FILE_MAGIC = b"XZTC"
+_FILE_HEADER = struct.Struct("<4sdI")
+_FRAME_HEADER = struct.Struct("<I")
+_FILE_SUFFIX = ".tts"
+
+MB = 1024 * 1024
+
+
+def build_namespace(tts_config: dict) -> str:
+    """由TTS供应商配置生成命名空间，类型、音色、语速等任一参数变化即换键"""
+    params = {
+        k: v for k, v in (tts_config or {}).items() if k not in NAMESPACE_IGNORED_KEYS
+    }
+    return json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def normalize_text(text: str) -> str:
+    """合并空白字符，避免仅空格不同的文本重复缓存"""
+    return " ".join(text.split())
+
+
+class TTSAudioCache:
+    """TTS语句音频缓存，线程安全，在TTS线程池中调用"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        ttl: Optional[float] = 86400,
+        max_entries: int = 2000,
+        max_bytes: int = 64 * MB,
+        max_text_length: int = 50,
+        disk_enabled: bool = False,
+        disk_dir: str = DEFAULT_DISK_DIR,
+        disk_max_bytes: int = 512 * MB,
+    ):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_text_length = max_text_length
+        self.disk_enabled = disk_enabled
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+
+        # key -> (创建时间, 帧元组, 字节数)
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._memory_bytes = 0
+        # key -> 文件字节数，按最近使用排序
+        self._disk_index: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "disk_evictions": 0,
+        }
+
+        if self.enabled and self.disk_enabled:
+            self._load_disk_index()
+
+    @classmethod
+    def from_config(cls, cache_config: Optional[dict]) -> "TTSAudioCache":
+        cache_config = cache_config or {}
+
+        def as_bool(value):
+            return str(value).lower() in ("true", "1", "yes")
+
+        ttl = cache_config.get("ttl", 86400)
+        return cls(
+            enabled=as_bool(cache_config.get("enabled", True)),
+            ttl=float(ttl) if ttl else None,
+            max_entries=int(cache_config.get("max_entries", 2000)),
+            max_bytes=int(float(cache_config.get("max_memory_mb", 64)) * MB),
+            max_text_length=int(cache_config.get("max_text_length", 50)),
+            disk_enabled=as_bool(cache_config.get("disk_enabled", False)),
+            disk_dir=cache_config.get("disk_dir") or DEFAULT_DISK_DIR,
+            disk_max_bytes=int(float(cache_config.get("disk_max_mb", 512)) * MB),
+        )
+
+    def make_key(self, namespace: str, audio_format: str, text: str) -> Optional[str]:
+        """返回缓存键，缓存关闭或文本过长时返回None"""
+        if not self.enabled:
+            return None
+        text = normalize_text(text)
+        if not text or len(text) > self.max_text_length:
+            return None
+        raw = f"{namespace}\n{audio_format}\n{text}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def get(self, key: str) -> Optional[List[bytes]]:
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None:
+                if self._is_expired(item[0]):
+                    self._remove_memory(key)
+                else:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return list(item[1])
+
+        if self.disk_enabled:
+            loaded = self._read_disk(key)
+            if loaded is not None:
+                created, packets = loaded
+                with self._lock:
+                    self._stats["disk_hits"] += 1
+                    self._store_memory(key, created, packets)
+                return list(packets)
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def put(self, key: str, packets: List[bytes]):
+        if not key or not packets:
+            return
+        packets = tuple(packets)
+        created = time.time()
+        with self._lock:
+            self._stats["stores"] += 1
+            self._store_memory(key, created, packets)
+        if self.disk_enabled:
+            self._write_disk(key, created, packets)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            keys = list(self._disk_index)
+            self._disk_index.clear()
+            self._disk_bytes = 0
+        for key in keys:
+            try:
+                os.remove(self._disk_path(key))
+            except OSError:
+                pass
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._memory)
+            stats["bytes"] = self._memory_bytes
+            stats["disk_entries"] = len(self._disk_index)
+            stats["disk_bytes"] = self._disk_bytes
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_ratio"] = hits / lookups if lookups else 0.0
+        return stats
+
+    def _is_expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _store_memory(self, key: str, created: float, packets: tuple):
+        """调用方需持有锁"""
+        size = sum(len(p) for p in packets)
+        if size > self.max_bytes:
+            return
+        if key in self._memory:
+            self._remove_memory(key)
+        self._memory[key] = (created, packets, size)
+        self._memory_bytes += size
+        while self._memory and (
+            len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes
+        ):
+            oldest_key = next(iter(self._memory))
+            self._remove_memory(oldest_key)
+            self._stats["evictions"] += 1
+
+    def _remove_memory(self, key: str):
+        _, _, size = self._memory.pop(key)
+        self._memory_bytes -= size
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], key + _FILE_SUFFIX)
+
+    def _load_disk_index(self):
+        """启动时扫描磁盘层，按修改时间重建LRU顺序"""
+        files = []
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                if not name.endswith(_FILE_SUFFIX):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, name[: -len(_FILE_SUFFIX)], stat.st_size))
+        files.sort()
+        with self._lock:
+            for _, key, size in files:
+                self._disk_index[key] = size
+                self._disk_bytes += size
+        if files:
+            logger.bind(tag=TAG).info(
+                f"TTS磁盘缓存加载 {len(files)} 条，共 {self._disk_bytes / MB:.1f}MB"
+            )
+        self._evict_disk()
+
+    def _read_disk(self, key: str):
+        with self._lock:
+            if key not in self._disk_index:
+                return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            magic, created, count = _FILE_HEADER.unpack_from(data, 0)
+            if magic != _FILE_MAGIC:
+                raise ValueError("bad magic")
+            if self._is_expired(created):
+                self._remove_disk(key)
+                return None
+            offset = _FILE_HEADER.size
+            packets = []
+            for _ in range(count):
+                (length,) = _FRAME_HEADER.unpack_from(data, offset)
+                offset += _FRAME_HEADER.size
+                packets.append(data[offset : offset + length])
+                offset += length
+        except (OSError, ValueError, struct.error) as e:
+            logger.bind(tag=TAG).warning(f"读取TTS磁盘缓存失败 {path}: {e}")
+            self._remove_disk(key)
+            return None
+        with self._lock:
+            if key in self._disk_index:
+                self._disk_index.move_to_end(key)
+        return created, tuple(packets)
+
+    def _write_disk(self, key: str, created: float, packets: tuple):
+        path = self._disk_path(key)
+        parts = [_FILE_HEADER.pack(_FILE_MAGIC, created, len(packets))]
+        for packet in packets:
+            parts.append(_FRAME_HEADER.pack(len(packet)))
+            parts.append(packet)
+        data = b"".join(parts)
+        if len(data) > self.disk_max_bytes:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 先写临时文件再替换，避免并发读取到半个文件
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.bind(tag=TAG).warning(f"写入TTS磁盘缓存失败 {path}: {e}")
+            return
+        with self._lock:
+            old_size = self._disk_index.pop(key, 0)
+            self._disk_index[key] = len(data)
+            self._disk_bytes += len(data) - old_size
+        self._evict_disk()
+
+    def _remove_disk(self, key: str):
+        with self._lock:
+            size = self._disk_index.pop(key, None)
+            if size is not None:
+                self._disk_bytes -= size
+        try:
+            os.remove(self._disk_path(key))
+        except OSError:
+            pass
+
+    def _evict_disk(self):
+        while True:
+            with self._lock:
+                if not self._disk_index or self._disk_bytes <= self.disk_max_bytes:
+                    return
+                oldest_key = next(iter(self._disk_index))
+                self._stats["disk_evictions"] += 1
+            self._remove_disk(oldest_key)
+
+
+_tts_cache = None
+_tts_cache_lock = threading.Lock()
+
+
+def get_tts_cache(cache_config: Optional[dict] = None) -> TTSAudioCache:
+    """获取全局TTS语句缓存，首次调用时按配置创建"""
+    global _tts_cache
+    if _tts_cache is None:
+        with _tts_cache_lock:
+            if _tts_cache is None:
+                _tts_cache = TTSAudioCache.from_config(cache_config)
+    return _tts_cache
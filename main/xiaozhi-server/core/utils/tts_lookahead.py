@@ -0,0 +1,139 @@
+"""
+TTS预合成流水线
+非流式TTS按句切分后，允许多句同时合成，音频仍按句子顺序写入播放队列：
+轮到的句子边合成边写入队列，后续句子先暂存，前一句完成后再整体补发
+"""
+
+import asyncio
+import threading
+import traceback
+from typing import Callable, Dict, List, Set
+from config.logger import setup_logging
+from core.providers.tts.dto.dto import SentenceType
+
+TAG = __name__
+logger = setup_logging()
+
+
+class OrderedAudioSink:
+    """单个任务的音频出口，接口与播放队列的put一致"""
+
+    def __init__(self, synthesizer: "LookaheadSynthesizer", seq: int, generation: int):
+        self._synthesizer = synthesizer
+        self.seq = seq
+        self.generation = generation
+
+    def put(self, item):
+        self._synthesizer._emit(self, item)
+
+    def handle_opus(self, opus_data: bytes):
+        self.put((SentenceType.MIDDLE, opus_data, None))
+
+    @property
+    def stale(self) -> bool:
+        return self._synthesizer.is_stale(self)
+
+
+class LookaheadSynthesizer:
+    """
+    有序预合成调度器，每个TTS连接一个
+
+    submit在TTS线程池中执行任务且不阻塞调用线程，在途任务数上限由
+    事件循环侧的wait_for_capacity控制，避免线程池线程互相等待
+    """
+
+    def __init__(
+        self,
+        audio_queue,
+        pool,
+        max_inflight: int,
+        is_aborted: Callable[[], bool],
+    ):
+        self._audio_queue = audio_queue
+        self._pool = pool
+        self.max_inflight = max(1, max_inflight)
+        self._is_aborted = is_aborted
+        self._loop = asyncio.get_running_loop()
+        self._capacity_event = asyncio.Event()
+
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._submit_seq = 0
+        self._emit_seq = 0
+        self._pending: Dict[int, List[tuple]] = {}
+        self._finished: Set[int] = set()
+        self._inflight = 0
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def submit(self, job: Callable[[OrderedAudioSink], None]):
+        """按调用顺序排号并提交任务，job的全部音频都经由传入的sink输出"""
+        with self._lock:
+            sink = OrderedAudioSink(self, self._submit_seq, self._generation)
+            self._submit_seq += 1
+            self._inflight += 1
+        self._pool.submit(self._run, job, sink)
+
+    def reset(self):
+        """打断时调用，丢弃尚未播放的句子，在途任务的输出随之作废
+
+        作废的任务会尽快取消供应商请求，不再计入在途任务数，新一轮的句子无需等待它们结束
+        """
+        with self._lock:
+            self._generation += 1
+            self._submit_seq = 0
+            self._emit_seq = 0
+            self._pending.clear()
+            self._finished.clear()
+            self._inflight = 0
+        self._loop.call_soon_threadsafe(self._capacity_event.set)
+
+    def is_stale(self, sink: OrderedAudioSink) -> bool:
+        return sink.generation != self._generation or self._is_aborted()
+
+    async def wait_for_capacity(self):
+        """在事件循环中等待，直到在途任务数低于上限"""
+        while True:
+            self._capacity_event.clear()
+            if self._inflight < self.max_inflight:
+                return
+            await self._capacity_event.wait()
+
+    def _run(self, job, sink: OrderedAudioSink):
+        try:
+            # 排队期间已被打断的任务直接跳过，不再请求供应商
+            if not sink.stale:
+                job(sink)
+        except Exception as e:
+            logger.bind(tag=TAG).error(
+                f"TTS预合成任务失败: {e}, 堆栈: {traceback.format_exc()}"
+            )
+        finally:
+            if self._finish(sink):
+                self._loop.call_soon_threadsafe(self._capacity_event.set)
+
+    def _emit(self, sink: OrderedAudioSink, item):
+        with self._lock:
+            if sink.generation != self._generation:
+                return
+            if sink.seq == self._emit_seq:
+                # 在锁内写入，保证与补发的暂存音频不交错
+                self._audio_queue.put(item)
+            else:
+                self._pending.setdefault(sink.seq, []).append(item)
+
+    def _finish(self, sink: OrderedAudioSink) -> bool:
+        """标记任务完成并补发可播放的暂存音频，作废任务返回False"""
+        with self._lock:
+            if sink.generation != self._generation:
+                return False
+            self._inflight -= 1
+            self._finished.add(sink.seq)
+            while self._emit_seq in self._finished:
+                self._finished.discard(self._emit_seq)
+                self._emit_seq += 1
+                for item in self._pending.pop(self._emit_seq, ()):
+                    self._audio_queue.put(item)
+        return True
@@ -0,0 +1,159 @@
+"""
+对话轮次耗时追踪模块
+以 session_id + sentence_id 标识一轮对话，记录从用户说完话到最后一个音频包发出的各阶段耗时，
+并按阶段和供应商汇总到直方图，由 /metrics 接口导出
+
+每个阶段记录两类数据：
+    turn_stage_duration_seconds: 阶段自身耗时（如ASR识别耗时、LLM首字耗时）
+    turn_stage_latency_seconds: 从用户说完话到该阶段完成的累计耗时，每轮每个阶段只记录一次
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+from config.logger import setup_logging
+from core.utils.metrics import TURN_LATENCY_BUCKETS, get_histogram
+
+TAG = __name__
+logger = setup_logging()
+
+# 一轮对话依次经历的阶段
+STAGE_VAD_STOP = "vad_stop"
+STAGE_ASR = "asr"
+STAGE_INTENT = "intent"
+STAGE_MEMORY_QUERY = "memory_query"
+STAGE_LLM_FIRST_TOKEN = "llm_first_token"
+STAGE_FIRST_SENTENCE = "first_sentence"
+STAGE_TTS_FIRST_BYTE = "tts_first_byte"
+STAGE_FIRST_PACKET = "first_packet"
+STAGE_LAST_PACKET = "last_packet"
+
+
+def provider_name(provider) -> str:
+    """以供应商模块名作为标签，如 core.providers.llm.openai.openai -> openai"""
+    if provider is None:
+        return ""
+    if isinstance(provider, str):
+        return provider
+    return type(provider).__module__.rsplit(".", 1)[-1]
+
+
+class TurnTrace:
+    """一轮对话的追踪数据"""
+
+    __slots__ = ("session_id", "sentence_id", "started_at", "stages")
+
+    def __init__(self, session_id: str, started_at: float):
+        self.session_id = session_id
+        self.sentence_id: Optional[str] = None
+        self.started_at = started_at
+        # 阶段 -> 相对轮次开始的完成时间（秒）
+        self.stages: Dict[str, float] = {}
+
+
+class TurnTracer:
+    """全局轮次追踪器，线程安全，可在事件循环和线程池中调用"""
+
+    def __init__(self):
+        self._traces: Dict[str, TurnTrace] = {}
+        self._lock = threading.Lock()
+
+    def start_turn(self, session_id: str, started_at: Optional[float] = None):
+        """开始新一轮，started_at 为 time.monotonic() 时间，默认当前时间"""
+        if not session_id:
+            return
+        trace = TurnTrace(session_id, started_at or time.monotonic())
+        with self._lock:
+            self._traces[session_id] = trace
+
+    def ensure_turn(self, session_id: str):
+        """当前没有未绑定句子的轮次时开始新一轮，用于手动模式等未经VAD判停的入口"""
+        with self._lock:
+            trace = self._traces.get(session_id)
+            if trace is not None and trace.sentence_id is None:
+                return
+        self.start_turn(session_id)
+
+    def bind_sentence(self, session_id: str, sentence_id: str):
+        """将当前轮次绑定到回复的sentence_id
+
+        意图识别后转入聊天会换一个sentence_id，仍属于同一轮；
+        上一轮已开始播放或没有起点（如文本输入）时从此刻开始新一轮
+        """
+        if not session_id or not sentence_id:
+            return
+        with self._lock:
+            trace = self._traces.get(session_id)
+            if trace is None or STAGE_FIRST_PACKET in trace.stages:
+                trace = TurnTrace(session_id, time.monotonic())
+                self._traces[session_id] = trace
+            trace.sentence_id = sentence_id
+
+    def record(
+        self,
+        session_id: str,
+        stage: str,
+        duration: Optional[float] = None,
+        provider=None,
+        sentence_id: Optional[str] = None,
+    ):
+        """记录阶段完成，duration 为阶段自身耗时（秒），sentence_id 不匹配当前轮次时忽略"""
+        now = time.monotonic()
+        labels = {"stage": stage, "provider": provider_name(provider)}
+        if duration is not None:
+            get_histogram(
+                "turn_stage_duration_seconds",
+                "对话各阶段自身耗时",
+                TURN_LATENCY_BUCKETS,
+                labels,
+            ).observe(duration)
+
+        with self._lock:
+            trace = self._traces.get(session_id)
+            if trace is None or stage in trace.stages:
+                return
+            if sentence_id is not None and trace.sentence_id != sentence_id:
+                return
+            elapsed = now - trace.started_at
+            trace.stages[stage] = elapsed
+        get_histogram(
+            "turn_stage_latency_seconds",
+            "从用户说完话到各阶段完成的耗时",
+            TURN_LATENCY_BUCKETS,
+            labels,
+        ).observe(elapsed)
+
+    def has_stage(self, session_id: str, stage: str) -> bool:
+        trace = self._traces.get(session_id)
+        return trace is not None and stage in trace.stages
+
+    def finish_turn(self, session_id: str, sentence_id: Optional[str], provider=None):
+        """记录最后一个音频包发出并结束本轮"""
+        self.record(session_id, STAGE_LAST_PACKET, provider=provider, sentence_id=sentence_id)
+        with self._lock:
+            trace = self._traces.get(session_id)
+            if trace is None or (
+                sentence_id is not None and trace.sentence_id != sentence_id
+            ):
+                return
+            del self._traces[session_id]
+        summary = ", ".join(f"{k}={v:.3f}s" for k, v in trace.stages.items())
+        logger.bind(tag=TAG).debug(f"对话轮次耗时 {session_id}: {summary}")
+
+    def discard(self, session_id: str):
+        """连接关闭时丢弃未完成的轮次"""
+        with self._lock:
+            self._traces.pop(session_id, None)
+
+
+_turn_tracer: Optional[TurnTracer] = None
+_turn_tracer_lock = threading.Lock()
+
+
+def get_turn_tracer() -> TurnTracer:
+    global _turn_tracer
+    if _turn_tracer is None:
+        with _turn_tracer_lock:
+            if _turn_tracer is None:
+                _turn_tracer = TurnTracer()
+    return _turn_tracer
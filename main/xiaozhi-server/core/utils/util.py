@@ -12,6 +12,7 @@ import gc
 from io import BytesIO
 from core.utils import p3
 from pydub import AudioSegment
+from core.utils.audio_decoder import decode_to_pcm
 from typing import Callable, Any
 
 TAG = __name__
@@ -252,10 +253,25 @@ def extract_json_from_string(input_string):
 def audio_to_data_stream(
     audio_file_path, is_opus=True, callback: Callable[[Any], Any] = None
 ) -> None:
+    raw_data = audio_file_to_pcm(audio_file_path)
+    pcm_to_data_stream(raw_data, is_opus, callback)
+
+
+def audio_file_to_pcm(audio_file_path: str) -> bytes:
+    """
+    Read audio file as 16kHz mono 16-bit PCM
+    WAV/PCM files are parsed in-process, compressed formats fall back to ffmpeg
+    """
     # Get file extension
     file_type = os.path.splitext(audio_file_path)[1]
     if file_type:
         file_type = file_type.lstrip(".")
+    if file_type.lower() in ("wav", "pcm"):
+        with open(audio_file_path, "rb") as f:
+            raw_data = decode_to_pcm(f.read(), file_type)
+        if raw_data is not None:
+            return raw_data
+
     # Read audio file, -nostdin parameter: do not read data from standard input, otherwise FFmpeg will block
     audio = AudioSegment.from_file(
         audio_file_path, format=file_type, parameters=["-nostdin"]
@@ -265,8 +281,7 @@ def audio_to_data_stream(
     audio = audio.set_channels(1).set_frame_rate(16000).set_sample_width(2)
 
     # Get raw PCM data (16-bit little-endian)
-    raw_data = audio.raw_data
-    pcm_to_data_stream(raw_data, is_opus, callback)
+    return audio.raw_data
 
 
 def audio_to_data(audio_file_path: str, is_opus: bool = True) -> list[bytes]:
@@ -276,20 +291,7 @@ def audio_to_data(audio_file_path: str, is_opus: bool = True) -> list[bytes]:
         audio_file_path: Audio file path
         is_opus: Whether to perform Opus encoding
     """
-    # Get file extension
-    file_type = os.path.splitext(audio_file_path)[1]
-    if file_type:
-        file_type = file_type.lstrip(".")
-    # Read audio file, -nostdin parameter: do not read data from standard input, otherwise FFmpeg will block
-    audio = AudioSegment.from_file(
-        audio_file_path, format=file_type, parameters=["-nostdin"]
-    )
-
-    # Convert to mono/16kHz sample rate/16-bit little-endian encoding (ensure compatibility with encoder)
-    audio = audio.set_channels(1).set_frame_rate(16000).set_sample_width(2)
-
-    # Get raw PCM data (16-bit little-endian)
-    raw_data = audio.raw_data
+    raw_data = audio_file_to_pcm(audio_file_path)
 
     # Initialize Opus encoder
     encoder = opuslib_next.Encoder(16000, 1, opuslib_next.APPLICATION_AUDIO)
@@ -325,18 +327,21 @@ def audio_bytes_to_data_stream(
     audio_bytes, file_type, is_opus, callback: Callable[[Any], Any]
 ) -> None:
     """
-    Directly convert audio binary data to opus/pcm data, supports wav, mp3, p3
+    Directly convert audio binary data to opus/pcm data, supports wav, pcm, mp3, p3
     """
     if file_type == "p3":
         # Directly decode with p3
         return p3.decode_opus_from_bytes_stream(audio_bytes, callback)
     else:
-        # Other formats use pydub
-        audio = AudioSegment.from_file(
-            BytesIO(audio_bytes), format=file_type, parameters=["-nostdin"]
-        )
-        audio = audio.set_channels(1).set_frame_rate(16000).set_sample_width(2)
-        raw_data = audio.raw_data
+        # WAV/PCM are decoded in-process, no ffmpeg subprocess per sentence
+        raw_data = decode_to_pcm(audio_bytes, file_type)
+        if raw_data is None:
+            # Compressed formats use pydub
+            audio = AudioSegment.from_file(
+                BytesIO(audio_bytes), format=file_type, parameters=["-nostdin"]
+            )
+            audio = audio.set_channels(1).set_frame_rate(16000).set_sample_width(2)
+            raw_data = audio.raw_data
         pcm_to_data_stream(raw_data, is_opus, callback)
 
 
@@ -0,0 +1,123 @@
+"""
+视觉分析服务模块
+按解析后的配置缓存VLLM客户端，设备的私有配置按TTL缓存，
+图片预处理与模型调用在有界的vision线程池中执行并设置超时，不阻塞事件循环
+"""
+
+import json
+import base64
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+from config.logger import setup_logging
+from config.config_loader import get_private_config_from_api
+from core.utils.cache.manager import cache_manager
+from core.utils.cache.config import CacheType
+from core.utils.image_preprocess import ImagePreprocessor
+from core.utils.vllm import create_instance
+from core.utils.worker_pool import get_worker_scheduler
+
+TAG = __name__
+logger = setup_logging()
+
+
+def select_vllm_module(config: dict) -> Tuple[str, dict]:
+    """从配置中取出所选VLLM的供应器类型及其配置"""
+    select_vllm_module = config["selected_module"].get("VLLM")
+    if not select_vllm_module:
+        raise ValueError("您还未设置默认的视觉分析模块")
+
+    module_config = config["VLLM"][select_vllm_module]
+    vllm_type = module_config.get("type", select_vllm_module)
+    if not vllm_type:
+        raise ValueError(f"无法找到VLLM模块对应的供应器{vllm_type}")
+    return vllm_type, module_config
+
+
+class VisionService:
+    """视觉分析服务，所有请求共享客户端缓存与线程池"""
+
+    def __init__(self, config: dict):
+        vision_config = config.get("vision") or {}
+        self.timeout = float(vision_config.get("timeout", 30))
+        self.max_clients = int(vision_config.get("max_clients", 32))
+        self.config_ttl = float(vision_config.get("config_ttl", 60))
+        self.preprocessor = ImagePreprocessor(vision_config.get("preprocess"))
+        self._clients: "OrderedDict[str, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def resolve_module(
+        self, config: dict, device_id: str, client_id: str
+    ) -> Tuple[str, dict]:
+        """解析设备使用的VLLM配置，开启智控台时缓存从接口获取的结果"""
+        if not config.get("read_config_from_api", False):
+            return select_vllm_module(config)
+
+        cache_key = f"{device_id}:{client_id}"
+        resolved = cache_manager.get(CacheType.VISION_CONFIG, cache_key)
+        if resolved is None:
+            private_config = await get_private_config_from_api(
+                config, device_id, client_id
+            )
+            resolved = select_vllm_module(private_config)
+            cache_manager.set(
+                CacheType.VISION_CONFIG, cache_key, resolved, ttl=self.config_ttl
+            )
+        return resolved
+
+    def get_client(self, vllm_type: str, module_config: dict):
+        """获取缓存的VLLM客户端，配置相同的请求复用同一个客户端"""
+        key = f"{vllm_type}:{json.dumps(module_config, sort_keys=True, default=str)}"
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                return client
+
+        client = create_instance(vllm_type, module_config)
+        with self._lock:
+            # 并发创建时保留先放入的客户端
+            client = self._clients.setdefault(key, client)
+            self._clients.move_to_end(key)
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        return client
+
+    async def analyze(
+        self,
+        config: dict,
+        device_id: str,
+        client_id: str,
+        question: str,
+        image_data: bytes,
+    ) -> str:
+        """在vision线程池中预处理图片并调用视觉模型，超时抛出 asyncio.TimeoutError"""
+        vllm_type, module_config = await self.resolve_module(
+            config, device_id, client_id
+        )
+
+        def run():
+            image = self.preprocessor.process(image_data)
+            image_base64 = base64.b64encode(image).decode("utf-8")
+            vllm = self.get_client(vllm_type, module_config)
+            return vllm.response(question, image_base64)
+
+        pool = get_worker_scheduler().get_pool("vision")
+        return await asyncio.wait_for(pool.run(run), timeout=self.timeout)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {"clients": len(self._clients), "max_clients": self.max_clients}
+
+
+# 全局单例
+_vision_service_instance: Optional[VisionService] = None
+
+
+def get_vision_service(config: Optional[dict] = None) -> VisionService:
+    """获取全局视觉分析服务，config 仅在首次创建时生效"""
+    global _vision_service_instance
+    if _vision_service_instance is None:
+        _vision_service_instance = VisionService(config or {})
+    return _vision_service_instance
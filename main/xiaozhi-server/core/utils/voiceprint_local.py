@@ -0,0 +1,236 @@
+"""
+Local voiceprint recognition
+
+Speaker embeddings are computed on CPU with a sherpa-onnx speaker embedding
+model (ONNX). Enrolled speakers are kept as one L2-normalized numpy matrix, so
+an utterance is scored against every speaker by cosine similarity in a single
+matrix multiply without uploading audio anywhere.
+"""
+
+import io
+import os
+import json
+import time
+import wave
+import hashlib
+import threading
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from config.logger import setup_logging
+from core.utils.cache.manager import cache_manager
+from core.utils.cache.config import CacheType
+from core.utils.worker_pool import get_worker_scheduler
+
+TAG = __name__
+logger = setup_logging()
+
+# Embedding extractors shared by all connections, keyed by model path
+_extractors: Dict[str, object] = {}
+_extractors_lock = threading.Lock()
+
+
+def get_embedding_extractor(model_path: str, num_threads: int = 1):
+    """Get the process-wide speaker embedding extractor for a model"""
+    with _extractors_lock:
+        extractor = _extractors.get(model_path)
+        if extractor is None:
+            import sherpa_onnx
+
+            extractor_config = sherpa_onnx.SpeakerEmbeddingExtractorConfig(
+                model=model_path,
+                num_threads=num_threads,
+                provider="cpu",
+            )
+            if not extractor_config.validate():
+                raise ValueError(f"Invalid speaker embedding model: {model_path}")
+            extractor = sherpa_onnx.SpeakerEmbeddingExtractor(extractor_config)
+            _extractors[model_path] = extractor
+            logger.bind(tag=TAG).info(
+                f"Speaker embedding model loaded: {model_path}, dim={extractor.dim}"
+            )
+        return extractor
+
+
+def read_wav_samples(wav_file) -> Tuple[np.ndarray, int]:
+    """Read a 16-bit PCM WAV file or file object as mono float32 samples"""
+    with wave.open(wav_file, "rb") as f:
+        if f.getsampwidth() != 2:
+            raise ValueError("Only 16-bit PCM WAV is supported")
+        channels = f.getnchannels()
+        sample_rate = f.getframerate()
+        samples = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+    samples = samples.astype(np.float32) / 32768.0
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, sample_rate
+
+
+def compute_embedding(extractor, samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Compute an L2-normalized speaker embedding"""
+    stream = extractor.create_stream()
+    stream.accept_waveform(sample_rate, samples)
+    stream.input_finished()
+    embedding = np.asarray(extractor.compute(stream), dtype=np.float32)
+    return embedding / max(float(np.linalg.norm(embedding)), 1e-12)
+
+
+class LocalVoiceprintProvider:
+    """Voiceprint recognition provider backed by a local embedding model"""
+
+    def __init__(self, config: dict):
+        self.speakers = config.get("speakers", [])
+        self.similarity_threshold = float(config.get("similarity_threshold", 0.4))
+        self.model_path = config.get("model_path", "")
+        self.enroll_dir = config.get("enroll_dir", "")
+        self.num_threads = int(config.get("num_threads", 1))
+        # Embeddings of very short clips are unreliable, skip them
+        self.min_audio_seconds = float(config.get("min_audio_seconds", 0.5))
+
+        self.speaker_names: List[str] = []
+        self.embeddings: Optional[np.ndarray] = None
+        self.enabled = False
+
+        if not self.model_path or not os.path.exists(self.model_path):
+            logger.bind(tag=TAG).warning(
+                f"Speaker embedding model not found: {self.model_path}, voiceprint recognition will be disabled"
+            )
+            return
+        if not self.enroll_dir or not os.path.isdir(self.enroll_dir):
+            logger.bind(tag=TAG).warning(
+                f"Voiceprint enrollment directory not found: {self.enroll_dir}, voiceprint recognition will be disabled"
+            )
+            return
+
+        self.extractor = get_embedding_extractor(self.model_path, self.num_threads)
+        self._load_enrollment_cached()
+        if self.embeddings is None:
+            logger.bind(tag=TAG).warning("No enrolled speakers found, voiceprint recognition will be disabled")
+            return
+
+        self.enabled = True
+        logger.bind(tag=TAG).info(
+            f"Local voiceprint recognition enabled: Model={self.model_path}, "
+            f"Speakers={len(self.speaker_names)}, Similarity threshold={self.similarity_threshold}"
+        )
+
+    def _load_enrollment_cached(self):
+        """Reuse the enrollment matrix built by earlier connections with the same speakers and files"""
+        key = self._enrollment_key()
+        cached = cache_manager.get(CacheType.VOICEPRINT_ENROLLMENT, key)
+        if cached is None:
+            self._load_enrollment()
+            cached = (list(self.speaker_names), self.embeddings)
+            cache_manager.set(CacheType.VOICEPRINT_ENROLLMENT, key, cached)
+        # The matrix is only read, connections share the same array
+        self.speaker_names, self.embeddings = list(cached[0]), cached[1]
+
+    def _enrollment_key(self) -> str:
+        """Key over the model, speaker list and modification times of every enrollment file"""
+        files = []
+        for speaker_str in self.speakers:
+            speaker_id = speaker_str.split(",", 2)[0].strip()
+            if speaker_id:
+                files.extend(
+                    (path, os.path.getmtime(path))
+                    for path in self._enrollment_files(speaker_id)
+                )
+        signature = json.dumps(
+            [self.model_path, os.path.abspath(self.enroll_dir), self.speakers, files]
+        )
+        return hashlib.sha1(signature.encode("utf-8")).hexdigest()
+
+    def _load_enrollment(self):
+        """Stack enrolled speaker embeddings into one matrix, one row per speaker"""
+        rows = []
+        for speaker_str in self.speakers:
+            parts = speaker_str.split(",", 2)
+            speaker_id = parts[0].strip()
+            name = parts[1].strip() if len(parts) >= 2 else speaker_id
+            if not speaker_id:
+                continue
+            try:
+                embedding = self._enrollment_embedding(speaker_id)
+            except Exception as e:
+                logger.bind(tag=TAG).warning(f"Failed to enroll speaker {speaker_id}: {e}")
+                continue
+            if embedding is None:
+                logger.bind(tag=TAG).warning(f"No enrollment audio for speaker: {speaker_id}")
+                continue
+            rows.append(embedding)
+            self.speaker_names.append(name)
+        if rows:
+            self.embeddings = np.vstack(rows).astype(np.float32)
+
+    def _enrollment_files(self, speaker_id: str) -> List[str]:
+        """Enrollment files of a speaker: {id}.npy, {id}.wav or every WAV in {id}/"""
+        base_path = os.path.join(self.enroll_dir, speaker_id)
+        if os.path.isfile(base_path + ".npy"):
+            return [base_path + ".npy"]
+        if os.path.isfile(base_path + ".wav"):
+            return [base_path + ".wav"]
+        if os.path.isdir(base_path):
+            return [
+                os.path.join(base_path, file_name)
+                for file_name in sorted(os.listdir(base_path))
+                if file_name.lower().endswith(".wav")
+            ]
+        return []
+
+    def _enrollment_embedding(self, speaker_id: str) -> Optional[np.ndarray]:
+        """Embedding of a speaker from {id}.npy, {id}.wav or every WAV in {id}/"""
+        files = self._enrollment_files(speaker_id)
+        if files and files[0].endswith(".npy"):
+            embedding = np.load(files[0]).astype(np.float32).reshape(-1)
+            return embedding / max(float(np.linalg.norm(embedding)), 1e-12)
+        if not files:
+            return None
+
+        embedding = np.mean([self._wav_embedding(path) for path in files], axis=0)
+        return embedding / max(float(np.linalg.norm(embedding)), 1e-12)
+
+    def _wav_embedding(self, wav_path: str) -> np.ndarray:
+        # Key includes the modification time, re-recorded enrollment audio is picked up automatically
+        key = f"{self.model_path}:{os.path.abspath(wav_path)}:{os.path.getmtime(wav_path)}"
+        embedding = cache_manager.get(CacheType.VOICEPRINT_EMBEDDING, key)
+        if embedding is None:
+            samples, sample_rate = read_wav_samples(wav_path)
+            embedding = compute_embedding(self.extractor, samples, sample_rate)
+            cache_manager.set(CacheType.VOICEPRINT_EMBEDDING, key, embedding)
+        return embedding
+
+    async def check_health(self) -> bool:
+        """Local recognition has no server to probe"""
+        return self.enabled
+
+    async def identify_speaker(self, audio_data: bytes, session_id: str) -> Optional[str]:
+        """Identify speaker"""
+        if not self.enabled:
+            logger.bind(tag=TAG).debug("Voiceprint recognition feature disabled or not configured, skipping identification")
+            return None
+        try:
+            pool = get_worker_scheduler().get_pool("voiceprint")
+            return await pool.run(self._identify, audio_data)
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"Voiceprint recognition failed: {e}")
+            return None
+
+    def _identify(self, audio_data: bytes) -> Optional[str]:
+        start_time = time.monotonic()
+        samples, sample_rate = read_wav_samples(io.BytesIO(audio_data))
+        if len(samples) < self.min_audio_seconds * sample_rate:
+            logger.bind(tag=TAG).debug("Audio too short for voiceprint recognition, skipping")
+            return None
+
+        embedding = compute_embedding(self.extractor, samples, sample_rate)
+        # Rows and embedding are normalized, the dot product is the cosine similarity
+        scores = self.embeddings @ embedding
+        best = int(np.argmax(scores))
+        score = float(scores[best])
+        logger.bind(tag=TAG).info(f"Voiceprint recognition took: {time.monotonic() - start_time:.3f}s")
+
+        if score < self.similarity_threshold:
+            logger.bind(tag=TAG).warning(f"Voiceprint recognition similarity {score:.3f} below threshold {self.similarity_threshold}")
+            return "Unknown speaker"
+        result_name = self.speaker_names[best]
+        logger.bind(tag=TAG).info(f"Voiceprint recognition successful: {result_name} (similarity: {score:.3f})")
+        return result_name
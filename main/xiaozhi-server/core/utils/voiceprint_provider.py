@@ -1,7 +1,6 @@
 import asyncio
 import time
 import aiohttp
-import requests
 from urllib.parse import urlparse, parse_qs
 from typing import Optional, Dict
 from config.logger import setup_logging
@@ -21,6 +20,8 @@ class VoiceprintProvider:
         self.speaker_map = self._parse_speakers()
         # Voiceprint recognition similarity threshold, default 0.4
         self.similarity_threshold = float(config.get("similarity_threshold", 0.4))
+        # Shared HTTP client, connections are kept alive across utterances and connections
+        self.client = get_voiceprint_client(config)
         
         # Parse API address and key
         self.api_url = None
@@ -60,14 +61,13 @@ class VoiceprintProvider:
                 if not self.speaker_ids:
                     logger.bind(tag=TAG).warning("No valid speakers configured, voiceprint recognition will be disabled")
                     self.enabled = False
+                elif self.get_cached_health() is False:
+                    self.enabled = False
+                    logger.bind(tag=TAG).warning(f"Voiceprint recognition server unavailable, voiceprint recognition disabled: {self.api_url}")
                 else:
-                    # Perform health check to verify server availability
-                    if self._check_server_health():
-                        self.enabled = True
-                        logger.bind(tag=TAG).info(f"Voiceprint recognition enabled: API={self.api_url}, Speakers={len(self.speaker_ids)}, Similarity threshold={self.similarity_threshold}")
-                    else:
-                        self.enabled = False
-                        logger.bind(tag=TAG).warning(f"Voiceprint recognition server unavailable, voiceprint recognition disabled: {self.api_url}")
+                    # Server availability is verified by check_health without blocking connection setup
+                    self.enabled = True
+                    logger.bind(tag=TAG).info(f"Voiceprint recognition enabled: API={self.api_url}, Speakers={len(self.speaker_ids)}, Similarity threshold={self.similarity_threshold}")
     
     def _parse_speakers(self) -> Dict[str, Dict[str, str]]:
         """Parse speaker configuration"""
@@ -85,67 +85,39 @@ class VoiceprintProvider:
                 logger.bind(tag=TAG).warning(f"Failed to parse speaker configuration: {speaker_str}, error: {e}")
         return speaker_map
     
-    def _check_server_health(self) -> bool:
+    @property
+    def health_cache_key(self) -> str:
+        return f"{self.api_url}:{self.api_key}"
+
+    def get_cached_health(self) -> Optional[bool]:
+        """Cached health status, None when no probe result is available"""
+        return cache_manager.get(CacheType.VOICEPRINT_HEALTH, self.health_cache_key)
+
+    async def check_health(self) -> bool:
         """Check voiceprint recognition server health status"""
         if not self.api_url or not self.api_key:
             return False
-    
-        cache_key = f"{self.api_url}:{self.api_key}"
-        
-        # Check cache
-        cached_result = cache_manager.get(CacheType.VOICEPRINT_HEALTH, cache_key)
+
+        cached_result = self.get_cached_health()
         if cached_result is not None:
             logger.bind(tag=TAG).debug(f"Using cached health status: {cached_result}")
             return cached_result
-        
-        # Cache expired or doesn't exist
-        logger.bind(tag=TAG).info("Executing voiceprint server health check")
-        
-        try:
-            # Health check URL
-            parsed_url = urlparse(self.api_url)
-            health_url = f"{parsed_url.scheme}://{parsed_url.netloc}/voiceprint/health?key={self.api_key}"
-            
-            # Send health check request
-            response = requests.get(health_url, timeout=3)
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result.get("status") == "healthy":
-                    logger.bind(tag=TAG).info("Voiceprint recognition server health check passed")
-                    is_healthy = True
-                else:
-                    logger.bind(tag=TAG).warning(f"Voiceprint recognition server status abnormal: {result}")
-                    is_healthy = False
-            else:
-                logger.bind(tag=TAG).warning(f"Voiceprint recognition server health check failed: HTTP {response.status_code}")
-                is_healthy = False
-                
-        except requests.exceptions.ConnectTimeout:
-            logger.bind(tag=TAG).warning("Voiceprint recognition server connection timeout")
-            is_healthy = False
-        except requests.exceptions.ConnectionError:
-            logger.bind(tag=TAG).warning("Voiceprint recognition server connection refused")
-            is_healthy = False
-        except Exception as e:
-            logger.bind(tag=TAG).warning(f"Voiceprint recognition server health check exception: {e}")
-            is_healthy = False
-        
-        # Cache result using global cache manager
-        cache_manager.set(CacheType.VOICEPRINT_HEALTH, cache_key, is_healthy)
-        logger.bind(tag=TAG).info(f"Health check result cached: {is_healthy}")
-        
-        return is_healthy
-    
+
+        return await self.client.probe_health(
+            self.api_url, self.api_key
+        )
+
     async def identify_speaker(self, audio_data: bytes, session_id: str) -> Optional[str]:
         """Identify speaker"""
         if not self.enabled or not self.api_url or not self.api_key:
             logger.bind(tag=TAG).debug("Voiceprint recognition feature disabled or not configured, skipping identification")
             return None
-            
+        if not await self.check_health():
+            logger.bind(tag=TAG).debug("Voiceprint recognition server unavailable, skipping identification")
+            return None
+
+        api_start_time = time.monotonic()
         try:
-            api_start_time = time.monotonic()
-            
             # Prepare request headers
             headers = {
                 'Authorization': f'Bearer {self.api_key}',
@@ -157,36 +129,34 @@ class VoiceprintProvider:
             data.add_field('speaker_ids', ','.join(self.speaker_ids))
             data.add_field('file', audio_data, filename='audio.wav', content_type='audio/wav')
             
-            timeout = aiohttp.ClientTimeout(total=10)
-            
-            # Network request
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(self.api_url, headers=headers, data=data) as response:
+            # Network request over the shared keep-alive session
+            session = self.client.get_session()
+            async with session.post(self.api_url, headers=headers, data=data) as response:
+                
+                if response.status == 200:
+                    result = await response.json()
+                    speaker_id = result.get("speaker_id")
+                    score = result.get("score", 0)
+                    total_elapsed_time = time.monotonic() - api_start_time
+                    
+                    logger.bind(tag=TAG).info(f"Voiceprint recognition took: {total_elapsed_time:.3f}s")
+                    
+                    # Similarity threshold check
+                    if score < self.similarity_threshold:
+                        logger.bind(tag=TAG).warning(f"Voiceprint recognition similarity {score:.3f} below threshold {self.similarity_threshold}")
+                        return "Unknown speaker"
                     
-                    if response.status == 200:
-                        result = await response.json()
-                        speaker_id = result.get("speaker_id")
-                        score = result.get("score", 0)
-                        total_elapsed_time = time.monotonic() - api_start_time
-                        
-                        logger.bind(tag=TAG).info(f"Voiceprint recognition took: {total_elapsed_time:.3f}s")
-                        
-                        # Similarity threshold check
-                        if score < self.similarity_threshold:
-                            logger.bind(tag=TAG).warning(f"Voiceprint recognition similarity {score:.3f} below threshold {self.similarity_threshold}")
-                            return "Unknown speaker"
-                        
-                        if speaker_id and speaker_id in self.speaker_map:
-                            result_name = self.speaker_map[speaker_id]["name"]
-                            logger.bind(tag=TAG).info(f"Voiceprint recognition successful: {result_name} (similarity: {score:.3f})")
-                            return result_name
-                        else:
-                            logger.bind(tag=TAG).warning(f"Unrecognized speaker ID: {speaker_id}")
-                            return "Unknown speaker"
+                    if speaker_id and speaker_id in self.speaker_map:
+                        result_name = self.speaker_map[speaker_id]["name"]
+                        logger.bind(tag=TAG).info(f"Voiceprint recognition successful: {result_name} (similarity: {score:.3f})")
+                        return result_name
                     else:
-                        logger.bind(tag=TAG).error(f"Voiceprint recognition API error: HTTP {response.status}")
-                        return None
-                        
+                        logger.bind(tag=TAG).warning(f"Unrecognized speaker ID: {speaker_id}")
+                        return "Unknown speaker"
+                else:
+                    logger.bind(tag=TAG).error(f"Voiceprint recognition API error: HTTP {response.status}")
+                    return None
+                    
         except asyncio.TimeoutError:
             elapsed = time.monotonic() - api_start_time
             logger.bind(tag=TAG).error(f"Voiceprint recognition timeout: {elapsed:.3f}s")
@@ -196,3 +166,117 @@ class VoiceprintProvider:
             logger.bind(tag=TAG).error(f"Voiceprint recognition failed: {e}")
             return None
 
+
+class VoiceprintClient:
+    """Process-wide HTTP client shared by all voiceprint providers
+
+    Requests reuse one aiohttp session whose connector keeps connections to the
+    voiceprint server alive, and concurrent health probes for the same server
+    share a single request.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 32,
+        keepalive_timeout: float = 30,
+        request_timeout: float = 10,
+        health_timeout: float = 3,
+    ):
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.request_timeout = request_timeout
+        self.health_timeout = health_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._probes: Dict[str, asyncio.Task] = {}
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Shared session, created on first use; all callers run on the main event loop"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            )
+        return self._session
+
+    async def probe_health(self, api_url: str, api_key: str) -> bool:
+        """Probe server health and cache the result, concurrent callers share one probe"""
+        cache_key = f"{api_url}:{api_key}"
+        task = self._probes.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._probe_health(api_url, api_key))
+            self._probes[cache_key] = task
+            task.add_done_callback(lambda _: self._probes.pop(cache_key, None))
+        return await asyncio.shield(task)
+
+    async def _probe_health(self, api_url: str, api_key: str) -> bool:
+        logger.bind(tag=TAG).info("Executing voiceprint server health check")
+        parsed_url = urlparse(api_url)
+        health_url = f"{parsed_url.scheme}://{parsed_url.netloc}/voiceprint/health"
+        try:
+            session = self.get_session()
+            async with session.get(
+                health_url,
+                params={"key": api_key},
+                timeout=aiohttp.ClientTimeout(total=self.health_timeout),
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    if result.get("status") == "healthy":
+                        logger.bind(tag=TAG).info("Voiceprint recognition server health check passed")
+                        is_healthy = True
+                    else:
+                        logger.bind(tag=TAG).warning(f"Voiceprint recognition server status abnormal: {result}")
+                        is_healthy = False
+                else:
+                    logger.bind(tag=TAG).warning(f"Voiceprint recognition server health check failed: HTTP {response.status}")
+                    is_healthy = False
+        except asyncio.TimeoutError:
+            logger.bind(tag=TAG).warning("Voiceprint recognition server connection timeout")
+            is_healthy = False
+        except aiohttp.ClientConnectionError:
+            logger.bind(tag=TAG).warning("Voiceprint recognition server connection refused")
+            is_healthy = False
+        except Exception as e:
+            logger.bind(tag=TAG).warning(f"Voiceprint recognition server health check exception: {e}")
+            is_healthy = False
+
+        # Cache result using global cache manager
+        cache_manager.set(CacheType.VOICEPRINT_HEALTH, f"{api_url}:{api_key}", is_healthy)
+        logger.bind(tag=TAG).info(f"Health check result cached: {is_healthy}")
+        return is_healthy
+
+    async def close(self):
+        """Close the shared session and its pooled connections"""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+
+# Global singleton
+_voiceprint_client: Optional[VoiceprintClient] = None
+
+
+def get_voiceprint_client(config: Optional[dict] = None) -> VoiceprintClient:
+    """Get the process-wide voiceprint client, config only applies on first creation"""
+    global _voiceprint_client
+    if _voiceprint_client is None:
+        config = config or {}
+        _voiceprint_client = VoiceprintClient(
+            max_connections=int(config.get("max_connections", 32)),
+            keepalive_timeout=float(config.get("keepalive_timeout", 30)),
+            request_timeout=float(config.get("timeout", 10)),
+        )
+    return _voiceprint_client
+
+
+def create_voiceprint_provider(config: dict):
+    """Create the voiceprint provider selected by type, the remote service by default"""
+    if config.get("type", "remote") == "local":
+        from core.utils.voiceprint_local import LocalVoiceprintProvider
+
+        return LocalVoiceprintProvider(config)
+    return VoiceprintProvider(config)
@@ -0,0 +1,151 @@
+"""
+全局工作线程池模块
+所有连接共享按用途划分的有界线程池（LLM、ASR、TTS、上报），
+替代每个连接各自创建的线程池与轮询线程，并统计各池的排队深度和等待耗时
+"""
+
+import time
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+# 各线程池默认最大线程数，可通过配置文件 worker_pools 覆盖
+DEFAULT_POOL_SIZES = {
+    "llm": 64,
+    "asr": 32,
+    "tts": 64,
+    "report": 8,
+    "vision": 8,
+    "voiceprint": 8,
+}
+
+
+class WorkerPool:
+    """带排队统计的命名线程池"""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"{name}-worker"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """提交任务，接口与ThreadPoolExecutor.submit一致"""
+        enqueue_time = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+            self._submitted += 1
+        try:
+            return self._executor.submit(self._run, enqueue_time, fn, args, kwargs)
+        except Exception:
+            with self._lock:
+                self._queued -= 1
+                self._submitted -= 1
+            raise
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """在线程池中执行阻塞函数并等待结果，不阻塞事件循环"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def _run(self, enqueue_time, fn, args, kwargs):
+        start_time = time.perf_counter()
+        wait_time = start_time - enqueue_time
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._wait_total += wait_time
+            if wait_time > self._wait_max:
+                self._wait_max = wait_time
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            run_time = time.perf_counter() - start_time
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+                self._run_total += run_time
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            started = self._completed + self._active
+            return {
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "queue_depth": self._queued,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "wait_avg_ms": self._wait_total * 1000 / started if started else 0.0,
+                "wait_max_ms": self._wait_max * 1000,
+                "run_avg_ms": (
+                    self._run_total * 1000 / self._completed if self._completed else 0.0
+                ),
+            }
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait)
+
+
+class WorkerScheduler:
+    """全局调度器，按名称管理共享线程池"""
+
+    def __init__(self, pool_sizes: Optional[Dict[str, int]] = None):
+        sizes = dict(DEFAULT_POOL_SIZES)
+        for name, size in (pool_sizes or {}).items():
+            if size:
+                sizes[name] = int(size)
+        self._pools = {name: WorkerPool(name, size) for name, size in sizes.items()}
+        logger.bind(tag=TAG).info(f"初始化全局工作线程池: {sizes}")
+
+    def get_pool(self, name: str) -> WorkerPool:
+        return self._pools[name]
+
+    def get_stats(self) -> Dict[str, dict]:
+        """各线程池的排队深度、活跃线程数和等待耗时"""
+        return {name: pool.get_stats() for name, pool in self._pools.items()}
+
+    def shutdown(self, wait: bool = False):
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait)
+
+
+# 全局单例
+_worker_scheduler_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_worker_scheduler(pool_sizes: Optional[Dict[str, int]] = None) -> WorkerScheduler:
+    """
+    获取全局工作线程池调度器（单例模式）
+
+    Args:
+        pool_sizes: 各线程池最大线程数，仅在首次创建时生效
+
+    Returns:
+        WorkerScheduler实例
+    """
+    global _worker_scheduler_instance
+    if _worker_scheduler_instance is None:
+        with _instance_lock:
+            if _worker_scheduler_instance is None:
+                _worker_scheduler_instance = WorkerScheduler(pool_sizes)
+    return _worker_scheduler_instance
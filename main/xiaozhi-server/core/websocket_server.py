@@ -35,6 +35,7 @@ from config.config_loader import get_config_from_api_async
 from core.auth import AuthManager, AuthenticationError
 from core.utils.modules_initialize import initialize_modules
 from core.utils.util import check_vad_update, check_asr_update
+from core.supervisor import get_worker_channel
 
 TAG = __name__
 
@@ -67,6 +68,8 @@ class WebSocketServer:
         secret_key = self.config["server"]["auth_key"]
         expire_seconds = auth_config.get("expire_seconds", None)
         self.auth = AuthManager(secret_key=secret_key, expire_seconds=expire_seconds)
+        # Live connection handlers, read by the metrics endpoints
+        self.active_connections = set()
 
     async def start(self):
         server_config = self.config["server"]
@@ -74,7 +77,12 @@ class WebSocketServer:
         port = int(server_config.get("port", 8000))
 
         async with websockets.serve(
-            self._handle_connection, host, port, process_request=self._http_response
+            self._handle_connection,
+            host,
+            port,
+            process_request=self._http_response,
+            # Worker processes share the port, the kernel balances connections
+            reuse_port=get_worker_channel() is not None,
         ):
             await asyncio.Future()
 
@@ -123,11 +131,13 @@ class WebSocketServer:
             self._intent,
             self,  # Pass server instance
         )
+        self.active_connections.add(handler)
         try:
             await handler.handle_connection(websocket)
         except Exception as e:
             self.logger.bind(tag=TAG).error(f"Error handling connection: {e}")
         finally:
+            self.active_connections.discard(handler)
             # Force close connection (if not already closed)
             try:
                 # Safely check WebSocket state and close
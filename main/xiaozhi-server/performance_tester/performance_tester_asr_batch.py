@@ -0,0 +1,177 @@
+import os
+import time
+import wave
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from tabulate import tabulate
+from config.settings import load_config
+from core.utils.asr import create_instance as create_stt_instance
+from core.utils.asr_batcher import ASRBatcher
+from core.utils.metrics import Histogram
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "本地ASR微批调度吞吐与延迟测试(逐条generate vs 微批generate)"
+
+CONCURRENCY_LEVELS = [1, 4, 8, 16]
+# 每路设备连续识别的语句数
+UTTERANCES_PER_STREAM = 4
+BATCH_WINDOW_MS = 10
+MAX_BATCH_SIZE = 8
+MAX_BATCH_AUDIO_SECONDS = 60
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+
+
+def load_wav_as_pcm(file_path: str) -> bytes:
+    """读取wav并转换为16kHz单声道16bit PCM"""
+    with wave.open(file_path) as f:
+        channels = f.getnchannels()
+        sample_rate = f.getframerate()
+        samples = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if sample_rate != 16000:
+        target_length = int(len(samples) * 16000 / sample_rate)
+        samples = np.interp(
+            np.linspace(0, len(samples) - 1, target_length),
+            np.arange(len(samples)),
+            samples,
+        )
+    return samples.astype(np.int16).tobytes()
+
+
+class ASRBatchTester:
+    def __init__(self):
+        self.config = load_config()
+        self.asr_name, self.asr_config = self._find_fun_local()
+        self.pcm_list = self._load_test_audio()
+        self.results = []
+
+    def _find_fun_local(self):
+        for name, asr_config in self.config.get("ASR", {}).items():
+            if asr_config.get("type", name) == "fun_local":
+                return name, dict(asr_config)
+        raise RuntimeError("配置中未找到type为fun_local的ASR")
+
+    def _load_test_audio(self) -> list:
+        wav_root = os.path.join(os.getcwd(), "config", "assets")
+        pcm_list = [
+            load_wav_as_pcm(os.path.join(wav_root, file_name))
+            for file_name in sorted(os.listdir(wav_root))
+            if file_name.endswith(".wav")
+        ]
+        if not pcm_list:
+            raise RuntimeError(f"未找到测试音频: {wav_root}")
+        return pcm_list
+
+    def _run_level(self, mode: str, streams: int, recognize) -> dict:
+        histogram = Histogram(mode, buckets=LATENCY_BUCKETS)
+        audio_bytes = 0
+        lock = threading.Lock()
+
+        def device(index: int):
+            nonlocal audio_bytes
+            for n in range(UTTERANCES_PER_STREAM):
+                pcm = self.pcm_list[(index + n) % len(self.pcm_list)]
+                start_time = time.perf_counter()
+                recognize(pcm)
+                histogram.observe(time.perf_counter() - start_time)
+                with lock:
+                    audio_bytes += len(pcm)
+
+        wall_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=streams) as executor:
+            list(executor.map(device, range(streams)))
+        wall_time = time.perf_counter() - wall_start
+
+        snapshot = histogram.snapshot()
+        audio_seconds = audio_bytes / 32000
+        return {
+            "streams": streams,
+            "mode": mode,
+            "count": snapshot["count"],
+            "throughput": snapshot["count"] / wall_time,
+            "rtf": wall_time / audio_seconds,
+            "avg": snapshot["sum"] / snapshot["count"],
+            "p50": snapshot["p50"],
+            "p95": snapshot["p95"],
+        }
+
+    def _print_results(self):
+        headers = [
+            "并发设备数",
+            "模式",
+            "识别条数",
+            "吞吐(条/秒)",
+            "实时率",
+            "平均延迟(s)",
+            "P50(s)",
+            "P95(s)",
+        ]
+        table_data = [
+            [
+                r["streams"],
+                r["mode"],
+                r["count"],
+                f"{r['throughput']:.2f}",
+                f"{r['rtf']:.3f}",
+                f"{r['avg']:.3f}",
+                f"{r['p50']:.3f}",
+                f"{r['p95']:.3f}",
+            ]
+            for r in self.results
+        ]
+        print("\n" + "=" * 50)
+        print(f"本地ASR微批调度测试结果 ({self.asr_name})")
+        print("=" * 50)
+        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+        print("\n测试说明:")
+        print(
+            f"- 每路设备连续识别 {UTTERANCES_PER_STREAM} 句，"
+            f"音频取自 config/assets 下的wav文件"
+        )
+        print("- 逐条识别：各线程各自调用一次generate，即关闭微批时的行为")
+        print(
+            f"- 微批识别：窗口 {BATCH_WINDOW_MS}ms，最多 {MAX_BATCH_SIZE} 条、"
+            f"{MAX_BATCH_AUDIO_SECONDS} 秒音频合并为一次generate"
+        )
+        print("- 实时率：总耗时 / 总音频时长，越小越好")
+
+    def run(self):
+        self.asr_config["batch_window_ms"] = 0
+        stt = create_stt_instance("fun_local", self.asr_config, delete_audio_file=True)
+        # 预热，排除首次推理的初始化耗时
+        stt.recognize_batch(self.pcm_list[:1])
+
+        batcher = ASRBatcher(
+            stt.recognize_batch,
+            batch_window_ms=BATCH_WINDOW_MS,
+            max_batch_size=MAX_BATCH_SIZE,
+            max_batch_audio_seconds=MAX_BATCH_AUDIO_SECONDS,
+        )
+        for streams in CONCURRENCY_LEVELS:
+            print(f"测试并发 {streams} 路...")
+            self.results.append(
+                self._run_level(
+                    "逐条识别", streams, lambda pcm: stt.recognize_batch([pcm])
+                )
+            )
+            self.results.append(
+                self._run_level(
+                    "微批识别", streams, lambda pcm: batcher.submit(pcm).result()
+                )
+            )
+        batcher.close()
+        self._print_results()
+
+
+def main():
+    tester = ASRBatchTester()
+    tester.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import time
+import queue
+import random
+import asyncio
+import logging
+import threading
+from tabulate import tabulate
+from core.utils.metrics import Histogram
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "ASR音频帧入队到处理的延迟测试(线程中转 vs asyncio队列)"
+
+CONCURRENCY_LEVELS = [50, 200, 500]
+FRAME_DURATION = 0.06  # 每帧60ms
+TEST_SECONDS = 5
+
+
+async def handle_frame(frame: bytes):
+    """模拟handleAudioMessage，只做极少量工作以突出调度开销"""
+    return len(frame)
+
+
+class ASRIngestTester:
+    def __init__(self):
+        self.frame = bytes(120)
+        self.results = []
+
+    async def _produce(self, put, frames: int):
+        # 各设备起始相位随机，模拟真实的到达时间分布
+        await asyncio.sleep(random.uniform(0, FRAME_DURATION))
+        next_time = time.perf_counter()
+        for _ in range(frames):
+            put((time.perf_counter(), self.frame))
+            next_time += FRAME_DURATION
+            await asyncio.sleep(max(0.0, next_time - time.perf_counter()))
+
+    async def _test_thread_hop(self, streams: int) -> dict:
+        """原实现：queue.Queue + 专用线程 + run_coroutine_threadsafe回到事件循环"""
+        loop = asyncio.get_running_loop()
+        histogram = Histogram("thread_hop")
+        stop_event = threading.Event()
+        frames = int(TEST_SECONDS / FRAME_DURATION)
+
+        async def process(enqueue_time, frame):
+            histogram.observe(time.perf_counter() - enqueue_time)
+            await handle_frame(frame)
+
+        def consumer(q):
+            while not stop_event.is_set():
+                try:
+                    enqueue_time, frame = q.get(timeout=1)
+                    asyncio.run_coroutine_threadsafe(
+                        process(enqueue_time, frame), loop
+                    ).result()
+                except queue.Empty:
+                    continue
+
+        queues = [queue.Queue() for _ in range(streams)]
+        threads = [
+            threading.Thread(target=consumer, args=(q,), daemon=True) for q in queues
+        ]
+        for t in threads:
+            t.start()
+
+        cpu_start = time.process_time()
+        await asyncio.gather(*(self._produce(q.put, frames) for q in queues))
+        await asyncio.sleep(0.2)
+        cpu_time = time.process_time() - cpu_start
+        stop_event.set()
+        return self._summary(streams, "线程中转", histogram, cpu_time)
+
+    async def _test_asyncio_queue(self, streams: int) -> dict:
+        """新实现：asyncio.Queue，入队与消费都在事件循环中"""
+        histogram = Histogram("asyncio_queue")
+        frames = int(TEST_SECONDS / FRAME_DURATION)
+
+        async def consumer(q):
+            while True:
+                enqueue_time, frame = await q.get()
+                histogram.observe(time.perf_counter() - enqueue_time)
+                await handle_frame(frame)
+
+        queues = [asyncio.Queue() for _ in range(streams)]
+        tasks = [asyncio.create_task(consumer(q)) for q in queues]
+
+        cpu_start = time.process_time()
+        await asyncio.gather(*(self._produce(q.put_nowait, frames) for q in queues))
+        await asyncio.sleep(0.2)
+        cpu_time = time.process_time() - cpu_start
+        for task in tasks:
+            task.cancel()
+        return self._summary(streams, "asyncio队列", histogram, cpu_time)
+
+    def _summary(self, streams, mode, histogram: Histogram, cpu_time) -> dict:
+        snapshot = histogram.snapshot()
+        return {
+            "streams": streams,
+            "mode": mode,
+            "frames": snapshot["count"],
+            "p50": snapshot["p50"] * 1000,
+            "p95": snapshot["p95"] * 1000,
+            "p99": snapshot["p99"] * 1000,
+            "avg": snapshot["sum"] / snapshot["count"] * 1000 if snapshot["count"] else 0.0,
+            "cpu_cores": cpu_time / (TEST_SECONDS + 0.2),
+        }
+
+    def _print_results(self):
+        headers = [
+            "并发设备数",
+            "模式",
+            "处理帧数",
+            "平均(ms)",
+            "P50(ms)",
+            "P95(ms)",
+            "P99(ms)",
+            "占用CPU核数",
+        ]
+        table_data = [
+            [
+                r["streams"],
+                r["mode"],
+                r["frames"],
+                f"{r['avg']:.3f}",
+                f"{r['p50']:.3f}",
+                f"{r['p95']:.3f}",
+                f"{r['p99']:.3f}",
+                f"{r['cpu_cores']:.2f}",
+            ]
+            for r in self.results
+        ]
+        print("\n" + "=" * 50)
+        print("ASR音频帧入队延迟测试结果")
+        print("=" * 50)
+        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+        print("\n测试说明:")
+        print(f"- 每路设备按60ms一帧持续发送 {TEST_SECONDS} 秒")
+        print("- 延迟：帧入队到开始处理的耗时，直方图分桶线性插值估算分位数")
+        print("- 线程中转：每路一个线程取帧，再通过run_coroutine_threadsafe回到事件循环")
+        print("- asyncio队列：每路一个协程任务，帧不离开事件循环")
+
+    async def run(self):
+        for streams in CONCURRENCY_LEVELS:
+            print(f"测试并发 {streams} 路...")
+            self.results.append(await self._test_thread_hop(streams))
+            # 等待上一轮线程退出
+            await asyncio.sleep(1.2)
+            self.results.append(await self._test_asyncio_queue(streams))
+        self._print_results()
+
+
+async def main():
+    tester = ASRIngestTester()
+    await tester.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,535 @@
+import io
+import sys
+import math
+import copy
+import json
+import time
+import uuid
+import wave
+import socket
+import asyncio
+import logging
+import threading
+import numpy as np
+import psutil
+import websockets
+from aiohttp import web
+from tabulate import tabulate
+from config.config_loader import read_config, get_project_dir
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "服务端整体负载测试(模拟设备 + 进程内假ASR/LLM/TTS上游)"
+
+DEVICE_COUNTS = [10, 50, 100]
+TURNS_PER_DEVICE = 3
+TURN_TIMEOUT = 60  # 单轮对话超时（秒）
+FRAME_DURATION = 0.06  # 设备每帧60ms
+PRE_BUFFER_PACKETS = 5  # 服务端每轮前5个音频包不限速
+SPEECH_FILE = "config/assets/wakeup_words.wav"
+MIN_SPEECH_FRAMES = 25  # 服务端少于15帧不做识别，留出余量
+
+# 假上游的行为，接近常见云服务的耗时
+FAKE_ASR_TEXT = "今天天气怎么样"
+FAKE_ASR_DELAY = 0.15
+FAKE_LLM_REPLY = "今天天气晴朗，气温二十度左右。适合出门散步，记得带上水哦！还有什么想聊的吗？"
+FAKE_LLM_FIRST_TOKEN_DELAY = 0.3
+FAKE_LLM_TOKEN_INTERVAL = 0.03
+FAKE_TTS_FIRST_BYTE_DELAY = 0.15
+FAKE_TTS_SAMPLE_RATE = 24000
+FAKE_TTS_SECONDS_PER_CHAR = 0.2
+FAKE_TTS_REALTIME_FACTOR = 0.1  # 合成速度为播放速度的10倍
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(values, q):
+    """最近秩法计算分位数"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+class FakeUpstreams:
+    """进程内的假上游服务，实现OpenAI兼容的转写、对话补全和语音合成接口"""
+
+    def __init__(self):
+        self.port = _free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}/v1"
+        self._loop = None
+        self._runner = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        if not self._ready.wait(10):
+            raise RuntimeError("假上游服务启动超时")
+
+    def stop(self):
+        if self._loop:
+            asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(5)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/v1/audio/transcriptions", self._transcriptions)
+        app.router.add_post("/v1/chat/completions", self._chat_completions)
+        app.router.add_post("/v1/audio/speech", self._speech)
+        self._runner = web.AppRunner(app)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, "127.0.0.1", self.port)
+        self._loop.run_until_complete(site.start())
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _transcriptions(self, request):
+        await request.read()
+        await asyncio.sleep(FAKE_ASR_DELAY)
+        return web.json_response({"text": FAKE_ASR_TEXT})
+
+    async def _chat_completions(self, request):
+        await request.json()
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await asyncio.sleep(FAKE_LLM_FIRST_TOKEN_DELAY)
+        chunk_id = f"chatcmpl-{uuid.uuid4().hex}"
+        for i in range(0, len(FAKE_LLM_REPLY), 2):
+            await response.write(
+                self._sse_chunk(chunk_id, {"content": FAKE_LLM_REPLY[i : i + 2]}, None)
+            )
+            await asyncio.sleep(FAKE_LLM_TOKEN_INTERVAL)
+        await response.write(self._sse_chunk(chunk_id, {}, "stop"))
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    @staticmethod
+    def _sse_chunk(chunk_id, delta, finish_reason) -> bytes:
+        chunk = {
+            "id": chunk_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": "fake-llm",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8")
+
+    async def _speech(self, request):
+        body = await request.json()
+        text = body.get("input", "")
+        seconds = max(0.5, len(text) * FAKE_TTS_SECONDS_PER_CHAR)
+        t = np.arange(int(FAKE_TTS_SAMPLE_RATE * seconds)) / FAKE_TTS_SAMPLE_RATE
+        pcm = (0.3 * np.sin(2 * np.pi * 220 * t) * 32767).astype("<i2").tobytes()
+
+        # 流式接口先发出文件头，数据长度未知
+        header = io.BytesIO()
+        with wave.open(header, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(FAKE_TTS_SAMPLE_RATE)
+        header_bytes = bytearray(header.getvalue())
+        header_bytes[4:8] = b"\xff\xff\xff\xff"
+        header_bytes[40:44] = b"\xff\xff\xff\xff"
+
+        response = web.StreamResponse(headers={"Content-Type": "audio/wav"})
+        await response.prepare(request)
+        await asyncio.sleep(FAKE_TTS_FIRST_BYTE_DELAY)
+        await response.write(bytes(header_bytes))
+        chunk_bytes = int(FAKE_TTS_SAMPLE_RATE * 0.1) * 2  # 每块100ms音频
+        for i in range(0, len(pcm), chunk_bytes):
+            await response.write(pcm[i : i + chunk_bytes])
+            await asyncio.sleep(0.1 * FAKE_TTS_REALTIME_FACTOR)
+        await response.write_eof()
+        return response
+
+
+def build_server_config(upstream_url: str, port: int) -> dict:
+    """以默认配置为基础，把ASR/LLM/TTS指向假上游"""
+    config = copy.deepcopy(read_config(get_project_dir() + "config.yaml"))
+    config["server"]["ip"] = "127.0.0.1"
+    config["server"]["port"] = port
+    config["server"].setdefault("auth", {})["enabled"] = False
+    config["close_connection_no_voice_time"] = 3600
+    config["enable_wakeup_words_response_cache"] = False
+    config["end_prompt"] = {"enable": False}
+    config["prompt"] = "你是一个简洁的语音助手。"
+    config["ASR"]["LoadTestASR"] = {
+        "type": "openai",
+        "api_key": "load-test",
+        "base_url": f"{upstream_url}/audio/transcriptions",
+        "model_name": "fake-asr",
+        "output_dir": "tmp/",
+    }
+    config["LLM"]["LoadTestLLM"] = {
+        "type": "openai",
+        "api_key": "load-test",
+        "base_url": upstream_url,
+        "model_name": "fake-llm",
+    }
+    config["TTS"]["LoadTestTTS"] = {
+        "type": "openai",
+        "api_key": "load-test",
+        "api_url": f"{upstream_url}/audio/speech",
+        "model": "fake-tts",
+        "voice": "alloy",
+        "format": "wav",
+        "output_dir": "tmp/",
+    }
+    config["selected_module"].update(
+        {
+            "ASR": "LoadTestASR",
+            "LLM": "LoadTestLLM",
+            "TTS": "LoadTestTTS",
+            "Memory": "nomem",
+            "Intent": "nointent",
+        }
+    )
+    return config
+
+
+class LocalServer:
+    """在独立线程和事件循环中运行真实的WebSocketServer"""
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.port = config["server"]["port"]
+        self._loop = None
+        self._task = None
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        try:
+            asyncio.run(self._serve())
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self._error = e
+
+    async def _serve(self):
+        from core.websocket_server import WebSocketServer
+        from core.utils.worker_pool import get_worker_scheduler
+        from core.utils.tts_cache import get_tts_cache
+
+        self._loop = asyncio.get_running_loop()
+        get_worker_scheduler(self.config.get("worker_pools"))
+        # 假LLM每轮回复相同，关闭语句缓存以测量完整合成链路
+        get_tts_cache({"enabled": False})
+        server = WebSocketServer(self.config)
+        self._task = asyncio.create_task(server.start())
+        await self._task
+
+    async def wait_ready(self, timeout=120):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._error:
+                raise RuntimeError(f"服务端启动失败: {self._error}")
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", self.port)
+                writer.close()
+                return
+            except OSError:
+                await asyncio.sleep(0.5)
+        raise RuntimeError("服务端启动超时")
+
+    def stop(self):
+        if self._loop and self._task:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        self._thread.join(10)
+
+
+class SimulatedDevice:
+    """模拟一台设备：hello握手，手动模式按60ms节奏发送Opus语音，接收STT与TTS音频"""
+
+    def __init__(self, index: int, uri: str, speech_packets):
+        self.device_id = f"load-test-{index:04d}"
+        self.uri = uri
+        self.speech_packets = speech_packets
+        self.connect_times = []
+        self.stop_to_stt = []
+        self.stt_to_first_audio = []
+        self.send_jitter = []
+        self.completed_turns = 0
+        self.failed_turns = 0
+        self._events = asyncio.Queue()
+
+    async def run(self):
+        start_time = time.perf_counter()
+        headers = {
+            "device-id": self.device_id,
+            "client-id": str(uuid.uuid4()),
+            "protocol-version": "1",
+        }
+        try:
+            async with websockets.connect(
+                self.uri, additional_headers=headers, max_size=None
+            ) as ws:
+                reader = asyncio.create_task(self._read(ws))
+                try:
+                    await ws.send(
+                        json.dumps(
+                            {
+                                "type": "hello",
+                                "version": 1,
+                                "transport": "websocket",
+                                "audio_params": {
+                                    "format": "opus",
+                                    "sample_rate": 16000,
+                                    "channels": 1,
+                                    "frame_duration": 60,
+                                },
+                            }
+                        )
+                    )
+                    await self._wait_for(lambda m: m.get("type") == "hello", 10)
+                    self.connect_times.append(time.perf_counter() - start_time)
+                    for _ in range(TURNS_PER_DEVICE):
+                        await self._turn(ws)
+                        await asyncio.sleep(0.5)
+                finally:
+                    reader.cancel()
+        except Exception:
+            self.failed_turns += TURNS_PER_DEVICE - self.completed_turns - self.failed_turns
+
+    async def _read(self, ws):
+        async for message in ws:
+            await self._events.put((time.perf_counter(), message))
+
+    async def _wait_for(self, predicate, timeout, audio_times=None):
+        """等待满足条件的文本消息，期间收到的音频包记录到audio_times"""
+        deadline = time.perf_counter() + timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            arrived, message = await asyncio.wait_for(self._events.get(), remaining)
+            if isinstance(message, bytes):
+                if audio_times is not None:
+                    audio_times.append(arrived)
+                continue
+            msg = json.loads(message)
+            if predicate(msg):
+                return arrived, msg
+
+    async def _turn(self, ws):
+        try:
+            await ws.send(json.dumps({"type": "listen", "mode": "manual", "state": "start"}))
+            next_send = time.perf_counter()
+            for packet in self.speech_packets:
+                await ws.send(packet)
+                next_send += FRAME_DURATION
+                await asyncio.sleep(max(0.0, next_send - time.perf_counter()))
+            await ws.send(b"")
+            stop_time = time.perf_counter()
+            await ws.send(json.dumps({"type": "listen", "mode": "manual", "state": "stop"}))
+
+            stt_time, _ = await self._wait_for(
+                lambda m: m.get("type") == "stt", TURN_TIMEOUT
+            )
+            audio_times = []
+            await self._wait_for(
+                lambda m: m.get("type") == "tts" and m.get("state") == "stop",
+                TURN_TIMEOUT,
+                audio_times,
+            )
+            self.stop_to_stt.append(stt_time - stop_time)
+            if audio_times:
+                self.stt_to_first_audio.append(audio_times[0] - stt_time)
+            for prev, cur in zip(
+                audio_times[PRE_BUFFER_PACKETS:], audio_times[PRE_BUFFER_PACKETS + 1 :]
+            ):
+                self.send_jitter.append(abs((cur - prev) - FRAME_DURATION))
+            self.completed_turns += 1
+        except (asyncio.TimeoutError, websockets.ConnectionClosed):
+            self.failed_turns += 1
+
+
+class ResourceSampler:
+    """周期采样进程RSS和线程数"""
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.rss = []
+        self.threads = []
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._sample())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _sample(self):
+        while True:
+            self.rss.append(self.process.memory_info().rss / 1024 / 1024)
+            self.threads.append(self.process.num_threads())
+            await asyncio.sleep(self.interval)
+
+
+def load_speech_packets():
+    from core.utils.util import audio_to_data
+
+    packets = audio_to_data(SPEECH_FILE, is_opus=True)
+    if not packets:
+        raise RuntimeError(f"无法编码测试语音 {SPEECH_FILE}")
+    while len(packets) < MIN_SPEECH_FRAMES:
+        packets = packets + packets
+    return packets
+
+
+class ServerLoadTester:
+    def __init__(self):
+        self.results = []
+
+    async def _run_round(self, uri, device_count, speech_packets):
+        print(f"测试并发 {device_count} 台设备，每台 {TURNS_PER_DEVICE} 轮对话...")
+        sampler = ResourceSampler()
+        sampler.start()
+        devices = [SimulatedDevice(i, uri, speech_packets) for i in range(device_count)]
+        # 设备在一帧时长内错开上线，避免全部对齐在同一时刻
+        async def start_device(device, delay):
+            await asyncio.sleep(delay)
+            await device.run()
+
+        await asyncio.gather(
+            *(
+                start_device(device, i * FRAME_DURATION / device_count)
+                for i, device in enumerate(devices)
+            )
+        )
+        await sampler.stop()
+        # 等待服务端关闭连接、回收资源
+        await asyncio.sleep(2)
+
+        def collect(name):
+            return [v for d in devices for v in getattr(d, name)]
+
+        return {
+            "devices": device_count,
+            "connect": collect("connect_times"),
+            "stop_to_stt": collect("stop_to_stt"),
+            "stt_to_first_audio": collect("stt_to_first_audio"),
+            "send_jitter": collect("send_jitter"),
+            "completed": sum(d.completed_turns for d in devices),
+            "failed": sum(d.failed_turns for d in devices),
+            "rss": sampler.rss,
+            "threads": sampler.threads,
+        }
+
+    def _print_results(self):
+        latency_rows = []
+        metrics = [
+            ("connect", "连接建立"),
+            ("stop_to_stt", "语音结束→STT"),
+            ("stt_to_first_audio", "STT→首个TTS包"),
+            ("send_jitter", "音频发送抖动"),
+        ]
+        for r in self.results:
+            for key, label in metrics:
+                values = [v * 1000 for v in r[key]]
+                latency_rows.append(
+                    [
+                        r["devices"],
+                        label,
+                        len(values),
+                        f"{percentile(values, 0.5):.1f}",
+                        f"{percentile(values, 0.95):.1f}",
+                        f"{percentile(values, 0.99):.1f}",
+                        f"{max(values) if values else 0:.1f}",
+                    ]
+                )
+        resource_rows = [
+            [
+                r["devices"],
+                f"{r['completed']}/{r['completed'] + r['failed']}",
+                f"{percentile(r['rss'], 0.5):.0f}",
+                f"{max(r['rss']) if r['rss'] else 0:.0f}",
+                f"{percentile(r['threads'], 0.5):.0f}",
+                f"{max(r['threads']) if r['threads'] else 0}",
+            ]
+            for r in self.results
+        ]
+
+        print("\n" + "=" * 50)
+        print("服务端整体负载测试结果")
+        print("=" * 50)
+        print(
+            tabulate(
+                latency_rows,
+                headers=["设备数", "指标", "样本数", "P50(ms)", "P95(ms)", "P99(ms)", "最大(ms)"],
+                tablefmt="grid",
+            )
+        )
+        print(
+            tabulate(
+                resource_rows,
+                headers=["设备数", "完成轮数", "RSS P50(MB)", "RSS峰值(MB)", "线程数P50", "线程数峰值"],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明:")
+        print("- ASR/LLM/TTS均指向进程内的假上游，不访问外网；VAD使用配置中的本地模型")
+        print(
+            f"- 假上游耗时：ASR {FAKE_ASR_DELAY * 1000:.0f}ms，LLM首字 {FAKE_LLM_FIRST_TOKEN_DELAY * 1000:.0f}ms，"
+            f"TTS首字节 {FAKE_TTS_FIRST_BYTE_DELAY * 1000:.0f}ms"
+        )
+        print("- 连接建立：从发起WebSocket连接到收到服务端hello")
+        print("- 语音结束→STT：发送listen stop到收到stt消息")
+        print("- STT→首个TTS包：收到stt消息到收到第一个音频包")
+        print(f"- 音频发送抖动：每轮前{PRE_BUFFER_PACKETS}包之后，相邻音频包间隔与60ms之差，句间合成不及时也计入")
+        print("- RSS与线程数为整个测试进程（服务端 + 模拟设备 + 假上游）的采样值")
+
+    async def run(self):
+        # 先初始化日志配置，再只保留告警级别输出到控制台
+        from config.logger import setup_logging, formatter
+        from loguru import logger
+
+        setup_logging()
+        logger.remove()
+        logger.add(sys.stderr, level="WARNING", filter=formatter)
+
+        upstreams = FakeUpstreams()
+        upstreams.start()
+        config = build_server_config(upstreams.base_url, _free_port())
+        server = LocalServer(config)
+        server.start()
+        try:
+            await server.wait_ready()
+            speech_packets = load_speech_packets()
+            uri = f"ws://127.0.0.1:{server.port}/xiaozhi/v1/"
+            for device_count in DEVICE_COUNTS:
+                self.results.append(
+                    await self._run_round(uri, device_count, speech_packets)
+                )
+            self._print_results()
+        finally:
+            server.stop()
+            upstreams.stop()
+
+
+async def main():
+    tester = ServerLoadTester()
+    await tester.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
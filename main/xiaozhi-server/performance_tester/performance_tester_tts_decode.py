@@ -0,0 +1,148 @@
+import io
+import struct
+import time
+import wave
+import logging
+import statistics
+import numpy as np
+from pydub import AudioSegment
+from tabulate import tabulate
+from core.utils.util import audio_bytes_to_data_stream, pcm_to_data_stream
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "TTS音频解码到首个Opus包的延迟测试(pydub/ffmpeg vs 进程内解码)"
+
+SENTENCE_SECONDS = 3  # 模拟一句话的音频时长
+REPEAT = 5
+
+# (说明, 文件类型, 采样率, 声道数, 样本编码, 典型供应商)
+# 样本编码: int16 普通WAV；float32 浮点WAV；stream 流式合成的WAV头，数据长度未知
+AUDIO_FORMATS = [
+    ("wav 16kHz 单声道", "wav", 16000, 1, "int16", "doubao/tencent/aliyun"),
+    ("wav 24kHz 单声道", "wav", 24000, 1, "int16", "openai/fishspeech/cozecn"),
+    ("wav 32kHz 单声道", "wav", 32000, 1, "int16", "gpt_sovits"),
+    ("wav 44.1kHz 双声道", "wav", 44100, 2, "int16", "custom"),
+    ("wav 24kHz 浮点", "wav", 24000, 1, "float32", "custom"),
+    ("wav 32kHz 流式头", "wav", 32000, 1, "stream", "gpt_sovits(streaming)"),
+    ("pcm 16kHz 单声道", "pcm", 16000, 1, "int16", "custom(format=pcm)"),
+    ("mp3 24kHz 单声道", "mp3", 24000, 1, "int16", "edge/siliconflow/ttson"),
+]
+
+
+def make_sentence(sample_rate: int, channels: int) -> np.ndarray:
+    """生成类似语音的测试信号：扫频叠加少量噪声"""
+    t = np.arange(int(sample_rate * SENTENCE_SECONDS)) / sample_rate
+    signal = 0.4 * np.sin(2 * np.pi * (200 + 300 * t) * t)
+    signal += 0.02 * np.random.default_rng(0).standard_normal(len(t))
+    pcm = (np.clip(signal, -1, 1) * 32767).astype("<i2")
+    return np.repeat(pcm[:, np.newaxis], channels, axis=1)
+
+
+def encode_sentence(file_type: str, sample_rate: int, channels: int, encoding: str) -> bytes:
+    pcm = make_sentence(sample_rate, channels)
+    if file_type == "pcm":
+        return pcm.tobytes()
+    buffer = io.BytesIO()
+    if file_type == "wav" and encoding == "float32":
+        data = (pcm.astype("<f4") / 32768).tobytes()
+        fmt = struct.pack("<HHIIHH", 3, channels, sample_rate, sample_rate * channels * 4, channels * 4, 32)
+        return (
+            b"RIFF" + struct.pack("<I", 4 + 8 + len(fmt) + 8 + len(data)) + b"WAVE"
+            + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+            + b"data" + struct.pack("<I", len(data)) + data
+        )
+    if file_type == "wav":
+        with wave.open(buffer, "wb") as wf:
+            wf.setnchannels(channels)
+            wf.setsampwidth(2)
+            wf.setframerate(sample_rate)
+            wf.writeframes(pcm.tobytes())
+        if encoding == "stream":
+            # 流式接口先发出文件头，长度字段填0xFFFFFFFF
+            audio_bytes = bytearray(buffer.getvalue())
+            audio_bytes[4:8] = b"\xff\xff\xff\xff"
+            audio_bytes[40:44] = b"\xff\xff\xff\xff"
+            return bytes(audio_bytes)
+    else:
+        segment = AudioSegment(
+            pcm.tobytes(), frame_rate=sample_rate, sample_width=2, channels=channels
+        )
+        segment.export(buffer, format=file_type)
+    return buffer.getvalue()
+
+
+def decode_with_pydub(audio_bytes: bytes, file_type: str, callback):
+    """原实现：经pydub解码，普通WAV由pydub自行解析，其余格式调用ffmpeg，重采样为线性插值"""
+    audio = AudioSegment.from_file(
+        io.BytesIO(audio_bytes), format=file_type, parameters=["-nostdin"]
+    )
+    audio = audio.set_channels(1).set_frame_rate(16000).set_sample_width(2)
+    pcm_to_data_stream(audio.raw_data, True, callback)
+
+
+def decode_in_process(audio_bytes: bytes, file_type: str, callback):
+    """新实现：WAV/PCM进程内解析，压缩格式才回退ffmpeg"""
+    audio_bytes_to_data_stream(audio_bytes, file_type, True, callback)
+
+
+def measure(decode_fn, audio_bytes: bytes, file_type: str):
+    """返回(首包耗时, 全部编码耗时)的中位数，单位毫秒"""
+    first_times, total_times = [], []
+    for _ in range(REPEAT):
+        first_packet = []
+        start_time = time.perf_counter()
+
+        def on_packet(_):
+            if not first_packet:
+                first_packet.append(time.perf_counter())
+
+        decode_fn(audio_bytes, file_type, on_packet)
+        end_time = time.perf_counter()
+        first_times.append((first_packet[0] - start_time) * 1000)
+        total_times.append((end_time - start_time) * 1000)
+    return statistics.median(first_times), statistics.median(total_times)
+
+
+def main():
+    results = []
+    for label, file_type, sample_rate, channels, encoding, providers in AUDIO_FORMATS:
+        try:
+            audio_bytes = encode_sentence(file_type, sample_rate, channels, encoding)
+        except Exception as e:
+            print(f"生成 {label} 测试音频失败，已跳过: {e}")
+            continue
+        row = [label, providers]
+        for decode_fn in (decode_with_pydub, decode_in_process):
+            try:
+                first_ms, total_ms = measure(decode_fn, audio_bytes, file_type)
+                row += [f"{first_ms:.2f}", f"{total_ms:.2f}"]
+            except Exception as e:
+                print(f"{label} {decode_fn.__name__} 失败: {e}")
+                row += ["-", "-"]
+        results.append(row)
+
+    headers = [
+        "音频格式",
+        "典型供应商",
+        "pydub首包(ms)",
+        "pydub总耗时(ms)",
+        "进程内首包(ms)",
+        "进程内总耗时(ms)",
+    ]
+    print("\n" + "=" * 50)
+    print("TTS音频解码到首个Opus包延迟测试结果")
+    print("=" * 50)
+    print(tabulate(results, headers=headers, tablefmt="grid"))
+    print("\n测试说明:")
+    print(f"- 每种格式模拟一句 {SENTENCE_SECONDS} 秒的合成音频，取 {REPEAT} 次中位数")
+    print("- 首包：从拿到合成音频字节到编码出第一个60ms Opus包的耗时")
+    print("- 总耗时：整句音频全部编码为Opus包的耗时")
+    print("- pydub仅能自行解析16位等普通WAV，浮点/24位WAV和pcm需启动ffmpeg子进程")
+    print("- 进程内解码使用带抗混叠滤波的多相重采样，pydub为线性插值")
+    print("- mp3等压缩格式两种方式都经过ffmpeg，作为对照")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import os
+import time
+import wave
+import random
+import asyncio
+import logging
+import psutil
+import numpy as np
+from tabulate import tabulate
+from config.settings import load_config
+from core.utils.vad import create_instance as create_vad_instance
+from core.providers.vad.batch_engine import VADBatchEngine, CHUNK_SAMPLES
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "VAD推理后端(torch/onnx)及批量推理单路CPU开销测试"
+
+# 先加载onnx后端，避免torch已被导入时内存增量统计失真
+BACKENDS = ["silero_onnx", "silero"]
+CONCURRENCY_LEVELS = [50, 200, 500]
+AUDIO_SECONDS = 3  # 每路设备模拟的音频时长
+CHUNK_DURATION = CHUNK_SAMPLES / 16000  # 32ms
+
+
+class VADPerformanceTester:
+    def __init__(self):
+        self.config = load_config()
+        self.chunks = self._load_test_chunks()
+        self.backend_results = []
+        self.results = []
+
+    def _load_test_chunks(self) -> np.ndarray:
+        """加载16kHz单声道测试音频，切分为512采样点的float32块"""
+        wav_path = os.path.join(os.getcwd(), "config", "assets", "wakeup_words_short.wav")
+        with wave.open(wav_path, "rb") as wf:
+            pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        audio = pcm.astype(np.float32) / 32768.0
+        chunk_count = int(AUDIO_SECONDS / CHUNK_DURATION)
+        # 音频不足时循环拼接
+        repeat = chunk_count * CHUNK_SAMPLES // len(audio) + 1
+        audio = np.tile(audio, repeat)[: chunk_count * CHUNK_SAMPLES]
+        return audio.reshape(chunk_count, CHUNK_SAMPLES)
+
+    def _create_vad(self, vad_type: str):
+        select_vad_module = self.config["selected_module"]["VAD"]
+        vad_config = dict(self.config["VAD"][select_vad_module])
+        vad_config["type"] = vad_type
+        vad_config["batch_enabled"] = False
+        return create_vad_instance(vad_type, vad_config)
+
+    def _test_backend(self, vad_type: str):
+        """测试后端启动耗时、内存增量和单块推理耗时"""
+        process = psutil.Process()
+        rss_before = process.memory_info().rss
+        start_time = time.perf_counter()
+        vad = self._create_vad(vad_type)
+        load_time = time.perf_counter() - start_time
+        rss_delta = process.memory_info().rss - rss_before
+
+        state, context = VADBatchEngine.initial_state()
+        # 预热
+        for chunk in self.chunks[:10]:
+            _, state, context = vad._infer_batch(chunk[np.newaxis, :], state, context)
+        start_time = time.perf_counter()
+        for chunk in self.chunks:
+            _, state, context = vad._infer_batch(chunk[np.newaxis, :], state, context)
+        per_chunk = (time.perf_counter() - start_time) / len(self.chunks)
+
+        self.backend_results.append(
+            {
+                "type": vad_type,
+                "load_time": load_time,
+                "rss_mb": rss_delta / 1024 / 1024,
+                "chunk_ms": per_chunk * 1000,
+            }
+        )
+        return vad
+
+    def _test_serial(self, vad_type, vad, streams: int) -> dict:
+        """逐路逐块推理（当前默认行为），每路维护独立状态"""
+        states = [VADBatchEngine.initial_state() for _ in range(streams)]
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        for chunk in self.chunks:
+            x = chunk[np.newaxis, :]
+            for i in range(streams):
+                state, context = states[i]
+                _, state, context = vad._infer_batch(x, state, context)
+                states[i] = (state, context)
+        return self._summary(
+            vad_type, streams, "逐路推理", time.process_time() - cpu_start,
+            time.perf_counter() - wall_start, 1.0,
+        )
+
+    async def _test_batched(self, vad_type, vad, streams: int) -> dict:
+        """按实时节奏送入音频块，由批量引擎合并推理"""
+        engine = VADBatchEngine(vad._infer_batch)
+
+        async def device():
+            # 各设备起始相位随机，模拟真实的到达时间分布
+            await asyncio.sleep(random.uniform(0, CHUNK_DURATION))
+            state, context = None, None
+            next_time = time.perf_counter()
+            for chunk in self.chunks:
+                _, state, context = await engine.infer(chunk, state, context)
+                next_time += CHUNK_DURATION
+                await asyncio.sleep(max(0.0, next_time - time.perf_counter()))
+
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(device() for _ in range(streams)))
+        cpu_time = time.process_time() - cpu_start
+        wall_time = time.perf_counter() - wall_start
+        engine.stop()
+        return self._summary(
+            vad_type, streams, "批量推理", cpu_time, wall_time, engine.get_stats()["avg_batch"]
+        )
+
+    def _summary(self, vad_type, streams, mode, cpu_time, wall_time, avg_batch) -> dict:
+        audio_seconds = len(self.chunks) * CHUNK_DURATION
+        return {
+            "type": vad_type,
+            "streams": streams,
+            "mode": mode,
+            # 每路设备每秒音频消耗的CPU毫秒数
+            "cpu_ms_per_stream": cpu_time * 1000 / streams / audio_seconds,
+            "cpu_cores": cpu_time / wall_time if wall_time else 0.0,
+            "avg_batch": avg_batch,
+        }
+
+    def _print_results(self):
+        print("\n" + "=" * 50)
+        print("VAD 推理后端对比")
+        print("=" * 50)
+        print(
+            tabulate(
+                [
+                    [
+                        r["type"],
+                        f"{r['load_time']:.3f}",
+                        f"{r['rss_mb']:.1f}",
+                        f"{r['chunk_ms']:.3f}",
+                    ]
+                    for r in self.backend_results
+                ],
+                headers=["后端", "加载耗时(s)", "内存增量(MB)", "单块推理(ms)"],
+                tablefmt="grid",
+            )
+        )
+
+        headers = ["后端", "并发设备数", "模式", "单路CPU(ms/秒音频)", "占用CPU核数", "平均批大小"]
+        table_data = [
+            [
+                r["type"],
+                r["streams"],
+                r["mode"],
+                f"{r['cpu_ms_per_stream']:.3f}",
+                f"{r['cpu_cores']:.2f}",
+                f"{r['avg_batch']:.1f}",
+            ]
+            for r in self.results
+        ]
+        print("\n" + "=" * 50)
+        print("VAD 并发性能测试结果")
+        print("=" * 50)
+        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+        print("\n测试说明:")
+        print("- 内存增量：加载模型前后进程RSS之差，onnx后端先加载以免计入torch")
+        print(f"- 每路设备模拟 {AUDIO_SECONDS} 秒音频，按32ms一块送入VAD")
+        print("- 逐路推理：不计节奏，按当前实现一块一次前向推理")
+        print("- 批量推理：按实时节奏送入，引擎在时间窗内合并各设备的音频块")
+        print("- 占用CPU核数：CPU时间/墙钟时间，批量模式下反映实时负载")
+
+    async def run(self):
+        for vad_type in BACKENDS:
+            try:
+                vad = self._test_backend(vad_type)
+            except Exception as e:
+                print(f"VAD后端 {vad_type} 加载失败，已跳过: {e}")
+                continue
+            for streams in CONCURRENCY_LEVELS:
+                print(f"测试 {vad_type} 并发 {streams} 路...")
+                self.results.append(self._test_serial(vad_type, vad, streams))
+                self.results.append(await self._test_batched(vad_type, vad, streams))
+        self._print_results()
+
+
+async def main():
+    tester = VADPerformanceTester()
+    await tester.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+import io
+import time
+import base64
+import logging
+from tabulate import tabulate
+from PIL import Image
+from config.settings import load_config
+from core.utils.vllm import create_instance
+from core.utils.image_preprocess import ImagePreprocessor
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "视觉请求图片预处理测试(上传体积与端到端耗时)"
+
+TEST_IMAGES = [
+    "../../docs/images/demo1.png",
+    "../../docs/images/demo2.png",
+]
+# 模拟设备摄像头的输出分辨率
+SENSOR_RESOLUTIONS = [(640, 480), (1600, 1200), (2592, 1944)]
+QUESTION = "这张图片里有什么？"
+
+
+def make_camera_frame(path: str, size) -> bytes:
+    """把测试图片放大到摄像头分辨率并按高质量JPEG输出，模拟设备上传的原始画面"""
+    with Image.open(path) as image:
+        frame = image.convert("RGB").resize(size, Image.BICUBIC)
+    output = io.BytesIO()
+    frame.save(output, format="JPEG", quality=95)
+    return output.getvalue()
+
+
+class VisionPreprocessTester:
+    def __init__(self):
+        self.config = load_config()
+        vision_config = self.config.get("vision") or {}
+        self.preprocessor = ImagePreprocessor(
+            dict(vision_config.get("preprocess") or {}, enabled=True)
+        )
+        self.vllm = self._create_vllm()
+        self.results = []
+
+    def _create_vllm(self):
+        """创建所选视觉模型，未配置有效api_key时只测试体积"""
+        select_vllm_module = self.config["selected_module"].get("VLLM")
+        vllm_config = self.config.get("VLLM", {}).get(select_vllm_module)
+        if not vllm_config:
+            return None
+        api_key = str(vllm_config.get("api_key", ""))
+        if any(x in api_key for x in ["你的", "your_", "placeholder", "sk-xxx"]):
+            print(f"VLLM {select_vllm_module} 未配置api_key，跳过端到端耗时测试")
+            return None
+        return create_instance(vllm_config.get("type", select_vllm_module), vllm_config)
+
+    def _measure_vllm(self, image: bytes):
+        if self.vllm is None:
+            return None
+        image_base64 = base64.b64encode(image).decode("utf-8")
+        start_time = time.perf_counter()
+        try:
+            self.vllm.response(QUESTION, image_base64)
+        except Exception as e:
+            print(f"视觉模型调用失败: {e}")
+            return None
+        return time.perf_counter() - start_time
+
+    def _test_frame(self, name: str, frame: bytes) -> dict:
+        start_time = time.perf_counter()
+        processed = self.preprocessor.process(frame)
+        process_time = time.perf_counter() - start_time
+
+        # 相同画面再次到达时命中缓存
+        start_time = time.perf_counter()
+        self.preprocessor.process(frame)
+        cached_time = time.perf_counter() - start_time
+
+        with Image.open(io.BytesIO(processed)) as image:
+            processed_size = image.size
+        return {
+            "name": name,
+            "original_bytes": len(frame),
+            "processed_bytes": len(processed),
+            "processed_size": f"{processed_size[0]}x{processed_size[1]}",
+            "process_ms": process_time * 1000,
+            "cached_ms": cached_time * 1000,
+            "original_latency": self._measure_vllm(frame),
+            "processed_latency": self._measure_vllm(processed),
+        }
+
+    def _print_results(self):
+        def fmt_latency(value):
+            return f"{value:.2f}" if value is not None else "-"
+
+        headers = [
+            "图片",
+            "原图(KB)",
+            "预处理后(KB)",
+            "预处理后尺寸",
+            "预处理(ms)",
+            "缓存命中(ms)",
+            "原图端到端(s)",
+            "预处理端到端(s)",
+        ]
+        table_data = [
+            [
+                r["name"],
+                f"{r['original_bytes'] / 1024:.1f}",
+                f"{r['processed_bytes'] / 1024:.1f}",
+                r["processed_size"],
+                f"{r['process_ms']:.1f}",
+                f"{r['cached_ms']:.2f}",
+                fmt_latency(r["original_latency"]),
+                fmt_latency(r["processed_latency"]),
+            ]
+            for r in self.results
+        ]
+        print("\n" + "=" * 50)
+        print("视觉请求图片预处理测试结果")
+        print("=" * 50)
+        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+        print("\n测试说明:")
+        print("- 原图：测试图片放大到摄像头分辨率后以质量95的JPEG输出")
+        print(
+            f"- 预处理：最长边缩放到 {self.preprocessor.max_edge}px，"
+            f"JPEG质量 {self.preprocessor.quality}"
+        )
+        print("- 上传体积按base64编码前计算，base64后约为其4/3")
+        print("- 端到端：单次调用所选视觉模型的耗时，未配置api_key时不测试")
+
+    def run(self):
+        for path in TEST_IMAGES:
+            for size in SENSOR_RESOLUTIONS:
+                name = f"{path.rsplit('/', 1)[-1]} {size[0]}x{size[1]}"
+                print(f"测试 {name}...")
+                frame = make_camera_frame(path, size)
+                self.results.append(self._test_frame(name, frame))
+        self._print_results()
+
+
+def main():
+    tester = VisionPreprocessTester()
+    tester.run()
+
+
+if __name__ == "__main__":
+    main()